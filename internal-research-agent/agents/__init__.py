@@ -2,6 +2,7 @@
 Agent modules for the Internal Research Agent.
 """
 
-from .research_agent import ResearchAgent
+from .parallel_agent import ParallelToolAgent
+from .research_agent import ResearchAgent, build_agent
 
-__all__ = ["ResearchAgent"]
\ No newline at end of file
+__all__ = ["ParallelToolAgent", "ResearchAgent", "build_agent"]
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+Plan-and-execute agent that runs independent tool calls concurrently.
+
+The ReAct agent calls one tool per LLM round-trip. This agent asks the LLM once for every
+tool call the question needs, fans the calls out in parallel with a LangGraph Send
+step (tools run concurrently on asyncio), and merges the results in a single synthesis
+call - two LLM round-trips however many tools are used.
+"""
+import asyncio
+import json
+import operator
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any, AsyncIterator, Dict, List, TypedDict
+
+from langchain.tools import BaseTool
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+
+from utils.logger import logger
+
+
+PLAN_PROMPT = """You are planning research for a question. You can call these tools:
+
+{tools}
+
+Decide which tool calls are needed to answer the question. Calls are run at the same time,
+so only plan calls that do not depend on each other's results. Use at most {max_calls} calls,
+and no calls if the question can be answered without tools.
+
+Respond with JSON only, in this form:
+{{"calls": [{{"tool": "<tool name>", "input": "<tool input>"}}]}}
+
+Question: {question}"""
+
+ANSWER_PROMPT = """Answer the question using the tool results below. If the results do not
+contain the answer, say so. Do not mention the tools by name.
+
+Question: {question}
+
+Tool results:
+{results}
+
+Answer:"""
+
+
+class ToolCall(TypedDict):
+    """A planned tool call."""
+
+    tool: str
+    input: str
+
+
+class ToolResult(TypedDict):
+    """The result of a tool call."""
+
+    tool: str
+    input: str
+    output: str
+
+
+class AgentState(TypedDict, total=False):
+    """Graph state: the question, the planned calls, their merged results and the answer."""
+
+    question: str
+    calls: List[ToolCall]
+    results: Annotated[List[ToolResult], operator.add]
+    output: str
+
+
+def message_text(message: Any) -> str:
+    """Get the text of a chat model message or a plain LLM completion."""
+    content = getattr(message, "content", message)
+    if isinstance(content, list):
+        content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return str(content)
+
+
+def parse_plan(text: str, tool_names: List[str], max_calls: int) -> List[ToolCall]:
+    """
+    Parse the planner's JSON response into tool calls.
+
+    Unknown tools and duplicate calls are dropped.
+
+    Args:
+        text: Planner response
+        tool_names: Names of the available tools
+        max_calls: Maximum number of calls to keep
+
+    Returns:
+        Planned tool calls
+
+    Raises:
+        ValueError: If the response contains no JSON object
+    """
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if not match:
+        raise ValueError(f"No JSON plan in planner response: {text[:200]!r}")
+
+    calls = []
+    seen = set()
+    for call in json.loads(match.group(0)).get("calls", []):
+        tool, tool_input = call.get("tool"), str(call.get("input", "")).strip()
+        if tool not in tool_names or not tool_input or (tool, tool_input) in seen:
+            logger.warning("Ignoring planned call %s", call)
+            continue
+        seen.add((tool, tool_input))
+        calls.append({"tool": tool, "input": tool_input})
+
+    return calls[:max_calls]
+
+
+class ParallelToolAgent:
+    """LangGraph plan-and-execute agent with concurrent tool execution."""
+
+    def __init__(self, llm, tools: List[BaseTool], max_calls: int = 4):
+        """
+        Initialize the agent.
+
+        Args:
+            llm: Chat model or LLM used for planning and answering
+            tools: Tools the agent may call
+            max_calls: Maximum number of tool calls per question
+        """
+        self.llm = llm
+        self.tools: Dict[str, BaseTool] = {tool.name: tool for tool in tools}
+        self.max_calls = max_calls
+        self.graph = self._build_graph()
+
+    def _build_graph(self):
+        """Build the plan -> parallel execute -> synthesize graph."""
+        graph = StateGraph(AgentState)
+        graph.add_node("plan", self._plan)
+        graph.add_node("execute", self._execute)
+        graph.add_node("synthesize", self._synthesize)
+
+        graph.add_edge(START, "plan")
+        graph.add_conditional_edges("plan", self._fan_out, ["execute", "synthesize"])
+        graph.add_edge("execute", "synthesize")
+        graph.add_edge("synthesize", END)
+
+        return graph.compile()
+
+    async def _plan(self, state: AgentState) -> dict:
+        """Ask the LLM for every independent tool call the question needs."""
+        tool_list = "\n".join(f"- {name}: {tool.description}" for name, tool in self.tools.items())
+        prompt = PLAN_PROMPT.format(tools=tool_list, max_calls=self.max_calls, question=state["question"])
+        response = message_text(await self.llm.ainvoke(prompt))
+
+        try:
+            calls = parse_plan(response, list(self.tools), self.max_calls)
+        except ValueError as e:
+            # Fall back to asking every tool the question itself
+            logger.warning("Could not parse plan, querying all tools: %s", e)
+            calls = [{"tool": name, "input": state["question"]} for name in list(self.tools)[:self.max_calls]]
+
+        logger.info("Planned %s tool calls: %s", len(calls), calls)
+        return {"calls": calls}
+
+    def _fan_out(self, state: AgentState):
+        """Send each planned call to its own execute step, all in the same superstep."""
+        if not state.get("calls"):
+            return "synthesize"
+        return [Send("execute", {"question": state["question"], "calls": [call]}) for call in state["calls"]]
+
+    async def _execute(self, state: AgentState) -> dict:
+        """Run one tool call; results from parallel branches are concatenated into the state."""
+        call = state["calls"][0]
+        try:
+            output = await self.tools[call["tool"]].ainvoke(call["input"])
+        except Exception as e:
+            logger.error("Tool %s failed: %s", call['tool'], e)
+            output = f"Error: {e}"
+
+        return {"results": [{"tool": call["tool"], "input": call["input"], "output": str(output)}]}
+
+    async def _synthesize(self, state: AgentState) -> dict:
+        """Merge the tool results into an answer with a single LLM call."""
+        results = state.get("results") or []
+        results_text = "\n\n".join(
+            f"[{result['tool']}: {result['input']}]\n{result['output']}" for result in results
+        ) or "(no tools were used)"
+        prompt = ANSWER_PROMPT.format(question=state["question"], results=results_text)
+        return {"output": message_text(await self.llm.ainvoke(prompt)).strip()}
+
+    async def ainvoke(self, question: str) -> dict:
+        """
+        Answer a question asynchronously.
+
+        Args:
+            question: The question to answer
+
+        Returns:
+            Dictionary with input, output and the tool calls that were made
+        """
+        state = await self.graph.ainvoke({"question": question, "results": []})
+        return {"input": question, "output": state.get("output", ""), "tool_calls": state.get("results", [])}
+
+    def astream_events(self, question: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the run's LangChain events (v2); answer tokens come from the "synthesize" node.
+
+        Args:
+            question: The question to answer
+
+        Returns:
+            Async iterator of events
+        """
+        return self.graph.astream_events({"question": question, "results": []}, version="v2")
+
+    def invoke(self, question: str) -> dict:
+        """
+        Answer a question, running the graph on a fresh event loop.
+
+        When the calling thread already runs an event loop (async code, notebooks), the
+        graph runs on its own loop in a worker thread instead; async callers should
+        prefer ainvoke.
+
+        Args:
+            question: The question to answer
+
+        Returns:
+            Dictionary with input, output and the tool calls that were made
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.ainvoke(question))
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="parallel-agent") as executor:
+            return executor.submit(asyncio.run, self.ainvoke(question)).result()
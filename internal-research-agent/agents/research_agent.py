@@ -1,36 +1,125 @@
 """
 Research Agent for the Internal Research Agent application.
 """
-from typing import List, Optional
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 from langchain.chains import RetrievalQA
 from langchain.agents import initialize_agent, AgentType
 from langchain.tools import Tool, tool
 from langchain_tavily import TavilySearch
 from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.tools import BaseTool
 
+from agents.parallel_agent import ParallelToolAgent
+from agents.router import RAG_ROUTE, QueryRouter
+from agents.streaming import stream_answer
 from services.document_loader import DocumentLoader
+from services.tool_cache import ToolResultCache
 from services.vector_store import VectorStoreService
 from tools.mcp_google_docs_tool import create_mcp_google_docs_tool
 from utils.logger import logger
+from utils.tracing import QueryTrace, TraceExporter, start_trace, trace_span
 from ira_cli.config import settings
 
 
+RAG_TOOL_NAME = "InternalDocumentsRAG"
+AGENT_MODES = ("react", "parallel")
+
+
+def build_agent(llm, tools: List[Tool], mode: Optional[str] = None):
+    """
+    Build the agent that answers questions with the given tools.
+
+    Args:
+        llm: Language model driving the agent
+        tools: Tools the agent may call
+        mode: "react" for the sequential ReAct agent, "parallel" for the plan-and-execute
+            agent that runs independent tool calls concurrently; defaults to settings.agent_mode
+
+    Returns:
+        Agent with an invoke(question) method returning a dict with an "output" key
+    """
+    mode = (mode or settings.agent_mode).lower()
+    if mode not in AGENT_MODES:
+        raise ValueError(f"Unknown agent mode '{mode}', expected one of: {', '.join(AGENT_MODES)}")
+
+    if mode == "parallel":
+        return ParallelToolAgent(llm, tools, max_calls=settings.agent_max_parallel_calls)
+
+    return initialize_agent(
+        tools=tools,
+        llm=llm,
+        agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
+        verbose=False,
+        handle_parsing_errors=True,
+        # Lets callers see which tools answered a question
+        return_intermediate_steps=True
+    )
+
+
+def create_rate_limiter(requests_per_second: Optional[float]) -> Optional[InMemoryRateLimiter]:
+    """
+    Create a shared token-bucket rate limiter.
+
+    Args:
+        requests_per_second: Allowed request rate; None or 0 for no limit
+
+    Returns:
+        Rate limiter, or None when unlimited
+    """
+    if not requests_per_second:
+        return None
+    return InMemoryRateLimiter(requests_per_second=requests_per_second, check_every_n_seconds=0.05)
+
+
 class ResearchAgent:
     """Main research agent that combines document retrieval and web search capabilities."""
 
-    def __init__(self):
-        """Initialize the research agent with all necessary components."""
-        self.llm = ChatGoogleGenerativeAI(
+    def __init__(
+        self,
+        llm: Optional[BaseLanguageModel] = None,
+        vector_store_service: Optional[VectorStoreService] = None,
+        tools: Optional[List[BaseTool]] = None,
+        document_loader: Optional[DocumentLoader] = None
+    ):
+        """
+        Initialize the research agent with all necessary components.
+
+        Components are built from settings unless given, so the agent can also run
+        against fakes (see `ira bench`).
+
+        Args:
+            llm: Model used by the agent and the RAG chain
+            vector_store_service: Vector store of the internal documents
+            tools: Tools used instead of the web search and Google Docs tools
+            document_loader: Loader of the documents directory
+        """
+        self.llm = llm if llm is not None else ChatGoogleGenerativeAI(
             model=settings.model_name,
             temperature=settings.temperature,
             max_retries=settings.max_retries,
+            rate_limiter=create_rate_limiter(settings.llm_requests_per_second),
         )
+        self.web_search_limiter = create_rate_limiter(settings.web_search_requests_per_second)
+        self.external_tools = tools
 
-        self.document_loader = DocumentLoader()
-        self.vector_store_service = VectorStoreService()
+        self.document_loader = document_loader if document_loader is not None else DocumentLoader()
+        self.vector_store_service = (
+            vector_store_service if vector_store_service is not None else VectorStoreService()
+        )
+        self.tool_cache = ToolResultCache()
         self.rag_chain = None
+        self.rag_tool_func = None
+        self.router = None
         self.agent = None
+        self.trace_exporter = (
+            TraceExporter(settings.trace_path, settings.metrics_path, include_text=settings.trace_questions)
+            if settings.tracing_enabled else None
+        )
 
         logger.info("Research Agent initialized")
 
@@ -43,15 +132,15 @@ class ResearchAgent:
         """
         logger.info("Setting up RAG chain")
 
-        # Load documents
-        documents = self.document_loader.load_documents()
-        if not documents:
+        # Create or load vector store - documents are only loaded if it has to be built
+        vector_store = self.vector_store_service.create_vector_store(
+            self.document_loader.load_documents,
+            force_recreate=force_recreate
+        )
+        if vector_store is None:
             logger.warning("No documents found to create RAG chain")
             return
 
-        # Create vector store
-        self.vector_store_service.create_vector_store(documents, force_recreate=force_recreate)
-
         # Create retriever
         retriever = self.vector_store_service.get_retriever()
 
@@ -74,9 +163,13 @@ class ResearchAgent:
 
                 # RAG tool for internal documents
         if self.rag_chain:
+            # Keyed by the vector store revision so answers never outlive the indexed content
+            self.rag_tool_func = self.tool_cache.wrap(
+                RAG_TOOL_NAME, self.rag_chain.run, namespace=self.vector_store_service.revision
+            )
             rag_tool = Tool(
-                name="InternalDocumentsRAG",
-                func=self.rag_chain.run,
+                name=RAG_TOOL_NAME,
+                func=self.rag_tool_func,
                 description=(
                     "Useful for answering questions about internal HR policies, "
                     "compliance documents, and company procedures. Use this tool "
@@ -88,6 +181,10 @@ class ResearchAgent:
         else:
             logger.warning("RAG chain not set up - skipping RAG tool")
 
+        if self.external_tools is not None:
+            tools.extend(self.external_tools)
+            return tools
+
         # Web search tool
         try:
             search_tool = TavilySearch(max_results=settings.max_search_results)
@@ -95,26 +192,34 @@ class ResearchAgent:
             # Create a wrapper function for the search tool
             def web_search_wrapper(query: str) -> str:
                 """Search the web for current information."""
+                if self.web_search_limiter is not None:
+                    self.web_search_limiter.acquire()
                 return search_tool.invoke({"query": query})
 
             web_tool = Tool(
                 name="WebSearch",
-                func=web_search_wrapper,
+                func=self.tool_cache.wrap("WebSearch", web_search_wrapper),
                 description="Useful for searching the web for current information and recent events."
             )
 
             tools.append(web_tool)
             logger.info("Added web search tool")
         except Exception as e:
-            logger.error(f"Failed to initialize search tool: {e}")
+            logger.error("Failed to initialize search tool: %s", e)
 
         # Google Docs MCP tool for Company X insurance queries
         try:
             google_docs_tool = create_mcp_google_docs_tool()
-            tools.append(google_docs_tool)
+            tools.append(Tool(
+                name=google_docs_tool.name,
+                func=self.tool_cache.wrap(google_docs_tool.name, google_docs_tool.run),
+                # Async agents call the MCP session directly instead of through a thread
+                coroutine=self.tool_cache.awrap(google_docs_tool.name, google_docs_tool.arun),
+                description=google_docs_tool.description
+            ))
             logger.info("Added Google Docs MCP tool for Company X insurance queries")
         except Exception as e:
-            logger.error(f"Failed to initialize Google Docs MCP tool: {e}")
+            logger.error("Failed to initialize Google Docs MCP tool: %s", e)
 
         return tools
 
@@ -137,15 +242,13 @@ class ResearchAgent:
             raise ValueError("No tools available for the agent")
 
         # Initialize agent
-        self.agent = initialize_agent(
-            tools=tools,
-            llm=self.llm,
-            agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-            verbose=False,
-            handle_parsing_errors=True
-        )
+        self.agent = build_agent(self.llm, tools)
+
+        # Fast path for plainly internal questions
+        if settings.router_enabled and self.rag_tool_func is not None:
+            self.router = QueryRouter(self.vector_store_service, rag_tool_name=RAG_TOOL_NAME)
 
-        logger.info("Research agent initialization complete")
+        logger.info("Research agent initialization complete (%s mode)", settings.agent_mode)
 
     def query(self, question: str) -> str:
         """
@@ -160,15 +263,97 @@ class ResearchAgent:
         if not self.agent:
             raise ValueError("Agent not initialized. Call initialize_agent() first.")
 
-        logger.info(f"Processing query: {question}")
+        logger.info("Processing query: %s", question)
 
+        with self._trace(question) as trace:
+            if self._use_rag_fast_path(question):
+                try:
+                    with trace_span("tool", RAG_TOOL_NAME):
+                        answer = self.rag_tool_func(question)
+                    logger.info("Query answered by the RAG fast path")
+                    if trace:
+                        trace.route = RAG_ROUTE
+                    return {"input": question, "output": answer, "route": RAG_ROUTE}
+                except Exception as e:
+                    logger.warning("RAG fast path failed, falling back to the agent: %s", e)
+
+            try:
+                response = self.agent.invoke(question)
+                logger.info("Query processed successfully")
+                return response
+            except Exception as e:
+                logger.error("Error processing query: %s", e)
+                raise
+
+    @contextmanager
+    def _trace(self, question: str) -> Iterator[Optional[QueryTrace]]:
+        """Record a trace of everything run in the block and export it afterwards."""
+        if self.trace_exporter is None:
+            yield None
+            return
+
+        trace = None
+        try:
+            with start_trace(question) as trace:
+                yield trace
+        finally:
+            if trace is not None:
+                self.trace_exporter.export(trace)
+
+    def _use_rag_fast_path(self, question: str) -> bool:
+        """Ask the router whether a question can skip the agent."""
+        if self.router is None:
+            return False
         try:
-            response = self.agent.invoke(question)
-            logger.info("Query processed successfully")
-            return response
+            return self.router.route(question).route == RAG_ROUTE
         except Exception as e:
-            logger.error(f"Error processing query: {e}")
-            raise
+            logger.warning("Routing failed, falling back to the agent: %s", e)
+            return False
+
+    async def astream_query(self, question: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Query the research agent, streaming tool steps and final-answer tokens.
+
+        Args:
+            question: The question to ask
+
+        Yields:
+            {"type": "tool_start" | "tool_end" | "token" | "final", ...} events; the last
+            event is "final" with the complete answer under "output"
+        """
+        if not self.agent:
+            raise ValueError("Agent not initialized. Call initialize_agent() first.")
+
+        logger.info("Streaming query: %s", question)
+
+        with self._trace(question) as trace:
+            if self._use_rag_fast_path(question):
+                if trace:
+                    trace.route = RAG_ROUTE
+                revision = self.vector_store_service.revision()
+                hit, answer = self.tool_cache.get(RAG_TOOL_NAME, question, revision)
+                if hit:
+                    yield {"type": "final", "output": answer, "route": RAG_ROUTE}
+                    return
+
+                yield {"type": "tool_start", "tool": RAG_TOOL_NAME, "input": question}
+                events = self.rag_chain.astream_events({"query": question}, version="v2")
+                async for event in stream_answer(events):
+                    if event["type"] == "final":
+                        self.tool_cache.put(RAG_TOOL_NAME, question, event["output"], revision)
+                        yield {"type": "tool_end", "tool": RAG_TOOL_NAME, "output": event["output"]}
+                        yield {**event, "route": RAG_ROUTE}
+                    else:
+                        yield event
+                return
+
+            if isinstance(self.agent, ParallelToolAgent):
+                events = stream_answer(self.agent.astream_events(question), answer_nodes=["synthesize"])
+            else:
+                events = stream_answer(self.agent.astream_events(question, version="v2"), react=True)
+
+            async for event in events:
+                yield event
 
     def add_documents(self, file_paths: List[str]) -> None:
         """
@@ -177,23 +362,44 @@ class ResearchAgent:
         Args:
             file_paths: List of file paths to add
         """
-        logger.info(f"Adding {len(file_paths)} new documents")
+        logger.info("Adding %s new documents", len(file_paths))
 
-        new_documents = []
+        valid_paths = []
         for file_path in file_paths:
             try:
-                docs = self.document_loader.load_single_document(file_path)
-                new_documents.extend(docs)
+                self.document_loader.validate_file(Path(file_path))
+                valid_paths.append(file_path)
             except Exception as e:
-                logger.error(f"Failed to load {file_path}: {e}")
-                continue
+                logger.error("Failed to load %s: %s", file_path, e)
+
+        new_documents = []
+        for _, docs in self.document_loader.iter_loaded_files(valid_paths):
+            new_documents.extend(docs)
 
         if new_documents:
             self.vector_store_service.add_documents(new_documents)
-            logger.info(f"Successfully added {len(new_documents)} document chunks")
+            self.tool_cache.invalidate(RAG_TOOL_NAME)
+            logger.info("Successfully added %s document chunks", len(new_documents))
         else:
             logger.warning("No new documents were successfully loaded")
 
+    def sync_documents(self) -> dict:
+        """
+        Incrementally sync the vector store with the documents directory.
+
+        Returns:
+            Dictionary of file and chunk counts
+        """
+        logger.info("Syncing vector store with %s", self.document_loader.docs_path)
+        counts = self.vector_store_service.sync(
+            self.document_loader.get_supported_files(),
+            self.document_loader.load_single_document,
+            root=self.document_loader.docs_path
+        )
+        if counts["chunks_added"] or counts["chunks_deleted"]:
+            self.tool_cache.invalidate(RAG_TOOL_NAME)
+        return counts
+
     def get_vector_store_info(self) -> dict:
         """
         Get information about the vector store.
@@ -204,9 +410,18 @@ class ResearchAgent:
         try:
             return self.vector_store_service.get_collection_info()
         except Exception as e:
-            logger.error(f"Error getting vector store info: {e}")
+            logger.error("Error getting vector store info: %s", e)
             return {"error": str(e)}
 
+    def get_tool_cache_stats(self) -> dict:
+        """
+        Get the tool result cache counters.
+
+        Returns:
+            Dictionary with hit, miss and entry counts
+        """
+        return self.tool_cache.stats()
+
     def search_documents(self, query: str, k: int = 4) -> List[str]:
         """
         Search for relevant documents in the vector store.
@@ -222,5 +437,29 @@ class ResearchAgent:
             results = self.vector_store_service.similarity_search(query, k=k)
             return [doc.page_content for doc in results]
         except Exception as e:
-            logger.error(f"Error searching documents: {e}")
+            logger.error("Error searching documents: %s", e)
+            raise
+
+    def search_documents_batch(self, queries: List[str], k: int = 4) -> List[List[dict]]:
+        """
+        Search the vector store for several queries with one embedding call and one lookup.
+
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+
+        Returns:
+            For each query, a list of {"content", "source", "score"} dictionaries, best first
+        """
+        try:
+            results = self.vector_store_service.similarity_search_batch(queries, k=k)
+            return [
+                [
+                    {"content": doc.page_content, "source": doc.metadata.get("source", ""), "score": score}
+                    for doc, score in pairs
+                ]
+                for pairs in results
+            ]
+        except Exception as e:
+            logger.error("Error searching documents: %s", e)
             raise
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Embedding-based query router for the research agent.
+
+Most questions are plainly about internal policy, yet the ReAct agent spends LLM calls
+deciding to use the RAG tool. The router embeds the question once, compares it with the
+indexed corpus and with example questions for each tool, and sends high-confidence
+internal questions straight to the RAG chain. When ROUTER_LOG_PATH is set, every decision
+is appended to a JSONL log so the thresholds can be tuned on real traffic.
+"""
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from services.vector_store import VectorStoreService, cosine_similarity
+from utils.logger import logger
+from ira_cli.config import settings
+
+
+RAG_ROUTE = "rag"
+AGENT_ROUTE = "agent"
+
+# Example questions per tool; override with ROUTER_EXEMPLARS_PATH (a JSON object of lists)
+DEFAULT_EXEMPLARS: Dict[str, List[str]] = {
+    "InternalDocumentsRAG": [
+        "How many days of annual leave do employees get?",
+        "What is the company policy on remote work?",
+        "How do I submit an expense claim?",
+        "What is the code of conduct for employees?",
+        "How does the performance review process work?",
+        "What are the working hours and overtime rules?",
+    ],
+    "WebSearch": [
+        "What is the latest news about artificial intelligence?",
+        "What is the weather forecast for tomorrow?",
+        "Who won the football match yesterday?",
+        "What is the current stock price of Google?",
+        "What are the new labour laws passed this year?",
+    ],
+    "google_docs_mcp": [
+        "What does our health insurance policy cover?",
+        "How do I file an insurance claim?",
+        "What is the deductible on the company insurance plan?",
+        "Which insurance documents are available?",
+    ],
+}
+
+
+@dataclass
+class RouteDecision:
+    """The route chosen for a question and the scores behind it."""
+
+    route: str
+    confidence: float
+    corpus_similarity: float
+    tool_scores: Dict[str, float] = field(default_factory=dict)
+    reason: str = ""
+
+
+class QueryRouter:
+    """Routes questions to the RAG chain or the full agent using embedding similarity."""
+
+    def __init__(
+        self,
+        vector_store_service: VectorStoreService,
+        rag_tool_name: str = "InternalDocumentsRAG",
+        exemplars: Optional[Dict[str, List[str]]] = None,
+        corpus_threshold: Optional[float] = None,
+        margin: Optional[float] = None,
+        corpus_k: int = 3,
+        log_path: Optional[str] = None
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            vector_store_service: Vector store holding the indexed corpus
+            rag_tool_name: Exemplar key of the RAG tool
+            exemplars: Example questions per tool name
+            corpus_threshold: Minimum cosine similarity between the question and its nearest
+                chunk for the RAG fast path
+            margin: Minimum lead of the RAG exemplars' score over the next best tool
+            corpus_k: Number of nearest chunks to consider
+            log_path: JSONL file routing decisions, including the question, are appended to
+                (defaults to settings.router_log_path; empty or None disables the log)
+        """
+        self.vector_store_service = vector_store_service
+        self.embeddings = vector_store_service.embeddings
+        self.rag_tool_name = rag_tool_name
+        self.exemplars = exemplars if exemplars is not None else load_exemplars()
+        self.corpus_threshold = corpus_threshold if corpus_threshold is not None else settings.router_corpus_threshold
+        self.margin = margin if margin is not None else settings.router_margin
+        self.corpus_k = corpus_k
+        log_path = log_path if log_path is not None else settings.router_log_path
+        self.log_path = Path(log_path) if log_path else None
+
+        self._exemplar_vectors: Optional[Dict[str, List[List[float]]]] = None
+        self._log_lock = threading.Lock()
+
+    def _get_exemplar_vectors(self) -> Dict[str, List[List[float]]]:
+        """Embed the exemplars on first use (the embedding cache makes later runs free)."""
+        if self._exemplar_vectors is None:
+            tool_names = [tool_name for tool_name, questions in self.exemplars.items() if questions]
+            questions = [question for tool_name in tool_names for question in self.exemplars[tool_name]]
+
+            # One batched request instead of a round trip per exemplar on the first query
+            embed_many = getattr(self.embeddings, "embed_queries", None) or self.embeddings.embed_documents
+            vectors = iter(embed_many(questions))
+            self._exemplar_vectors = {
+                tool_name: [next(vectors) for _ in self.exemplars[tool_name]]
+                for tool_name in tool_names
+            }
+        return self._exemplar_vectors
+
+    def route(self, question: str) -> RouteDecision:
+        """
+        Decide whether a question can go straight to the RAG chain.
+
+        The fast path is taken only when the question is closest to the RAG exemplars by
+        at least margin, and the corpus contains a chunk at least corpus_threshold similar.
+
+        Args:
+            question: The question to route
+
+        Returns:
+            Routing decision
+        """
+        start = time.perf_counter()
+        vector = self.embeddings.embed_query(question)
+
+        tool_scores = {
+            tool_name: max(cosine_similarity(vector, exemplar) for exemplar in vectors)
+            for tool_name, vectors in self._get_exemplar_vectors().items()
+        }
+        nearest = self.vector_store_service.similarity_search_by_vector(vector, k=self.corpus_k)
+        corpus_similarity = nearest[0][1] if nearest else 0.0
+
+        rag_score = tool_scores.get(self.rag_tool_name, 0.0)
+        other_best = max((score for name, score in tool_scores.items() if name != self.rag_tool_name), default=0.0)
+        lead = rag_score - other_best
+
+        if lead < self.margin:
+            decision = RouteDecision(AGENT_ROUTE, lead, corpus_similarity, tool_scores, "closer to other tools")
+        elif corpus_similarity < self.corpus_threshold:
+            decision = RouteDecision(AGENT_ROUTE, lead, corpus_similarity, tool_scores, "weak corpus match")
+        else:
+            decision = RouteDecision(RAG_ROUTE, min(lead, corpus_similarity - self.corpus_threshold),
+                                     corpus_similarity, tool_scores, "internal question")
+
+        self.log(question, decision, time.perf_counter() - start)
+        return decision
+
+    def log(self, question: str, decision: RouteDecision, elapsed: float) -> None:
+        """Append a routing decision to the JSONL log."""
+        logger.info(
+            "Routed to %s (%s, corpus=%.3f, confidence=%.3f)",
+            decision.route, decision.reason, decision.corpus_similarity, decision.confidence
+        )
+        if not self.log_path:
+            return
+
+        record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "question": question,
+            **asdict(decision),
+            "corpus_threshold": self.corpus_threshold,
+            "margin": self.margin,
+            "routing_ms": round(elapsed * 1000, 1)
+        }
+        try:
+            with self._log_lock:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.warning("Could not write routing log %s: %s", self.log_path, e)
+
+
+def load_exemplars(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Load per-tool example questions.
+
+    Args:
+        path: JSON file mapping tool names to lists of questions; defaults to
+            settings.router_exemplars_path, falling back to DEFAULT_EXEMPLARS
+
+    Returns:
+        Example questions per tool name
+    """
+    path = path or settings.router_exemplars_path
+    if not path:
+        return DEFAULT_EXEMPLARS
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
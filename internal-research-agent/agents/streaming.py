@@ -0,0 +1,146 @@
+"""
+Streaming helpers for the research agent.
+
+Turns LangChain astream_events (v2) into a small stream of UI events: tool steps as
+they start and finish, final-answer tokens as the model produces them, and the final
+response once the run completes.
+"""
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+class FinalAnswerFilter:
+    """Pass through only the text after the ReAct "Final Answer:" marker of one LLM call."""
+
+    def __init__(self, marker: str = FINAL_ANSWER_MARKER):
+        self.marker = marker
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new LLM call."""
+        self._buffer = ""
+        self._open = False
+        self._started = False
+
+    def feed(self, text: str) -> str:
+        """
+        Add a token and return the part of it that belongs to the final answer.
+
+        Args:
+            text: Streamed token
+
+        Returns:
+            Final-answer text to display (may be empty)
+        """
+        if not self._open:
+            self._buffer += text
+            position = self._buffer.find(self.marker)
+            if position < 0:
+                return ""
+            self._open = True
+            text = self._buffer[position + len(self.marker):]
+
+        if not self._started:
+            # Drop the whitespace between the marker and the answer, however it is tokenized
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+
+
+def chunk_text(chunk: Any) -> str:
+    """Get the text of a streamed chat message chunk or LLM generation chunk."""
+    content = getattr(chunk, "content", None)
+    if content is None:
+        return getattr(chunk, "text", "") or ""
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return str(content)
+
+
+def response_text(output: Any) -> Optional[str]:
+    """Get the answer from the output of an agent, graph or RetrievalQA run."""
+    if isinstance(output, dict):
+        for key in ("output", "result"):
+            if key in output:
+                return str(output[key])
+        return None
+    return None if output is None else str(output)
+
+
+async def stream_answer(
+    events: AsyncIterator[Dict[str, Any]],
+    react: bool = False,
+    answer_nodes: Optional[Iterable[str]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Convert astream_events into tool step, token and final events.
+
+    Args:
+        events: Events from astream_events(version="v2")
+        react: Only stream the text after "Final Answer:" in each LLM call (ReAct agents)
+        answer_nodes: Only stream tokens from these LangGraph nodes
+
+    Yields:
+        {"type": "tool_start", "tool", "input"}, {"type": "tool_end", "tool", "output"},
+        {"type": "token", "text"} and finally {"type": "final", "output"}
+    """
+    answer_nodes = set(answer_nodes) if answer_nodes else None
+    final_filter = FinalAnswerFilter()
+    tool_runs = set()
+    # String tool inputs are not reported on tool events, so take them from the agent's plan
+    planned_inputs: Dict[str, List[Any]] = defaultdict(list)
+    output = None
+
+    async for event in events:
+        kind = event["event"]
+        parents = event.get("parent_ids", [])
+
+        if kind == "on_tool_start":
+            tool_runs.add(event["run_id"])
+            # Tools that wrap other tools would otherwise be reported twice
+            if not tool_runs.intersection(parents):
+                tool_input = event["data"].get("input")
+                planned = planned_inputs[event["name"]]
+                if planned:
+                    planned_input = planned.pop(0)
+                    tool_input = tool_input or planned_input
+                yield {"type": "tool_start", "tool": event["name"], "input": tool_input}
+
+        elif kind == "on_tool_end":
+            if not tool_runs.intersection(parents):
+                yield {"type": "tool_end", "tool": event["name"], "output": str(event["data"].get("output", ""))}
+
+        elif kind in ("on_chat_model_start", "on_llm_start"):
+            final_filter.reset()
+
+        elif kind in ("on_chat_model_stream", "on_llm_stream"):
+            if tool_runs.intersection(parents):
+                # Model calls inside tools (e.g. the RAG chain) are not the agent's answer
+                continue
+            if answer_nodes is not None and event.get("metadata", {}).get("langgraph_node") not in answer_nodes:
+                continue
+
+            text = chunk_text(event["data"].get("chunk"))
+            if react:
+                text = final_filter.feed(text)
+            if text:
+                yield {"type": "token", "text": text}
+
+        elif kind == "on_chain_stream" and not parents:
+            # ReAct agents announce their next actions before running them
+            for action in (event["data"].get("chunk") or {}).get("actions", []):
+                planned_inputs[action.tool].append(action.tool_input)
+
+        elif kind == "on_chain_start" and event["name"] == "execute":
+            # Parallel agent branches carry their tool call in the node input
+            node_input = event["data"].get("input")
+            if isinstance(node_input, dict):
+                for call in node_input.get("calls", []):
+                    planned_inputs[call["tool"]].append(call["input"])
+
+        elif kind == "on_chain_end" and not parents:
+            output = event["data"].get("output")
+
+    yield {"type": "final", "output": response_text(output) or ""}
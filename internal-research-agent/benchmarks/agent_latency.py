@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ReAct agent against the parallel plan-and-execute agent on a stubbed LLM.
+
+Both agents answer a question that needs internal documents and a web search. The LLM
+and tools are stubs with fixed latencies, so the difference is purely the number of
+serial LLM and tool round-trips.
+
+Usage:
+    python benchmarks/agent_latency.py --llm-latency-ms 800 --tool-latency-ms 1200
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain.tools import Tool
+from langchain_core.language_models.fake import FakeListLLM
+
+from agents.research_agent import build_agent
+
+QUESTION = "How many days of parental leave do we offer, and how does that compare to the legal minimum?"
+
+REACT_SCRIPT = [
+    "Thought: I should check the internal leave policy first.\n"
+    "Action: InternalDocumentsRAG\nAction Input: parental leave days",
+    "Thought: Now I need the legal minimum.\n"
+    "Action: WebSearch\nAction Input: statutory parental leave minimum",
+    "Thought: I now know the final answer\n"
+    "Final Answer: We offer 16 weeks of parental leave, above the 12-week legal minimum.",
+]
+
+PARALLEL_SCRIPT = [
+    '{"calls": [{"tool": "InternalDocumentsRAG", "input": "parental leave days"}, '
+    '{"tool": "WebSearch", "input": "statutory parental leave minimum"}]}',
+    "We offer 16 weeks of parental leave, above the 12-week legal minimum.",
+]
+
+
+class SlowFakeListLLM(FakeListLLM):
+    """FakeListLLM that waits a fixed time per call, like a remote model."""
+
+    latency: float = 0.0
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        time.sleep(self.latency)
+        return super()._call(prompt, stop, run_manager, **kwargs)
+
+    async def _acall(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        await asyncio.sleep(self.latency)
+        return await super()._acall(prompt, stop, run_manager, **kwargs)
+
+
+def make_stub_tools(latency: float) -> List[Tool]:
+    """Build blocking stand-ins for the RAG and web search tools."""
+    def stub(name: str):
+        def run(query: str) -> str:
+            time.sleep(latency)
+            return f"{name} result for '{query}'"
+        return run
+
+    return [
+        Tool(name="InternalDocumentsRAG", func=stub("InternalDocumentsRAG"),
+             description="Answers questions about internal HR policies."),
+        Tool(name="WebSearch", func=stub("WebSearch"),
+             description="Searches the web for current information."),
+    ]
+
+
+def time_agent(mode: str, script: List[str], llm_latency: float, tool_latency: float, runs: int) -> float:
+    """Average seconds per question for an agent mode."""
+    llm = SlowFakeListLLM(responses=script, latency=llm_latency)
+    agent = build_agent(llm, make_stub_tools(tool_latency), mode=mode)
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        response = agent.invoke(QUESTION)
+        assert "16 weeks" in response["output"], f"unexpected {mode} answer: {response['output']!r}"
+    return (time.perf_counter() - start) / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Agent mode latency benchmark")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0, help="Simulated latency per LLM call")
+    parser.add_argument("--tool-latency-ms", type=float, default=1200.0, help="Simulated latency per tool call")
+    parser.add_argument("--runs", type=int, default=3, help="Questions per agent mode")
+    args = parser.parse_args()
+
+    llm_latency = args.llm_latency_ms / 1000.0
+    tool_latency = args.tool_latency_ms / 1000.0
+
+    react = time_agent("react", REACT_SCRIPT, llm_latency, tool_latency, args.runs)
+    print(f"react:    {react:6.2f}s per question  (3 LLM calls, 2 tool calls in series)")
+
+    parallel = time_agent("parallel", PARALLEL_SCRIPT, llm_latency, tool_latency, args.runs)
+    print(f"parallel: {parallel:6.2f}s per question  (2 LLM calls, 2 tool calls concurrently)")
+    print(f"speedup:  {react / parallel:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Guard the start-up time of the `ira` CLI.
+
+Starts fresh interpreters running `ira --help` (and any other argument lists given with
+--command) and fails when the median wall time exceeds the budget, or when importing
+the CLI pulls in any of the heavy modules that must only be imported by the commands
+that use them. On failure the slowest imports are listed (python -X importtime).
+
+Usage:
+    python benchmarks/cli_startup.py --budget-ms 300
+    python benchmarks/cli_startup.py --command=--help --command="setup --help" --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+# Modules the CLI must not import just to parse its arguments
+HEAVY_MODULES = (
+    "agents.research_agent",
+    "langchain",
+    "langchain_core",
+    "langchain_google_genai",
+    "langchain_tavily",
+    "langchain_chroma",
+    "chromadb",
+    "langgraph",
+    "mcp",
+    "pydantic_settings",
+)
+
+CLI = "import sys; from ira_cli.cli import cli; cli(sys.argv[1:])"
+
+
+def clean_env() -> dict:
+    """Environment without API keys, so nothing can depend on loading the settings."""
+    return {key: value for key, value in os.environ.items() if not key.endswith("_API_KEY")}
+
+
+def time_interpreter() -> float:
+    """Wall time in seconds of a bare interpreter start."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+def time_command(args: list, runs: int) -> list:
+    """Wall time in seconds of `ira <args>` in fresh interpreters."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", CLI, *args], cwd=project_root, env=clean_env(), capture_output=True, text=True
+        )
+        seconds.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise SystemExit(f"ira {' '.join(args)} failed:\n{result.stderr}")
+    return seconds
+
+
+def heavy_imports() -> list:
+    """Heavy modules present in sys.modules after importing the CLI."""
+    probe = (
+        "import sys; import ira_cli.cli; "
+        f"print('\\n'.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=project_root, env=clean_env(), capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def slowest_imports(count: int = 15) -> str:
+    """The slowest cumulative imports of the CLI module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import ira_cli.cli"],
+        cwd=project_root, env=clean_env(), capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return "\n".join(f"{us / 1000:8.1f} ms {name}" for us, name in rows[:count])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CLI start-up time guard")
+    parser.add_argument("--budget-ms", type=float, default=300.0, help="Maximum median wall time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per command")
+    parser.add_argument("--command", action="append", help="Arguments to time (default: --help)")
+    args = parser.parse_args()
+
+    failed = False
+    baseline = statistics.median([time_interpreter() for _ in range(args.runs)])
+    print(f"{'python -c pass':<24} {baseline * 1000:8.1f} ms (interpreter start-up)")
+
+    for command in args.command or ["--help"]:
+        median = statistics.median(time_command(command.split(), args.runs))
+        ok = median * 1000 <= args.budget_ms
+        failed |= not ok
+        print(f"{'ira ' + command:<24} {median * 1000:8.1f} ms  {'ok' if ok else f'OVER BUDGET ({args.budget_ms:.0f} ms)'}")
+
+    heavy = heavy_imports()
+    if heavy:
+        failed = True
+        print(f"importing ira_cli.cli loads heavy modules: {', '.join(heavy)}")
+
+    if failed:
+        print("\nSlowest imports of ira_cli.cli:\n" + slowest_imports())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark DocumentLoader.load_documents across worker counts on a synthetic corpus.
+
+Usage:
+    python benchmarks/document_loading.py --files 200 --formats docx,txt --workers 1,2,4,8
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.document_loader import DocumentLoader
+
+PARAGRAPH = (
+    "Employees are entitled to annual leave as described in this policy. Requests must be "
+    "submitted through the HR portal at least two weeks in advance and approved by a manager. "
+)
+
+
+def generate_corpus(directory: Path, files: int, formats: list, paragraphs: int) -> None:
+    """Write a synthetic corpus of policy documents in the requested formats."""
+    for i in range(files):
+        file_format = formats[i % len(formats)]
+        path = directory / f"policy_{i:05d}.{file_format}"
+
+        if file_format == "docx":
+            import docx
+
+            document = docx.Document()
+            for _ in range(paragraphs):
+                document.add_paragraph(PARAGRAPH)
+            document.save(str(path))
+        elif file_format == "txt":
+            path.write_text("\n\n".join([PARAGRAPH] * paragraphs), encoding="utf-8")
+        else:
+            raise ValueError(f"Unsupported synthetic format: {file_format}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Document loading benchmark")
+    parser.add_argument("--files", type=int, default=200, help="Number of synthetic files")
+    parser.add_argument("--formats", default="docx,txt", help="Comma-separated formats (docx, txt)")
+    parser.add_argument("--paragraphs", type=int, default=50, help="Paragraphs per file")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp)
+        formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+        print(f"Generating {args.files} files ({', '.join(formats)}) in {corpus}...")
+        generate_corpus(corpus, args.files, formats, args.paragraphs)
+
+        print(f"{'workers':>8} {'seconds':>10} {'files/s':>10} {'documents':>10}")
+        for workers in [int(w) for w in args.workers.split(",")]:
+            loader = DocumentLoader(str(corpus), max_workers=workers)
+            start = time.perf_counter()
+            documents = loader.load_documents()
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {elapsed:>10.2f} {args.files / elapsed:>10.1f} {len(documents):>10}")
+
+
+if __name__ == "__main__":
+    main()
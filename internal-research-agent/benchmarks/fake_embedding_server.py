@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Local fake embedding endpoint for exercising the embedding layer without API calls.
+
+Returns deterministic hash-based vectors with a configurable latency, and rejects a
+fraction of requests with HTTP 429 to exercise the backoff path.
+
+Usage:
+    python benchmarks/fake_embedding_server.py --port 8765 --latency-ms 200 --error-rate 0.1
+    EMBEDDING_ENDPOINT=http://127.0.0.1:8765/embed python -m ira_cli init --force
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_vector(text: str, dimensions: int) -> list:
+    """Build a deterministic pseudo-random unit-ish vector for text."""
+    seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16) % (2 ** 32)
+    rng = random.Random(seed)
+    return [rng.uniform(-1.0, 1.0) for _ in range(dimensions)]
+
+
+class FakeEmbeddingHandler(BaseHTTPRequestHandler):
+    """Serve POST /embed requests."""
+
+    def do_POST(self) -> None:
+        config = self.server.config
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+            self.server.stats["texts"] += len(body["texts"])
+
+        time.sleep(config.latency_ms / 1000.0)
+
+        if len(body["texts"]) > config.max_batch or random.random() < config.error_rate:
+            self.send_response(429)
+            self.end_headers()
+            self.wfile.write(b'{"error": "quota exceeded"}')
+            return
+
+        payload = {"embeddings": [fake_vector(text, config.dimensions) for text in body["texts"]]}
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake embedding endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dimensions", type=int, default=768)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--max-batch", type=int, default=100, help="Largest batch accepted before answering 429")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), FakeEmbeddingHandler)
+    server.config = args
+    server.stats = {"requests": 0, "texts": 0}
+    server.stats_lock = threading.Lock()
+
+    print(f"Fake embedding endpoint on http://127.0.0.1:{args.port}/embed (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nServed {server.stats['requests']} requests for {server.stats['texts']} texts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+In-memory fakes of the Google Drive v3 and Docs v1 API clients.
+
+They implement the subset of the discovery client used by GoogleDocsMCPServer
+(files().list with paging, documents().get with field masks and batch HTTP requests)
+with a configurable per-round-trip latency, so fetching strategies can be exercised
+without network access.
+"""
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+def make_document(doc_id: str, paragraphs: int = 20, tables: int = 0) -> Dict[str, Any]:
+    """Build a synthetic Docs API document resource with paragraphs and optional tables."""
+    content: List[Dict[str, Any]] = []
+    for p in range(paragraphs):
+        content.append({
+            "startIndex": p,
+            "paragraph": {
+                "elements": [
+                    {"textRun": {"content": f"Paragraph {p} of {doc_id}. ", "textStyle": {"bold": p % 2 == 0}}},
+                    {"textRun": {"content": "Coverage details and claim procedures.\n", "textStyle": {}}}
+                ],
+                "paragraphStyle": {"namedStyleType": "NORMAL_TEXT", "direction": "LEFT_TO_RIGHT"}
+            }
+        })
+
+    for t in range(tables):
+        rows = []
+        for r in range(5):
+            cells = []
+            for c in range(3):
+                cells.append({
+                    "content": [{"paragraph": {"elements": [{"textRun": {"content": f"cell {t}.{r}.{c}\n"}}]}}],
+                    "tableCellStyle": {"rowSpan": 1, "columnSpan": 1}
+                })
+            rows.append({"tableCells": cells})
+        content.append({"table": {"rows": 5, "columns": 3, "tableRows": rows}})
+
+    return {
+        "documentId": doc_id,
+        "title": f"Document {doc_id}",
+        "body": {"content": content},
+        "documentStyle": {"pageSize": {"height": {"magnitude": 792}, "width": {"magnitude": 612}}},
+        "namedStyles": {"styles": [{"namedStyleType": "NORMAL_TEXT", "textStyle": {"fontSize": {"magnitude": 11}}}]},
+        "revisionId": "fake-revision"
+    }
+
+
+def parse_field_mask(fields: str) -> Dict[str, Any]:
+    """
+    Parse a partial-response field mask such as "body(content(paragraph,table))" into a tree.
+
+    Leaves map to an empty dict, meaning "the whole value". "a/b" is read as "a(b)".
+    """
+    root: Dict[str, Any] = {}
+    stack = [root]
+    name = ""
+
+    def add(node: Dict[str, Any], path: str) -> Dict[str, Any]:
+        for part in path.split("/"):
+            node = node.setdefault(part, {})
+        return node
+
+    for char in fields.replace(" ", "") + ",":
+        if char == "(":
+            stack.append(add(stack[-1], name))
+            name = ""
+        elif char in ",)":
+            if name:
+                add(stack[-1], name)
+                name = ""
+            if char == ")":
+                stack.pop()
+        else:
+            name += char
+    return root
+
+
+def apply_field_mask(value: Any, mask: Dict[str, Any]) -> Any:
+    """Keep only the masked fields of a resource, applying the mask to every item of lists."""
+    if not mask:
+        return value
+    if isinstance(value, list):
+        return [apply_field_mask(item, mask) for item in value]
+    if isinstance(value, dict):
+        return {key: apply_field_mask(value[key], sub) for key, sub in mask.items() if key in value}
+    return value
+
+
+class FakeRequest:
+    """A pending API request; execute() simulates one HTTP round-trip."""
+
+    def __init__(self, service: "FakeGoogleService", func: Callable[[], Any]):
+        self.service = service
+        self.func = func
+
+    def execute(self, http=None, **kwargs) -> Any:
+        self.service.round_trips += 1
+        time.sleep(self.service.latency)
+        return self.func()
+
+
+class FakeBatchRequest:
+    """Fake BatchHttpRequest: all added requests are answered in a single round-trip."""
+
+    def __init__(self, service: "FakeGoogleService", callback: Optional[Callable] = None):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request: FakeRequest, callback: Optional[Callable] = None, request_id: Optional[str] = None) -> None:
+        self.requests.append((request_id or str(len(self.requests)), request, callback or self.callback))
+
+    def execute(self, http=None) -> None:
+        self.service.round_trips += 1
+        time.sleep(self.service.latency)
+        for request_id, request, callback in self.requests:
+            try:
+                response, exception = request.func(), None
+            except Exception as e:
+                response, exception = None, e
+            callback(request_id, response, exception)
+
+
+class FakeGoogleService:
+    """Fake Drive and Docs service over an in-memory folder of documents."""
+
+    def __init__(self, documents: Dict[str, Dict[str, Any]], latency: float = 0.05, page_size: int = 100):
+        """
+        Args:
+            documents: Mapping of document ID to {"name", "modifiedTime", "document"}
+            latency: Seconds per simulated HTTP round-trip
+            page_size: Maximum files returned per files().list page
+        """
+        self.folder = documents
+        self.latency = latency
+        self.page_size = page_size
+        self.round_trips = 0
+
+    # Drive v3
+    def files(self) -> "FakeGoogleService":
+        return self
+
+    def list(self, pageToken: Optional[str] = None, pageSize: Optional[int] = None, **kwargs) -> FakeRequest:
+        ids = sorted(self.folder)
+        start = int(pageToken or 0)
+        size = min(pageSize or self.page_size, self.page_size)
+
+        def respond():
+            files = [
+                {"id": doc_id, "name": self.folder[doc_id]["name"],
+                 "modifiedTime": self.folder[doc_id]["modifiedTime"]}
+                for doc_id in ids[start:start + size]
+            ]
+            response = {"files": files}
+            if start + size < len(ids):
+                response["nextPageToken"] = str(start + size)
+            return response
+
+        return FakeRequest(self, respond)
+
+    # Docs v1
+    def documents(self) -> "FakeGoogleService":
+        return self
+
+    def get(self, documentId: str, fields: Optional[str] = None, **kwargs) -> FakeRequest:
+        mask = parse_field_mask(fields) if fields else {}
+
+        def respond():
+            if documentId not in self.folder:
+                raise KeyError(f"Document {documentId} not found")
+            return apply_field_mask(self.folder[documentId]["document"], mask)
+
+        return FakeRequest(self, respond)
+
+    def new_batch_http_request(self, callback: Optional[Callable] = None) -> FakeBatchRequest:
+        return FakeBatchRequest(self, callback)
+
+
+def make_folder(count: int, paragraphs: int = 20, tables: int = 0) -> Dict[str, Dict[str, Any]]:
+    """Build a fake folder of count documents."""
+    return {
+        f"doc{i:04d}": {
+            "name": f"Insurance Policy {i}",
+            "modifiedTime": "2024-01-01T00:00:00Z",
+            "document": make_document(f"doc{i:04d}", paragraphs, tables)
+        }
+        for i in range(count)
+    }
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs batched Google Docs fetching against a fake Drive/Docs service.
+
+Usage:
+    python benchmarks/google_docs_fetching.py --docs 200 --latency-ms 80
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.fake_google_services import FakeGoogleService, make_folder
+from mcp_server.google_docs_server import GoogleDocsMCPServer
+
+
+def make_server(service: FakeGoogleService) -> GoogleDocsMCPServer:
+    """Create a server wired to the fake service instead of the real Google APIs."""
+    server = GoogleDocsMCPServer(credentials_path="", folder_id="fake-folder", list_ttl=0)
+    server.drive_service = service
+    server.docs_service = service
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Google Docs fetching benchmark")
+    parser.add_argument("--docs", type=int, default=200, help="Documents in the fake folder")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="Simulated latency per HTTP round-trip")
+    args = parser.parse_args()
+
+    folder = make_folder(args.docs)
+
+    service = FakeGoogleService(folder, latency=args.latency_ms / 1000.0)
+    server = make_server(service)
+    documents = server.get_documents_in_folder()
+    listing_trips = service.round_trips
+    start = time.perf_counter()
+    sequential = [server.get_document_content(doc["id"]) for doc in documents]
+    elapsed = time.perf_counter() - start
+    print(f"sequential: {elapsed:6.2f}s  {service.round_trips - listing_trips:4d} round-trips")
+
+    service = FakeGoogleService(folder, latency=args.latency_ms / 1000.0)
+    server = make_server(service)
+    documents = server.list_documents_cached()
+    listing_trips = service.round_trips
+    start = time.perf_counter()
+    batched = server.get_cached_documents_content(documents)
+    elapsed = time.perf_counter() - start
+    print(f"batched:    {elapsed:6.2f}s  {service.round_trips - listing_trips:4d} round-trips")
+
+    start = time.perf_counter()
+    server.get_cached_documents_content(server.list_documents_cached())
+    elapsed = time.perf_counter() - start
+    print(f"cached:     {elapsed:6.2f}s  (listing only, {listing_trips} pages)")
+
+    assert sequential == batched, "batched fetch returned different content"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark full vs field-masked Google Docs fetches on a large synthetic document.
+
+Compares the response size (raw and gzip-compressed, as sent over the wire), JSON decode
+time and text extraction time of the unmasked documents().get response parsed by the
+previous paragraph-only extractor against the DOCUMENT_FIELDS response parsed by
+GoogleDocsMCPServer.extract_text.
+
+Usage:
+    python benchmarks/google_docs_parsing.py --paragraphs 20000 --tables 500
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.fake_google_services import FakeGoogleService, make_document
+from mcp_server.google_docs_server import DOCUMENT_FIELDS, GoogleDocsMCPServer
+
+
+def legacy_extract_text(document):
+    """The previous extractor: top-level paragraphs only, tables are skipped."""
+    content = document.get('body', {}).get('content', [])
+    text_content = []
+
+    for element in content:
+        if 'paragraph' in element:
+            for para_element in element['paragraph']['elements']:
+                if 'textRun' in para_element:
+                    text_content.append(para_element['textRun']['content'])
+
+    return ''.join(text_content).strip()
+
+
+def measure(label, payload: bytes, extract, repeat: int) -> str:
+    """Time decoding and extraction of a response body, returning the extracted text."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        document = json.loads(payload)
+    decode = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = extract(document)
+    walk = (time.perf_counter() - start) / repeat
+
+    print(
+        f"{label:<8} {len(payload) / 1e6:8.2f} MB  {len(gzip.compress(payload)) / 1e6:7.2f} MB gzip  "
+        f"decode {decode * 1000:8.1f} ms  extract {walk * 1000:7.1f} ms  {len(text):>9,d} chars"
+    )
+    return text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Google Docs field mask benchmark")
+    parser.add_argument("--paragraphs", type=int, default=20000, help="Paragraphs in the synthetic document")
+    parser.add_argument("--tables", type=int, default=500, help="5x3 tables in the synthetic document")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    args = parser.parse_args()
+
+    service = FakeGoogleService(
+        {"big": {"name": "Big", "modifiedTime": "", "document": make_document("big", args.paragraphs, args.tables)}},
+        latency=0.0
+    )
+    full = json.dumps(service.documents().get(documentId="big").execute()).encode()
+    masked = json.dumps(service.documents().get(documentId="big", fields=DOCUMENT_FIELDS).execute()).encode()
+
+    before = measure("full", full, legacy_extract_text, args.repeat)
+    after = measure("masked", masked, GoogleDocsMCPServer.extract_text, args.repeat)
+
+    # Without tables both paths must agree; with tables the new walker adds the cell text
+    if args.tables:
+        assert "cell 0.0.0" in after and "cell 0.0.0" not in before, "table text was not extracted"
+    else:
+        assert after == before, "masked fetch returned different text"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-call cost of logging in the calling thread.
+
+Compares the previous setup (RichHandler and FileHandler called synchronously, f-string
+messages) with utils.logger.setup_logger (QueueHandler feeding a background
+QueueListener, lazy %-style arguments, sampling of extra=SAMPLED messages) for:
+
+- enabled:  an INFO message with the logger at INFO
+- filtered: a DEBUG message with the logger at INFO
+- sampled:  a per-document INFO message logged with extra=SAMPLED
+
+The time the listener needs to drain the queue is reported separately; it is spent on the
+background thread, not in the hot path.
+
+Usage:
+    python benchmarks/logging_overhead.py --calls 20000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.logging import RichHandler
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.logger import SAMPLED, setup_logger, shutdown_logging
+
+
+def legacy_logger(log_file: str) -> logging.Logger:
+    """The previous setup_logger: synchronous Rich console and file handlers."""
+    logger = logging.getLogger("bench_legacy")
+    logger.setLevel(logging.INFO)
+    logger.handlers.clear()
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    for handler in (RichHandler(console=Console(), show_time=True, show_path=False, markup=True),
+                    logging.FileHandler(log_file)):
+        handler.setLevel(logging.INFO)
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
+
+def per_call_us(func, calls: int) -> float:
+    """Average microseconds per call of func(i)."""
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Logging overhead benchmark")
+    parser.add_argument("--calls", type=int, default=20000, help="Log calls per case")
+    args = parser.parse_args()
+
+    path = Path("hr_docs/policies/annual-leave.pdf")
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        old = legacy_logger(os.path.join(tmp, "legacy.log"))
+        results["legacy"] = {
+            "enabled": per_call_us(lambda i: old.info(f"Successfully loaded {i} chunks from {path}"), args.calls),
+            "filtered": per_call_us(lambda i: old.debug(f"Successfully loaded {i} chunks from {path}"), args.calls),
+            "sampled": per_call_us(lambda i: old.info(f"Loading document: {path}"), args.calls),
+            "drain": 0.0,
+        }
+
+        new = setup_logger("bench_queue", level="INFO", log_file=os.path.join(tmp, "queue.log"))
+        results["queue"] = {
+            "enabled": per_call_us(lambda i: new.info("Successfully loaded %s chunks from %s", i, path), args.calls),
+            "filtered": per_call_us(lambda i: new.debug("Successfully loaded %s chunks from %s", i, path), args.calls),
+            "sampled": per_call_us(lambda i: new.info("Loading document: %s", path, extra=SAMPLED), args.calls),
+        }
+        start = time.perf_counter()
+        shutdown_logging()
+        results["queue"]["drain"] = (time.perf_counter() - start) * 1000
+
+    print(f"{'':<8} {'enabled':>10} {'filtered':>10} {'sampled':>10}   (us per call)   queue drain after the run")
+    for name, cases in results.items():
+        print(
+            f"{name:<8} " + " ".join(f"{cases[case]:10.2f}" for case in ("enabled", "filtered", "sampled"))
+            + f"{cases['drain']:25.1f} ms"
+        )
+    print(f"enabled speedup in the calling thread: {results['legacy']['enabled'] / results['queue']['enabled']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
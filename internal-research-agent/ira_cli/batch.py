@@ -0,0 +1,238 @@
+"""
+Bulk question answering for the Internal Research Agent.
+
+Questions are read from a JSONL file and answered by a single agent instance with a
+bounded pool of concurrent workers. Every answer is appended to the output JSONL as soon
+as it is ready, so the output doubles as the checkpoint: re-running the same command
+skips questions that already have a record.
+"""
+import asyncio
+import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import logger
+
+
+def load_questions(path: str) -> List[Dict[str, Any]]:
+    """
+    Load questions from a JSONL file.
+
+    Each line is either an object with a "question" key (and optionally an "id") or a
+    JSON string. Questions without an id are numbered by line.
+
+    Args:
+        path: Path of the questions file
+
+    Returns:
+        List of {"id", "question"} dictionaries
+
+    Raises:
+        ValueError: If a line is not valid or two questions share an id
+    """
+    questions = []
+    seen = set()
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}")
+
+            if isinstance(item, str):
+                item = {"question": item}
+            if not isinstance(item, dict) or not str(item.get("question", "")).strip():
+                raise ValueError(f"{path}:{line_number}: expected a question")
+
+            question_id = str(item.get("id", line_number))
+            if question_id in seen:
+                raise ValueError(f"{path}:{line_number}: duplicate id {question_id!r}")
+            seen.add(question_id)
+            questions.append({"id": question_id, "question": str(item["question"]).strip()})
+
+    return questions
+
+
+def load_checkpoint(path: str, retry_errors: bool = False) -> set:
+    """
+    Get the ids of questions that already have a record in the output file.
+
+    Args:
+        path: Path of the output JSONL file
+        retry_errors: Do not count records with an error, so those questions run again
+
+    Returns:
+        Set of completed question ids
+    """
+    done = set()
+    if not Path(path).exists():
+        return done
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a truncated last line; that question simply runs again
+                continue
+            if retry_errors and record.get("error"):
+                continue
+            done.add(str(record.get("id")))
+
+    return done
+
+
+def trim_partial_line(path: str) -> None:
+    """
+    Cut a file back to its last complete line.
+
+    A crash while writing can leave a truncated last record; appending after it would
+    glue the next record onto it.
+
+    Args:
+        path: Path of the output JSONL file
+    """
+    if not Path(path).exists():
+        return
+
+    with open(path, "rb+") as f:
+        size = f.seek(0, 2)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+
+        f.seek(0)
+        data = f.read()
+        f.truncate(data.rfind(b"\n") + 1)
+        logger.warning("Dropped a truncated last record from %s", path)
+
+
+def tools_used(response: Any) -> List[str]:
+    """
+    List the tools an agent response used, in order.
+
+    Understands ReAct intermediate steps, parallel agent tool calls and the router's
+    RAG fast path.
+    """
+    if not isinstance(response, dict):
+        return []
+    if response.get("route") == "rag":
+        return ["InternalDocumentsRAG"]
+    if "tool_calls" in response:
+        return [call["tool"] for call in response["tool_calls"]]
+    return [step[0].tool for step in response.get("intermediate_steps", [])]
+
+
+def answer_text(response: Any) -> str:
+    """Get the answer text from an agent response."""
+    if isinstance(response, dict) and "output" in response:
+        return str(response["output"])
+    return str(response)
+
+
+async def run_batch(
+    query: Callable[[str], Any],
+    questions: List[Dict[str, Any]],
+    out_path: str,
+    concurrency: int = 4,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Answer questions with a bounded pool of concurrent workers.
+
+    Args:
+        query: Blocking function answering one question (e.g. ResearchAgent.query)
+        questions: Questions to answer, as {"id", "question"} dictionaries
+        out_path: Output JSONL file; records are appended and flushed one by one
+        concurrency: Number of questions in flight
+        on_result: Optional callback invoked with each record
+
+    Returns:
+        Records written in this run
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in questions:
+        queue.put_nowait(item)
+
+    records = []
+    write_lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ira-batch")
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    trim_partial_line(out_path)
+    with open(out_path, "a", encoding="utf-8") as out:
+
+        async def worker() -> None:
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                record = {
+                    "id": item["id"],
+                    "question": item["question"],
+                    "started_at": datetime.now(timezone.utc).isoformat()
+                }
+                start = time.perf_counter()
+                try:
+                    response = await loop.run_in_executor(executor, query, item["question"])
+                    record.update(
+                        answer=answer_text(response),
+                        route=response.get("route", "agent") if isinstance(response, dict) else "agent",
+                        tools=tools_used(response)
+                    )
+                except Exception as e:
+                    logger.error("Question %s failed: %s", item['id'], e)
+                    record.update(answer=None, tools=[], error=f"{type(e).__name__}: {e}")
+                record["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+                async with write_lock:
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    records.append(record)
+                if on_result:
+                    on_result(record)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return records
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarise a batch run.
+
+    Returns:
+        Dictionary with counts, latency percentiles (ms) and tool usage
+    """
+    latencies = sorted(record["latency_ms"] for record in records if not record.get("error"))
+
+    def percentile(p: float) -> Optional[float]:
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))]
+
+    tool_counts = Counter(tool for record in records for tool in record.get("tools", []))
+    return {
+        "answered": len(latencies),
+        "failed": sum(1 for record in records if record.get("error")),
+        "latency_p50_ms": percentile(50),
+        "latency_p95_ms": percentile(95),
+        "latency_max_ms": latencies[-1] if latencies else None,
+        "tool_usage": dict(tool_counts.most_common())
+    }
@@ -0,0 +1,436 @@
+"""
+Offline benchmark harness for the Internal Research Agent.
+
+Runs the real vector store, RAG chain, router-free agent and tracing code against a fake
+chat model, fake embeddings and fake tools with fixed, configurable latencies, so numbers
+are comparable between commits and need no Gemini, Tavily or Google credentials. With
+the default zero latencies every measured millisecond is the application's own overhead.
+
+The report is a JSON document meant to be stored per commit and compared over time.
+"""
+import hashlib
+import json
+import math
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from langchain.schema import Document
+from langchain.tools import Tool
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from services.document_loader import DocumentLoader
+from services.embeddings import CachedBatchEmbeddings
+from services.tool_cache import ToolResultCache
+from services.vector_store import VectorStoreService
+from utils.tracing import TraceExporter
+from ira_cli.config import settings
+
+REPORT_VERSION = 1
+
+# Vocabulary of the synthetic corpus and queries
+WORDS = (
+    "leave policy employee benefits salary payroll holiday remote work office travel expense claim "
+    "insurance health dental vision pension retirement training onboarding review performance bonus "
+    "overtime schedule shift manager approval compliance security laptop device password access "
+    "conduct harassment complaint grievance parental maternity paternity sick vacation notice "
+    "resignation termination probation contract contractor relocation allowance meal transport"
+).split()
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic hashed bag-of-words embeddings with a fixed latency per request."""
+
+    def __init__(self, dimensions: int = 256, latency: float = 0.0):
+        """
+        Initialize the fake model.
+
+        Args:
+            dimensions: Vector size
+            latency: Seconds slept per request (a batch of documents or one query)
+        """
+        self.dimensions = dimensions
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(word.encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dimensions] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def _request(self) -> None:
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self._request()
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self._request()
+        return self._vector(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        self._request()
+        return [self._vector(text) for text in texts]
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that plays the agent's part deterministically.
+
+    It recognises the ReAct, plan-and-execute and RAG prompts: a ReAct agent is told to
+    call each tool once in order and then answer, the parallel planner plans one call per
+    tool, and anything else gets a short answer. Responses carry token usage so traces
+    are complete.
+    """
+
+    tool_names: List[str]
+    latency: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-bench"
+
+    def respond(self, prompt: str) -> str:
+        """Build the response to a prompt."""
+        question = re.findall(r"Question: (.*)", prompt)
+        question = question[-1].strip() if question else "the question"
+
+        if "Respond with JSON only" in prompt:
+            return json.dumps({"calls": [{"tool": name, "input": question} for name in self.tool_names]})
+
+        if "Begin!" in prompt:
+            step = prompt.split("Begin!")[-1].count("Observation:")
+            if step < len(self.tool_names):
+                return f"Thought: I should use {self.tool_names[step]}.\nAction: {self.tool_names[step]}\nAction Input: {question}"
+            return f"Thought: I now know the final answer.\nFinal Answer: Benchmark answer to {question}"
+
+        return f"Benchmark answer to {question}"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt = "\n".join(str(message.content) for message in messages)
+        text = self.respond(prompt)
+        input_tokens, output_tokens = max(1, len(prompt) // 4), max(1, len(text) // 4)
+        message = AIMessage(content=text, usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def make_fake_tools(latency: float = 0.0, names: Sequence[str] = ("WebSearch", "google_docs_mcp")) -> List[Tool]:
+    """
+    Create tools that sleep for a fixed time and return a canned result.
+
+    Args:
+        latency: Seconds each call takes
+        names: Tool names
+
+    Returns:
+        List of tools
+    """
+    def make_tool(name: str) -> Tool:
+        def run(query: str) -> str:
+            if latency:
+                time.sleep(latency)
+            return f"{name} result for {query!r}."
+
+        return Tool(name=name, func=run, description=f"Fake {name} tool for benchmarks.")
+
+    return [make_tool(name) for name in names]
+
+
+def make_corpus(size: int, words_per_document: int = 200, seed: int = 0) -> List[Document]:
+    """Generate a deterministic synthetic corpus of documents."""
+    rng = random.Random(seed)
+    return [
+        Document(
+            page_content=" ".join(rng.choice(WORDS) for _ in range(words_per_document)),
+            metadata={"source": f"bench/doc-{i:06d}.txt"}
+        )
+        for i in range(size)
+    ]
+
+
+def make_queries(count: int, seed: int = 1) -> List[str]:
+    """Generate deterministic questions over the corpus vocabulary."""
+    rng = random.Random(seed)
+    return [f"What is the {' '.join(rng.sample(WORDS, 3))} policy? ({i})" for i in range(count)]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, Optional[float]]:
+    """Summarise latencies in milliseconds."""
+    if not seconds:
+        return {"count": 0, "mean_ms": None, "p50_ms": None, "p95_ms": None, "max_ms": None}
+    ordered = sorted(seconds)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[min(len(ordered) - 1, int(round(0.50 * (len(ordered) - 1))))] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3)
+    }
+
+
+def make_vector_store(path: Path, embeddings: Embeddings) -> VectorStoreService:
+    """Create a vector store service in a scratch directory, without an embedding cache."""
+    return VectorStoreService(
+        vector_store_path=str(path),
+        embeddings=CachedBatchEmbeddings(
+            embeddings,
+            model_name="fake-bench",
+            batch_size=settings.embedding_batch_size,
+            max_concurrency=settings.embedding_concurrency
+        )
+    )
+
+
+def bench_cold_start(runs: int = 3) -> Dict[str, Any]:
+    """
+    Time a fresh interpreter importing the CLI (what every `ira` command pays).
+
+    Args:
+        runs: Number of fresh interpreters to start
+
+    Returns:
+        Wall-clock latency summary
+    """
+    root = Path(__file__).resolve().parent.parent
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import ira_cli.cli"], cwd=root, check=True, capture_output=True)
+        seconds.append(time.perf_counter() - start)
+    return latency_summary(seconds)
+
+
+def bench_vector_store(
+    sizes: Sequence[int],
+    queries: int,
+    embedding_latency: float,
+    workdir: Path,
+    k: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    Measure ingestion throughput and search latency per corpus size.
+
+    Args:
+        sizes: Corpus sizes in documents
+        queries: Searches per corpus size
+        embedding_latency: Seconds per fake embedding request
+        workdir: Scratch directory for the vector stores
+        k: Results per search
+
+    Returns:
+        One result per corpus size
+    """
+    results = []
+    questions = make_queries(queries)
+
+    for size in sizes:
+        embeddings = FakeEmbeddings(latency=embedding_latency)
+        service = make_vector_store(workdir / f"store-{size}", embeddings)
+        documents = make_corpus(size)
+
+        start = time.perf_counter()
+        service.create_vector_store(documents, force_recreate=True)
+        ingest_seconds = time.perf_counter() - start
+        chunks = service.get_collection_info()["total_documents"]
+        ingest_requests = embeddings.requests
+
+        seconds = []
+        for question in questions:
+            start = time.perf_counter()
+            service.similarity_search(question, k=k)
+            seconds.append(time.perf_counter() - start)
+
+        results.append({
+            "documents": size,
+            "chunks": chunks,
+            "ingest_seconds": round(ingest_seconds, 4),
+            "chunks_per_second": round(chunks / ingest_seconds, 1) if ingest_seconds else None,
+            "embedding_requests": ingest_requests,
+            "search": latency_summary(seconds)
+        })
+
+    return results
+
+
+def bench_query(
+    mode: str,
+    queries: int,
+    llm_latency: float,
+    embedding_latency: float,
+    tool_latency: float,
+    workdir: Path,
+    corpus_size: int = 100
+) -> Dict[str, Any]:
+    """
+    Measure end-to-end ResearchAgent.query latency and the agent's own overhead.
+
+    The router and tool cache are disabled so every question takes the full agent path;
+    with TRACING_ENABLED, traces are written to the scratch directory.
+
+    Args:
+        mode: Agent mode ("react" or "parallel")
+        queries: Questions to ask
+        llm_latency: Seconds per fake LLM call
+        embedding_latency: Seconds per fake embedding request
+        tool_latency: Seconds per fake tool call
+        workdir: Scratch directory
+        corpus_size: Documents behind the RAG tool
+
+    Returns:
+        Latency summaries for the whole query and for the overhead left after subtracting
+        the simulated LLM and tool time on the critical path
+    """
+    from agents.research_agent import RAG_TOOL_NAME, ResearchAgent, build_agent
+
+    tools = make_fake_tools(tool_latency)
+    llm = FakeChatModel(tool_names=[RAG_TOOL_NAME] + [tool.name for tool in tools], latency=llm_latency)
+    service = make_vector_store(workdir / f"query-{mode}", FakeEmbeddings(latency=embedding_latency))
+    service.create_vector_store(make_corpus(corpus_size), force_recreate=True)
+
+    start = time.perf_counter()
+    agent = ResearchAgent(
+        llm=llm, vector_store_service=service, tools=tools, document_loader=DocumentLoader(str(workdir))
+    )
+    agent.tool_cache = ToolResultCache(default_ttl=0, ttls={}, persist_path="")
+    if agent.trace_exporter is not None:
+        agent.trace_exporter = TraceExporter(str(workdir / "traces.jsonl"), str(workdir / "metrics.prom"))
+    # initialize_agent() without the router, in the requested mode
+    agent.setup_rag_chain()
+    agent.agent = build_agent(llm, agent.setup_tools(), mode)
+    init_seconds = time.perf_counter() - start
+
+    total, overhead = [], []
+    llm_calls = 0
+    for question in make_queries(queries, seed=2):
+        calls_before = llm.calls
+        start = time.perf_counter()
+        agent.query(question)
+        elapsed = time.perf_counter() - start
+
+        calls = llm.calls - calls_before
+        llm_calls += calls
+        if mode == "react":
+            simulated = calls * llm_latency + len(tools) * tool_latency
+        else:
+            # The RAG tool's LLM call runs alongside the other tools
+            simulated = (calls - 1) * llm_latency + max(llm_latency, tool_latency)
+        total.append(elapsed)
+        overhead.append(max(0.0, elapsed - simulated))
+
+    return {
+        "mode": mode,
+        "init_seconds": round(init_seconds, 4),
+        "llm_calls_per_query": round(llm_calls / queries, 2) if queries else 0,
+        "total": latency_summary(total),
+        "overhead": latency_summary(overhead)
+    }
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = (100, 1000),
+    queries: int = 20,
+    llm_latency: float = 0.0,
+    embedding_latency: float = 0.0,
+    tool_latency: float = 0.0,
+    cold_start_runs: int = 3,
+    modes: Sequence[str] = ("react", "parallel"),
+    on_step: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run every benchmark and build the report.
+
+    Args:
+        sizes: Corpus sizes for ingestion and search
+        queries: Searches per corpus size and questions per agent mode
+        llm_latency: Seconds per fake LLM call
+        embedding_latency: Seconds per fake embedding request
+        tool_latency: Seconds per fake tool call
+        cold_start_runs: Fresh interpreters to time (0 skips the cold start benchmark)
+        modes: Agent modes to benchmark
+        on_step: Optional callback invoked with the name of each benchmark as it starts
+
+    Returns:
+        JSON-serialisable report
+    """
+    def step(name: str) -> None:
+        if on_step:
+            on_step(name)
+
+    report = {
+        "version": REPORT_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git_commit": git_commit()
+        },
+        "config": {
+            "sizes": list(sizes),
+            "queries": queries,
+            "llm_latency": llm_latency,
+            "embedding_latency": embedding_latency,
+            "tool_latency": tool_latency,
+            "chunk_size": settings.chunk_size,
+            "chunk_overlap": settings.chunk_overlap,
+            "embedding_batch_size": settings.embedding_batch_size,
+            "embedding_concurrency": settings.embedding_concurrency
+        }
+    }
+
+    if cold_start_runs:
+        step("cold start")
+        report["cold_start"] = bench_cold_start(cold_start_runs)
+
+    with tempfile.TemporaryDirectory(prefix="ira-bench-") as tmp:
+        workdir = Path(tmp)
+        step("ingestion and search")
+        report["vector_store"] = bench_vector_store(sizes, queries, embedding_latency, workdir)
+        report["query"] = []
+        for mode in modes:
+            step(f"{mode} queries")
+            report["query"].append(
+                bench_query(mode, queries, llm_latency, embedding_latency, tool_latency, workdir)
+            )
+
+    return report
+
+
+def git_commit() -> Optional[str]:
+    """Get the current git commit, if the code runs from a checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
@@ -1,7 +1,15 @@
+"""
+Command line interface of the Internal Research Agent.
+
+Heavy dependencies (LangChain, Chroma, the Google and Tavily clients, pydantic settings)
+are imported inside the commands that need them, so `ira --help`, `ira setup` and
+commands answered by the daemon start quickly; benchmarks/cli_startup.py guards this.
+"""
+import json
 import os
 import sys
 import re
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from pathlib import Path
 
 # Add the project root to Python path
@@ -13,11 +21,11 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
-from rich import print as rprint
 
-from agents.research_agent import ResearchAgent
 from utils.logger import logger, setup_logger
-from ira_cli.config import settings
+
+if TYPE_CHECKING:
+    from agents.research_agent import ResearchAgent
 
 console = Console()
 
@@ -36,14 +44,111 @@ def clean_response(response):
     return answer.strip()
 
 
-@click.group()
+def stream_response(agent, question: str) -> str:
+    """
+    Answer a question, showing tool steps and final-answer tokens live.
+
+    Agents without streaming support (such as the daemon proxy) are queried normally.
+
+    Returns:
+        The cleaned final answer
+    """
+    import asyncio
+
+    from rich.console import Group
+    from rich.live import Live
+    from rich.text import Text
+
+    if not hasattr(agent, "astream_query"):
+        with console.status("[dim]Processing...[/dim]"):
+            answer = clean_response(agent.query(question))
+        console.print(Panel(answer, title="[bold blue]Answer[/bold blue]"))
+        return answer
+
+    steps = Text(style="dim")
+    tokens = []
+
+    def render(body: str):
+        panel = Panel(body or "[dim]Thinking...[/dim]", title="[bold blue]Answer[/bold blue]")
+        return Group(steps, panel) if steps.plain else panel
+
+    async def run() -> str:
+        final = ""
+        with Live(render(""), console=console, refresh_per_second=12) as live:
+            async for event in agent.astream_query(question):
+                if event["type"] == "tool_start":
+                    steps.append(f"→ {event['tool']}: {event['input']}\n")
+                elif event["type"] == "tool_end":
+                    steps.append(f"✓ {event['tool']} done\n")
+                elif event["type"] == "token":
+                    tokens.append(event["text"])
+                elif event["type"] == "final":
+                    final = event["output"] or "".join(tokens)
+                live.update(render("".join(tokens)))
+
+            # The streamed tokens are replaced by the formatted final answer
+            final = clean_response(final)
+            live.update(render(final))
+        return final
+
+    return asyncio.run(run())
+
+
+def get_agent(ctx: click.Context):
+    """Return a proxy to the running agent daemon, or a freshly initialized local agent."""
+    from ira_cli.daemon import DaemonClient, RemoteAgent
+
+    if not ctx.obj.get("no_daemon"):
+        client = DaemonClient()
+        if client.is_running():
+            logger.info("Forwarding to agent daemon at %s", client.socket_path)
+            return RemoteAgent(client)
+
+    from agents.research_agent import ResearchAgent
+
+    agent = ResearchAgent()
+    agent.initialize_agent()
+    return agent
+
+
+class CLIGroup(click.Group):
+    """Command group that notes when the command line only asks for help."""
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        ctx.meta["help_only"] = bool(set(ctx.help_option_names).intersection(args))
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=CLIGroup)
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose logging')
 @click.option('--log-file', help='Log file path')
-def cli(verbose: bool, log_file: Optional[str]):
+@click.option('--log-format', type=click.Choice(['text', 'json']), help='Log format (defaults to LOG_FORMAT)')
+@click.option('--no-daemon', is_flag=True, help='Do not forward commands to a running agent daemon')
+@click.pass_context
+def cli(ctx: click.Context, verbose: bool, log_file: Optional[str], log_format: Optional[str], no_daemon: bool):
     """Internal Research Agent - AI-powered document research and analysis."""
+    ctx.ensure_object(dict)
+    ctx.obj["no_daemon"] = no_daemon
+
     # Set up logging - quiet by default, verbose only when requested
     log_level = "DEBUG" if verbose else "ERROR"
-    setup_logger(level=log_level, log_file=log_file)
+    if ctx.meta.get("help_only"):
+        # Only a subcommand's help is shown, so skip loading the settings
+        setup_logger(level=log_level, log_file=log_file, log_format=log_format or "text")
+        return
+
+    try:
+        from ira_cli.config import settings
+
+        options = {
+            "log_format": log_format or settings.log_format,
+            "sample_every": settings.log_sample_every,
+            "sample_burst": settings.log_sample_burst
+        }
+    except ValueError:
+        # Missing API keys are reported by the commands that need them; setup writes them
+        options = {"log_format": log_format or "text"}
+    setup_logger(level=log_level, log_file=log_file, **options)
 
     if verbose:
         console.print("[yellow]Verbose logging enabled[/yellow]")
@@ -53,6 +158,8 @@ def cli(verbose: bool, log_file: Optional[str]):
 @click.option('--force', '-f', is_flag=True, help='Force recreate vector store')
 def init(force: bool):
     """Initialize the research agent and vector store."""
+    from agents.research_agent import ResearchAgent
+
     try:
         console.print("[bold blue]Initializing Research Agent...[/bold blue]")
 
@@ -74,21 +181,24 @@ def init(force: bool):
 
     except Exception as e:
         console.print(f"[bold red]Error initializing agent: {e}[/bold red]")
-        logger.error(f"Initialization error: {e}")
+        logger.error("Initialization error: %s", e)
         sys.exit(1)
 
 
 @cli.command()
 @click.argument('question', required=False)
 @click.option('--interactive', '-i', is_flag=True, help='Run in interactive mode')
-def query(question: Optional[str], interactive: bool):
+@click.option('--no-stream', is_flag=True, help='Print the answer only when it is complete')
+@click.pass_context
+def query(ctx: click.Context, question: Optional[str], interactive: bool, no_stream: bool):
     """Query the research agent with a question."""
     try:
-        agent = ResearchAgent()
-        agent.initialize_agent()
+        agent = get_agent(ctx)
 
         if interactive:
-            run_interactive_mode(agent)
+            run_interactive_mode(agent, stream=not no_stream)
+        elif question and not no_stream:
+            stream_response(agent, question)
         elif question:
             response = agent.query(question)
             answer = clean_response(response)
@@ -98,35 +208,73 @@ def query(question: Optional[str], interactive: bool):
 
     except Exception as e:
         console.print(f"[bold red]Error: {e}[/bold red]")
-        logger.error(f"Query error: {e}")
+        logger.error("Query error: %s", e)
         sys.exit(1)
 
 
 @cli.command()
 @click.argument('file_paths', nargs=-1, required=True)
-def add_docs(file_paths: List[str]):
+@click.pass_context
+def add_docs(ctx: click.Context, file_paths: List[str]):
     """Add new documents to the vector store."""
     try:
         console.print("[bold blue]Adding documents to vector store...[/bold blue]")
 
-        agent = ResearchAgent()
-        agent.initialize_agent()
+        agent = get_agent(ctx)
         agent.add_documents(file_paths)
 
         console.print(f"[bold green]✓ Successfully added {len(file_paths)} document(s)[/bold green]")
 
     except Exception as e:
         console.print(f"[bold red]Error adding documents: {e}[/bold red]")
-        logger.error(f"Add documents error: {e}")
+        logger.error("Add documents error: %s", e)
         sys.exit(1)
 
 
 @cli.command()
-def info():
+@click.pass_context
+def sync(ctx: click.Context):
+    """Incrementally sync the vector store with the documents directory."""
+    from ira_cli.daemon import DaemonClient, RemoteAgent
+
+    try:
+        console.print("[bold blue]Syncing vector store...[/bold blue]")
+
+        client = DaemonClient()
+        if not ctx.obj.get("no_daemon") and client.is_running():
+            counts = RemoteAgent(client).sync_documents()
+        else:
+            # Syncing only needs the loader and vector store, not the full agent
+            from agents.research_agent import ResearchAgent
+
+            counts = ResearchAgent().sync_documents()
+
+        table = Table(title="Sync Summary")
+        table.add_column("Property", style="cyan")
+        table.add_column("Value", style="green")
+
+        for key, value in counts.items():
+            table.add_row(key, str(value))
+
+        console.print(table)
+        console.print("[bold green]✓ Vector store is in sync[/bold green]")
+
+    except Exception as e:
+        console.print(f"[bold red]Error syncing documents: {e}[/bold red]")
+        logger.error("Sync error: %s", e)
+        sys.exit(1)
+
+
+@cli.command()
+@click.pass_context
+def info(ctx: click.Context):
     """Show information about the current setup."""
+    from ira_cli.daemon import RemoteAgent
+
     try:
-        agent = ResearchAgent()
-        agent.initialize_agent()
+        from ira_cli.config import settings
+
+        agent = get_agent(ctx)
 
         info = agent.get_vector_store_info()
 
@@ -141,47 +289,303 @@ def info():
         table.add_row("Chunk Overlap", str(settings.chunk_overlap))
         table.add_row("Documents Path", settings.docs_path)
         table.add_row("Vector Store Path", settings.vector_store_path)
+        table.add_row("Agent Daemon", "running" if isinstance(agent, RemoteAgent) else "not used")
 
         # Add vector store info
         for key, value in info.items():
             table.add_row(key, str(value))
 
+        # Add tool cache counters; a freshly built local agent has none yet
+        if isinstance(agent, RemoteAgent):
+            stats = agent.get_tool_cache_stats()
+            lookups = stats["hits"] + stats["misses"]
+            hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "n/a"
+            table.add_row(
+                "Tool Cache",
+                f"{stats['hits']} hits / {stats['misses']} misses ({hit_rate}), "
+                f"{stats['entries']}/{stats['max_entries']} entries"
+                + (", persisted" if stats["persisted"] else "")
+            )
+            for tool_name, counts in stats["tools"].items():
+                table.add_row(f"  {tool_name}", f"{counts['hits']} hits / {counts['misses']} misses")
+        else:
+            table.add_row("Tool Cache", "counters are kept by the agent daemon (run `ira serve`)")
+
         console.print(table)
 
     except Exception as e:
         console.print(f"[bold red]Error getting info: {e}[/bold red]")
-        logger.error(f"Info error: {e}")
+        logger.error("Info error: %s", e)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('queries', nargs=-1)
+@click.option('--file', '-f', 'queries_file', type=click.File('r', encoding='utf-8'),
+              help='Read queries from a file, one per line (- for stdin)')
+@click.option('--limit', '-k', default=4, help='Number of results to return per query')
+@click.option('--json', 'as_json', is_flag=True, help='Print one JSON line per query with scored results')
+@click.pass_context
+def search(ctx: click.Context, queries: tuple, queries_file, limit: int, as_json: bool):
+    """Search for relevant documents in the vector store.
+
+    All QUERIES (and those in --file) are embedded in one batched call and looked up
+    with a single vector store query.
+    """
+    queries = list(queries)
+    if queries_file:
+        queries.extend(line.strip() for line in queries_file if line.strip())
+    if not queries:
+        raise click.UsageError("Give at least one query or --file.")
+
+    try:
+        agent = get_agent(ctx)
+
+        all_results = agent.search_documents_batch(queries, k=limit)
+
+        for query, results in zip(queries, all_results):
+            if as_json:
+                click.echo(json.dumps({"query": query, "results": results}))
+                continue
+
+            if len(queries) > 1:
+                console.print(f"\n[bold]Query:[/bold] {query}")
+            if results:
+                console.print(f"[bold blue]Found {len(results)} relevant documents:[/bold blue]")
+                for i, result in enumerate(results, 1):
+                    content = result["content"]
+                    source = f" {result['source']}" if result["source"] else ""
+                    console.print(Panel(
+                        content[:500] + "..." if len(content) > 500 else content,
+                        title=f"[bold cyan]Document {i}[/bold cyan]{source} (score {result['score']:.3f})"
+                    ))
+            else:
+                console.print("[yellow]No relevant documents found.[/yellow]")
+
+    except Exception as e:
+        console.print(f"[bold red]Error searching documents: {e}[/bold red]")
+        logger.error("Search error: %s", e)
         sys.exit(1)
 
 
 @cli.command()
-@click.argument('query_text')
-@click.option('--limit', '-k', default=4, help='Number of results to return')
-def search(query_text: str, limit: int):
-    """Search for relevant documents in the vector store."""
+@click.argument('questions_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--out', '-o', required=True, type=click.Path(dir_okay=False), help='Answers JSONL (appended; also the checkpoint)')
+@click.option('--concurrency', '-c', default=4, show_default=True, help='Questions answered at the same time')
+@click.option('--retry-errors', is_flag=True, help='Run questions again whose previous attempt failed')
+def batch(questions_file: str, out: str, concurrency: int, retry_errors: bool):
+    """Answer a JSONL file of questions concurrently, resuming from --out."""
+    import asyncio
+
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+
+    from ira_cli.batch import load_checkpoint, load_questions, run_batch, summarize
+
     try:
+        questions = load_questions(questions_file)
+        done = load_checkpoint(out, retry_errors=retry_errors)
+        pending = [item for item in questions if item["id"] not in done]
+
+        console.print(
+            f"[bold blue]{len(questions)} questions, {len(questions) - len(pending)} already answered, "
+            f"{len(pending)} to run with concurrency {concurrency}[/bold blue]"
+        )
+        if not pending:
+            return
+
+        # The daemon answers one question at a time, so batches always run in-process
+        from agents.research_agent import ResearchAgent
+
+        console.print("[bold blue]Initializing Research Agent...[/bold blue]")
         agent = ResearchAgent()
         agent.initialize_agent()
 
-        results = agent.search_documents(query_text, k=limit)
+        with Progress(
+            TextColumn("[progress.description]{task.description}"), BarColumn(),
+            MofNCompleteColumn(), TimeElapsedColumn(), console=console
+        ) as progress:
+            task = progress.add_task("Answering", total=len(pending))
+            records = asyncio.run(run_batch(
+                agent.query, pending, out, concurrency=concurrency,
+                on_result=lambda record: progress.advance(task)
+            ))
+
+        table = Table(title="Batch Summary")
+        table.add_column("Property", style="cyan")
+        table.add_column("Value", style="green")
+        for key, value in summarize(records).items():
+            table.add_row(key, str(value))
+        console.print(table)
+        console.print(f"[bold green]✓ Answers written to {out}[/bold green]")
 
-        if results:
-            console.print(f"[bold blue]Found {len(results)} relevant documents:[/bold blue]")
-            for i, result in enumerate(results, 1):
-                console.print(Panel(
-                    result[:500] + "..." if len(result) > 500 else result,
-                    title=f"[bold cyan]Document {i}[/bold cyan]"
-                ))
-        else:
-            console.print("[yellow]No relevant documents found.[/yellow]")
+    except KeyboardInterrupt:
+        console.print(f"\n[yellow]Interrupted - re-run the same command to resume from {out}.[/yellow]")
+        sys.exit(130)
+    except Exception as e:
+        console.print(f"[bold red]Error running batch: {e}[/bold red]")
+        logger.error("Batch error: %s", e)
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--trace-file', type=click.Path(dir_okay=False), help='Trace JSONL (defaults to TRACE_PATH)')
+@click.option('--last', '-n', type=int, help='Only aggregate the most recent N queries')
+@click.option('--json', 'as_json', is_flag=True, help='Print the aggregate as JSON')
+def stats(trace_file: Optional[str], last: Optional[int], as_json: bool):
+    """Show latency percentiles and token spend from recorded query traces."""
+    from utils.tracing import aggregate_traces, load_traces
+
+    try:
+        from ira_cli.config import settings
+
+        trace_file = trace_file or settings.trace_path
+        if not Path(trace_file).exists():
+            console.print(f"[yellow]No traces recorded yet at {trace_file}.[/yellow]")
+            return
+
+        traces = load_traces(trace_file)
+        if last:
+            traces = traces[-last:]
+        summary = aggregate_traces(traces)
+
+        if as_json:
+            click.echo(json.dumps(summary, indent=2))
+            return
+
+        def ms(value):
+            return "-" if value is None else f"{value:,.1f}"
+
+        latency_table = Table(title=f"Latency ({summary['queries']} queries)")
+        latency_table.add_column("Span", style="cyan")
+        latency_table.add_column("Count", justify="right")
+        latency_table.add_column("p50 ms", justify="right", style="green")
+        latency_table.add_column("p95 ms", justify="right", style="yellow")
+        for name, values in summary["latency_ms"].items():
+            latency_table.add_row(name, str(values["count"]), ms(values["p50"]), ms(values["p95"]))
+        console.print(latency_table)
+
+        usage_table = Table(title="Usage")
+        usage_table.add_column("Property", style="cyan")
+        usage_table.add_column("Value", style="green")
+        usage_table.add_row("Routes", ", ".join(f"{route}: {count}" for route, count in summary["routes"].items()))
+        usage_table.add_row("Errors", str(summary["errors"]))
+        usage_table.add_row("LLM Calls", str(summary["llm_calls"]))
+        usage_table.add_row("Input Tokens", f"{summary['input_tokens']:,}")
+        usage_table.add_row("Output Tokens", f"{summary['output_tokens']:,}")
+        usage_table.add_row(
+            "Tokens per Query",
+            f"{summary['tokens_per_query']:,}" + (" (partly estimated)" if summary["estimated_tokens"] else "")
+        )
+        console.print(usage_table)
 
     except Exception as e:
-        console.print(f"[bold red]Error searching documents: {e}[/bold red]")
-        logger.error(f"Search error: {e}")
+        console.print(f"[bold red]Error reading traces: {e}[/bold red]")
+        logger.error("Stats error: %s", e)
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--sizes', default='100,1000', show_default=True, help='Comma-separated corpus sizes (documents)')
+@click.option('--queries', '-n', default=20, show_default=True, help='Searches per corpus size and questions per agent mode')
+@click.option('--llm-latency', default=0.0, show_default=True, help='Seconds per fake LLM call')
+@click.option('--embedding-latency', default=0.0, show_default=True, help='Seconds per fake embedding request')
+@click.option('--tool-latency', default=0.0, show_default=True, help='Seconds per fake tool call')
+@click.option('--cold-start-runs', default=3, show_default=True, help='Fresh interpreters to time (0 to skip)')
+@click.option('--mode', 'modes', multiple=True, type=click.Choice(['react', 'parallel']), help='Agent modes to benchmark (default: both)')
+@click.option('--out', '-o', type=click.Path(dir_okay=False), help='Write the JSON report to this file')
+@click.option('--json', 'as_json', is_flag=True, help='Print the JSON report instead of tables')
+def bench(sizes: str, queries: int, llm_latency: float, embedding_latency: float, tool_latency: float,
+          cold_start_runs: int, modes: tuple, out: Optional[str], as_json: bool):
+    """Benchmark the agent offline against fake LLM, embeddings and tools."""
+    from ira_cli.bench import run_benchmarks
+
+    try:
+        corpus_sizes = [int(size) for size in sizes.split(",") if size.strip()]
+        report = run_benchmarks(
+            sizes=corpus_sizes, queries=queries, llm_latency=llm_latency,
+            embedding_latency=embedding_latency, tool_latency=tool_latency,
+            cold_start_runs=cold_start_runs, modes=modes or ("react", "parallel"),
+            on_step=None if as_json else lambda name: console.print(f"[bold blue]Benchmarking {name}...[/bold blue]")
+        )
+
+        if out:
+            Path(out).parent.mkdir(parents=True, exist_ok=True)
+            Path(out).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        if as_json:
+            click.echo(json.dumps(report, indent=2))
+            return
+
+        def ms(value):
+            return "-" if value is None else f"{value:,.2f}"
+
+        if "cold_start" in report:
+            console.print(f"Cold start (import ira_cli.cli): p50 {ms(report['cold_start']['p50_ms'])} ms")
+
+        store_table = Table(title="Vector Store")
+        for column in ("Documents", "Chunks", "Chunks/s", "Search p50 ms", "Search p95 ms"):
+            store_table.add_column(column, justify="right")
+        for result in report["vector_store"]:
+            store_table.add_row(
+                str(result["documents"]), str(result["chunks"]), f"{result['chunks_per_second'] or 0:,.0f}",
+                ms(result["search"]["p50_ms"]), ms(result["search"]["p95_ms"])
+            )
+        console.print(store_table)
+
+        query_table = Table(title="ResearchAgent.query")
+        for column in ("Mode", "LLM calls", "Total p50 ms", "Total p95 ms", "Overhead p50 ms", "Overhead p95 ms"):
+            query_table.add_column(column, justify="right")
+        for result in report["query"]:
+            query_table.add_row(
+                result["mode"], str(result["llm_calls_per_query"]),
+                ms(result["total"]["p50_ms"]), ms(result["total"]["p95_ms"]),
+                ms(result["overhead"]["p50_ms"]), ms(result["overhead"]["p95_ms"])
+            )
+        console.print(query_table)
+        if out:
+            console.print(f"[bold green]✓ Report written to {out}[/bold green]")
+
+    except Exception as e:
+        console.print(f"[bold red]Error running benchmarks: {e}[/bold red]")
+        logger.error("Bench error: %s", e)
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--stop', is_flag=True, help='Stop the running daemon')
+def serve(stop: bool):
+    """Run a resident agent daemon that other commands forward to."""
+    from ira_cli.daemon import AgentDaemon, DaemonClient
+
+    client = DaemonClient()
+
+    if stop:
+        if not client.is_running():
+            console.print("[yellow]No agent daemon is running.[/yellow]")
+            return
+        client.request("shutdown")
+        console.print("[bold green]✓ Agent daemon stopped[/bold green]")
+        return
+
+    try:
+        from agents.research_agent import ResearchAgent
+
+        console.print("[bold blue]Initializing Research Agent...[/bold blue]")
+        agent = ResearchAgent()
+        agent.initialize_agent()
+
+        console.print(f"[bold green]✓ Agent daemon listening on {client.socket_path}[/bold green] "
+                      "[dim](Ctrl+C to stop)[/dim]")
+        AgentDaemon(agent).serve_forever()
+
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Agent daemon stopped.[/yellow]")
+    except Exception as e:
+        console.print(f"[bold red]Error running agent daemon: {e}[/bold red]")
+        logger.error("Daemon error: %s", e)
         sys.exit(1)
 
 
-def run_interactive_mode(agent: ResearchAgent):
+def run_interactive_mode(agent: "ResearchAgent", stream: bool = True):
     """Run the agent in interactive mode."""
     console.print(Panel(
         "[bold blue]Interactive Research Agent[/bold blue]\n"
@@ -200,6 +604,10 @@ def run_interactive_mode(agent: ResearchAgent):
             if not question.strip():
                 continue
 
+            if stream:
+                stream_response(agent, question)
+                continue
+
             console.print("[dim]Processing...[/dim]")
             response = agent.query(question)
             answer = clean_response(response)
@@ -210,7 +618,7 @@ def run_interactive_mode(agent: ResearchAgent):
             break
         except Exception as e:
             console.print(f"[bold red]Error: {e}[/bold red]")
-            logger.error(f"Interactive mode error: {e}")
+            logger.error("Interactive mode error: %s", e)
 
 
 @cli.command()
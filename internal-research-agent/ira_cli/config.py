@@ -1,10 +1,27 @@
 """
 Configuration management for the Internal Research Agent.
 """
+import os
+from functools import lru_cache
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
 
+def default_socket_path() -> str:
+    """
+    Get the per-user daemon socket path, so commands find the daemon from any directory.
+
+    Returns:
+        $XDG_RUNTIME_DIR/ira.sock, or ~/.cache/ira/ira.sock without a runtime directory
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "ira.sock")
+    return os.path.join(os.path.expanduser("~"), ".cache", "ira", "ira.sock")
+
+
 class Settings(BaseSettings):
     """Application settings with environment variable support."""
 
@@ -16,22 +33,81 @@ class Settings(BaseSettings):
     model_name: str = Field(default="gemini-2.0-flash", env="MODEL_NAME")
     temperature: float = Field(default=0.0, env="TEMPERATURE")
     max_retries: int = Field(default=2, env="MAX_RETRIES")
+    llm_requests_per_second: Optional[float] = Field(default=None, env="LLM_REQUESTS_PER_SECOND")
+
+    # Agent Configuration
+    agent_mode: str = Field(default="react", env="AGENT_MODE")  # "react" or "parallel"
+    agent_max_parallel_calls: int = Field(default=4, env="AGENT_MAX_PARALLEL_CALLS")
+
+    # Query Router
+    router_enabled: bool = Field(default=True, env="ROUTER_ENABLED")
+    router_corpus_threshold: float = Field(default=0.7, env="ROUTER_CORPUS_THRESHOLD")
+    router_margin: float = Field(default=0.05, env="ROUTER_MARGIN")
+    router_exemplars_path: Optional[str] = Field(default=None, env="ROUTER_EXEMPLARS_PATH")
+    router_log_path: Optional[str] = Field(default=None, env="ROUTER_LOG_PATH")
 
     # Document Processing
     chunk_size: int = Field(default=500, env="CHUNK_SIZE")
     chunk_overlap: int = Field(default=100, env="CHUNK_OVERLAP")
     docs_path: str = Field(default="hr_docs", env="DOCS_PATH")
+    loader_workers: int = Field(default=0, env="LOADER_WORKERS")
 
     # Vector Store
     vector_store_path: str = Field(default="./chroma_db", env="VECTOR_STORE_PATH")
 
+    # Embeddings
+    embedding_model: str = Field(default="models/embedding-001", env="EMBEDDING_MODEL")
+    embedding_batch_size: int = Field(default=100, env="EMBEDDING_BATCH_SIZE")
+    embedding_concurrency: int = Field(default=4, env="EMBEDDING_CONCURRENCY")
+    embedding_cache_path: str = Field(default="./.cache/embeddings.sqlite", env="EMBEDDING_CACHE_PATH")
+    embedding_endpoint: Optional[str] = Field(default=None, env="EMBEDDING_ENDPOINT")
+
     # Search Configuration
     max_search_results: int = Field(default=5, env="MAX_SEARCH_RESULTS")
+    web_search_requests_per_second: Optional[float] = Field(default=None, env="WEB_SEARCH_REQUESTS_PER_SECOND")
+
+    # Tool Result Cache
+    tool_cache_max_entries: int = Field(default=256, env="TOOL_CACHE_MAX_ENTRIES")
+    tool_cache_ttl: float = Field(default=300.0, env="TOOL_CACHE_TTL")
+    tool_cache_ttls: Dict[str, float] = Field(
+        default={"InternalDocumentsRAG": 3600.0, "WebSearch": 600.0, "google_docs_mcp": 300.0},
+        env="TOOL_CACHE_TTLS"
+    )
+    tool_cache_path: Optional[str] = Field(default=None, env="TOOL_CACHE_PATH")
+
+    # Query Tracing
+    tracing_enabled: bool = Field(default=False, env="TRACING_ENABLED")
+    trace_questions: bool = Field(default=False, env="TRACE_QUESTIONS")
+    trace_path: str = Field(default="./.cache/traces.jsonl", env="TRACE_PATH")
+    metrics_path: str = Field(default="./.cache/metrics.prom", env="METRICS_PATH")
+
+    # Logging
+    log_format: str = Field(default="text", env="LOG_FORMAT")  # "text" or "json"
+    log_sample_every: int = Field(default=100, env="LOG_SAMPLE_EVERY")
+    log_sample_burst: int = Field(default=10, env="LOG_SAMPLE_BURST")
+
+    # Agent Daemon
+    daemon_socket_path: str = Field(default_factory=default_socket_path, env="IRA_SOCKET_PATH")
 
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Get the global settings instance, reading the environment and .env on first use.
+
+    Returns:
+        Application settings
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # `settings` is created on first access, so importing this module is cheap and does
+    # not fail when API keys are missing (e.g. for `ira setup`)
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
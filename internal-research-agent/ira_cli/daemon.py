@@ -0,0 +1,231 @@
+"""
+Resident agent daemon for the Internal Research Agent CLI.
+
+`ira serve` keeps one initialised ResearchAgent alive behind a local Unix socket so that
+other `ira` commands can forward requests to it instead of rebuilding the agent each time.
+The protocol is one JSON request line and one JSON response line per connection.
+"""
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.logger import logger
+from ira_cli.config import get_settings
+
+
+class DaemonError(Exception):
+    """Raised when the daemon reports an error for a forwarded request."""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle a single JSON request from a CLI client."""
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        try:
+            request = json.loads(line)
+            result = self.server.daemon.dispatch(request["command"], request.get("args", {}))
+            response = {"ok": True, "result": result}
+        except Exception as e:
+            logger.error("Daemon request failed: %s", e)
+            response = {"ok": False, "error": str(e)}
+
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server that carries a reference to its daemon."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: "AgentDaemon"):
+        self.daemon = daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class AgentDaemon:
+    """Serve an initialised ResearchAgent over a local Unix socket."""
+
+    def __init__(self, agent, socket_path: Optional[str] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            agent: Initialised ResearchAgent to keep resident
+            socket_path: Path of the Unix socket to listen on
+        """
+        self.agent = agent
+        self.socket_path = Path(socket_path or get_settings().daemon_socket_path)
+        # The agent and its chains are not safe for concurrent use
+        self._agent_lock = threading.Lock()
+        self._server = None
+
+    def dispatch(self, command: str, args: Dict[str, Any]) -> Any:
+        """
+        Run a forwarded command against the resident agent.
+
+        Args:
+            command: Command name
+            args: Command arguments
+
+        Returns:
+            JSON-serialisable command result
+        """
+        if command == "ping":
+            return "pong"
+
+        if command == "shutdown":
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return "shutting down"
+
+        with self._agent_lock:
+            if command == "query":
+                response = self.agent.query(args["question"])
+                if isinstance(response, dict):
+                    return {"output": response.get("output", "")}
+                return str(response)
+            if command == "search":
+                return self.agent.search_documents(args["query"], k=args.get("k", 4))
+            if command == "search_batch":
+                return self.agent.search_documents_batch(args["queries"], k=args.get("k", 4))
+            if command == "info":
+                return self.agent.get_vector_store_info()
+            if command == "cache_stats":
+                return self.agent.get_tool_cache_stats()
+            if command == "add_docs":
+                self.agent.add_documents(args["file_paths"])
+                return len(args["file_paths"])
+            if command == "sync":
+                return self.agent.sync_documents()
+
+        raise ValueError(f"Unknown command: {command}")
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until a shutdown request or interrupt."""
+        self.socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if DaemonClient(str(self.socket_path)).is_running():
+                raise RuntimeError(f"Daemon already running on {self.socket_path}")
+            # Stale socket left behind by a crashed daemon
+            self.socket_path.unlink()
+
+        # Bind under a restrictive umask so the socket is never reachable by other users
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(str(self.socket_path), self)
+        finally:
+            os.umask(old_umask)
+        logger.info("Agent daemon listening on %s", self.socket_path)
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            logger.info("Agent daemon stopped")
+
+
+class DaemonClient:
+    """Client for forwarding commands to a running agent daemon."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Initialize the daemon client.
+
+        Args:
+            socket_path: Path of the daemon's Unix socket
+            timeout: Socket timeout in seconds (None waits indefinitely)
+        """
+        self.socket_path = str(socket_path or get_settings().daemon_socket_path)
+        self.timeout = timeout
+
+    def request(self, command: str, **args) -> Any:
+        """
+        Send a command to the daemon and return its result.
+
+        Args:
+            command: Command name
+            **args: Command arguments
+
+        Returns:
+            Command result
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall((json.dumps({"command": command, "args": args}) + "\n").encode("utf-8"))
+
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+
+        if not line:
+            raise DaemonError("Daemon closed the connection without a response")
+
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "Unknown daemon error"))
+        return response["result"]
+
+    def is_running(self) -> bool:
+        """
+        Check whether a daemon is listening on the socket.
+
+        Returns:
+            True if the daemon answered a ping
+        """
+        if not os.path.exists(self.socket_path):
+            return False
+
+        try:
+            return DaemonClient(self.socket_path, timeout=1.0).request("ping") == "pong"
+        except (OSError, ValueError, DaemonError):
+            return False
+
+
+class RemoteAgent:
+    """ResearchAgent stand-in that forwards calls to a running daemon."""
+
+    def __init__(self, client: DaemonClient):
+        """
+        Initialize the remote agent.
+
+        Args:
+            client: Client connected to the daemon
+        """
+        self.client = client
+
+    def query(self, question: str) -> Any:
+        """Forward a question to the resident agent."""
+        return self.client.request("query", question=question)
+
+    def search_documents(self, query: str, k: int = 4) -> List[str]:
+        """Forward a vector store search to the resident agent."""
+        return self.client.request("search", query=query, k=k)
+
+    def search_documents_batch(self, queries: List[str], k: int = 4) -> List[List[dict]]:
+        """Forward a multi-query vector store search to the resident agent."""
+        return self.client.request("search_batch", queries=queries, k=k)
+
+    def get_vector_store_info(self) -> dict:
+        """Fetch vector store information from the resident agent."""
+        return self.client.request("info")
+
+    def get_tool_cache_stats(self) -> dict:
+        """Fetch the resident agent's tool cache counters."""
+        return self.client.request("cache_stats")
+
+    def add_documents(self, file_paths: List[str]) -> None:
+        """Forward new documents to the resident agent, resolving paths locally first."""
+        self.client.request("add_docs", file_paths=[str(Path(p).resolve()) for p in file_paths])
+
+    def sync_documents(self) -> dict:
+        """Ask the resident agent to sync its vector store with the documents directory."""
+        return self.client.request("sync")
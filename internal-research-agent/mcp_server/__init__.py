@@ -2,7 +2,7 @@
 MCP Server package for Insurance Google Docs integration.
 """
 
-from .insurance_docs_server import InsuranceDocsMCPServer, MCPServerProtocol
+from .google_docs_server import GoogleDocsMCPServer, create_mcp_server
 
 __version__ = "1.0.0"
-__all__ = ["InsuranceDocsMCPServer", "MCPServerProtocol"]
\ No newline at end of file
+__all__ = ["GoogleDocsMCPServer", "create_mcp_server"]
\ No newline at end of file
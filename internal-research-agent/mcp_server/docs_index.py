@@ -0,0 +1,217 @@
+"""
+Local passage index over Google Docs for query-aware retrieval.
+
+Documents are split into overlapping chunks and scored with BM25, so the MCP server can
+return only the passages relevant to a query instead of whole documents. Each document is
+re-chunked only when its modifiedTime changes.
+"""
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words too common to help rank passages
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have how i in is it its of on or that the "
+    "this to was what when where which who will with do does can my our we you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens with stop words removed."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def chunk_text(text: str, chunk_size: int = 800, chunk_overlap: int = 150) -> List[str]:
+    """
+    Split text into chunks of about chunk_size characters on paragraph boundaries.
+
+    Paragraphs longer than chunk_size are split on whitespace. Consecutive chunks share
+    up to chunk_overlap characters of trailing context.
+
+    Args:
+        text: Document text
+        chunk_size: Target chunk length in characters
+        chunk_overlap: Characters carried over from the end of the previous chunk
+
+    Returns:
+        List of chunks
+    """
+    pieces: List[str] = []
+    for paragraph in re.split(r"\n\s*\n|\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        while len(paragraph) > chunk_size:
+            cut = paragraph.rfind(" ", 0, chunk_size)
+            if cut <= 0:
+                cut = chunk_size
+            pieces.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if paragraph:
+            pieces.append(paragraph)
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 1 > chunk_size:
+            chunks.append(current)
+            tail = current[-chunk_overlap:] if chunk_overlap > 0 else ""
+            # Start the overlap on a word boundary
+            space = tail.find(" ")
+            tail = tail[space + 1:] if space >= 0 else tail
+            current = f"{tail}\n{piece}" if tail else piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+class DocumentIndex:
+    """In-memory BM25 index of document chunks, kept in step with document modifiedTime."""
+
+    def __init__(self, chunk_size: int = 800, chunk_overlap: int = 150, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize the index.
+
+        Args:
+            chunk_size: Target chunk length in characters
+            chunk_overlap: Characters shared by consecutive chunks
+            k1: BM25 term frequency saturation
+            b: BM25 length normalisation
+        """
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.k1 = k1
+        self.b = b
+
+        # Per document: its metadata and the (text, term counts, length) of each chunk
+        self._documents: Dict[str, Dict] = {}
+        self._doc_freq: Counter = Counter()
+        self._total_length = 0
+        self._chunk_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._chunk_count
+
+    def stale_documents(self, documents: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Documents from a folder listing that are missing from the index or changed since indexing."""
+        with self._lock:
+            return [
+                doc for doc in documents
+                if doc["id"] not in self._documents
+                or self._documents[doc["id"]]["modified"] != doc.get("modified", "")
+            ]
+
+    def update(self, doc: Dict[str, str], content: str) -> int:
+        """
+        Index (or re-index) a document's content.
+
+        Args:
+            doc: Document metadata from the folder listing
+            content: Document text
+
+        Returns:
+            Number of chunks indexed
+        """
+        chunks = []
+        for text in chunk_text(content, self.chunk_size, self.chunk_overlap):
+            terms = Counter(tokenize(text))
+            chunks.append((text, terms, sum(terms.values())))
+
+        with self._lock:
+            self._remove(doc["id"])
+            self._documents[doc["id"]] = {
+                "name": doc.get("name", doc["id"]),
+                "modified": doc.get("modified", ""),
+                "chunks": chunks
+            }
+            for _, terms, length in chunks:
+                self._doc_freq.update(terms.keys())
+                self._total_length += length
+            self._chunk_count += len(chunks)
+
+        return len(chunks)
+
+    def retain(self, doc_ids) -> None:
+        """Drop documents that are no longer in the folder."""
+        keep = set(doc_ids)
+        with self._lock:
+            for doc_id in [doc_id for doc_id in self._documents if doc_id not in keep]:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        """Remove a document's chunks from the statistics. Caller holds the lock."""
+        entry = self._documents.pop(doc_id, None)
+        if entry is None:
+            return
+        for _, terms, length in entry["chunks"]:
+            for term in terms:
+                self._doc_freq[term] -= 1
+                if self._doc_freq[term] <= 0:
+                    del self._doc_freq[term]
+            self._total_length -= length
+        self._chunk_count -= len(entry["chunks"])
+
+    def search(self, query: str, k: int = 5, min_score: Optional[float] = None) -> List[Dict]:
+        """
+        Rank chunks against a query with BM25.
+
+        Args:
+            query: Search query
+            k: Number of passages to return
+            min_score: Optional lower bound on the score of returned passages
+
+        Returns:
+            Up to k passages, best first, as dicts with document_id, document, modified,
+            chunk, score and text
+        """
+        query_terms = set(tokenize(query))
+        if not query_terms or k <= 0:
+            return []
+
+        with self._lock:
+            if not self._chunk_count:
+                return []
+
+            n = self._chunk_count
+            avg_length = self._total_length / n or 1.0
+            idf = {
+                term: math.log(1 + (n - self._doc_freq[term] + 0.5) / (self._doc_freq[term] + 0.5))
+                for term in query_terms if self._doc_freq[term]
+            }
+            if not idf:
+                return []
+
+            scored = []
+            for doc_id, entry in self._documents.items():
+                for position, (text, terms, length) in enumerate(entry["chunks"]):
+                    score = 0.0
+                    for term, weight in idf.items():
+                        tf = terms.get(term)
+                        if tf:
+                            score += weight * tf * (self.k1 + 1) / (
+                                tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                            )
+                    if score > 0 and (min_score is None or score >= min_score):
+                        scored.append((score, doc_id, position, text))
+
+            top = heapq.nlargest(k, scored, key=lambda item: item[0])
+            return [
+                {
+                    "document_id": doc_id,
+                    "document": self._documents[doc_id]["name"],
+                    "modified": self._documents[doc_id]["modified"],
+                    "chunk": position,
+                    "score": round(score, 4),
+                    "text": text
+                }
+                for score, doc_id, position, text in top
+            ]
@@ -3,9 +3,14 @@
 Google Docs MCP Server using FastMCP
 Following the approach from: https://cobusgreyling.medium.com/using-langchain-with-model-context-protocol-mcp-e89b87ee3c4c
 """
+import json
 import os
+import threading
+import time
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 from google.oauth2.service_account import Credentials
@@ -17,39 +22,132 @@ project_root = Path(__file__).parent.parent
 import sys
 sys.path.insert(0, str(project_root))
 
-from utils.logger import logger
+from mcp_server.docs_index import DocumentIndex
+from utils.logger import SAMPLED, logger
+
+
+def _content_fields(depth: int) -> str:
+    """Field mask for the text-bearing parts of a list of structural elements, nesting tables depth times."""
+    paragraph = "paragraph(elements(textRun(content)))"
+    if depth == 0:
+        # Tables below the mask still report their row count, so extract_text can tell they were cut off
+        return f"{paragraph},table(rows)"
+    inner = _content_fields(depth - 1)
+    return f"{paragraph},table(tableRows(tableCells(content({inner})))),tableOfContents(content({inner}))"
+
+
+def document_fields(table_depth: int) -> str:
+    """
+    Field mask for fetching the text of a document.
+
+    Only the text runs are needed, so styles, inline objects, lists and revisions are skipped.
+    Tables nested more than table_depth levels deep are left out of the mask; documents that
+    contain them are fetched again in full.
+    """
+    return f"body(content({_content_fields(table_depth)}))"
+
+
+# Default nesting depth of tables covered by the field mask (GOOGLE_DOCS_TABLE_DEPTH)
+DEFAULT_TABLE_DEPTH = 2
+
+DOCUMENT_FIELDS = document_fields(DEFAULT_TABLE_DEPTH)
+
+# Bumped when extract_text changes, so cached text from an older extractor is refetched
+TEXT_FORMAT_VERSION = 3
 
 
 class GoogleDocsMCPServer:
     """Google Docs MCP Server using FastMCP."""
 
-    def __init__(self, credentials_path: str = None, folder_id: str = None):
+    def __init__(
+        self,
+        credentials_path: str = None,
+        folder_id: str = None,
+        cache_path: Optional[str] = None,
+        list_ttl: Optional[float] = None
+    ):
         """
         Initialize the Google Docs MCP server.
 
         Args:
             credentials_path: Path to Google service account credentials JSON file
             folder_id: Google Drive folder ID containing documents
+            cache_path: Optional JSON file to persist the document content cache
+            list_ttl: Seconds a folder listing is reused before Drive is asked again
         """
         self.credentials_path = credentials_path or os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
         self.folder_id = folder_id or os.getenv("GOOGLE_FOLDER_ID")
+        self.cache_path = cache_path or os.getenv("GOOGLE_DOCS_CACHE_PATH")
+        self.list_ttl = list_ttl if list_ttl is not None else float(os.getenv("GOOGLE_DOCS_LIST_TTL", "60"))
+        self.batch_size = int(os.getenv("GOOGLE_DOCS_BATCH_SIZE", "50"))
+        self.fetch_workers = int(os.getenv("GOOGLE_DOCS_FETCH_WORKERS", "4"))
+        self.table_depth = int(os.getenv("GOOGLE_DOCS_TABLE_DEPTH", str(DEFAULT_TABLE_DEPTH)))
+        self.document_fields = document_fields(self.table_depth)
         self.drive_service = None
         self.docs_service = None
+        self._credentials = None
+        self._thread_local = threading.local()
+
+        # Document content keyed by ID, valid while the document's modifiedTime is unchanged
+        self._content_cache: Dict[str, Dict[str, str]] = {}
+        self._name_index: Dict[str, str] = {}
+        self._listing: Optional[List[Dict[str, str]]] = None
+        self._listing_time = 0.0
+        self._cache_lock = threading.Lock()
+        self._load_cache()
+
+        # Passage index for query-aware retrieval, refreshed per document by modifiedTime
+        self.index = DocumentIndex(
+            chunk_size=int(os.getenv("GOOGLE_DOCS_CHUNK_SIZE", "800")),
+            chunk_overlap=int(os.getenv("GOOGLE_DOCS_CHUNK_OVERLAP", "150"))
+        )
 
         self._initialize_services()
         logger.info("Google Docs MCP Server initialized")
 
+    def _load_cache(self):
+        """Load the persisted document content cache, if configured."""
+        if not self.cache_path or not Path(self.cache_path).exists():
+            return
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                self._content_cache = {
+                    doc_id: entry for doc_id, entry in json.load(f).items()
+                    if entry.get("version") == TEXT_FORMAT_VERSION
+                }
+            logger.info("Loaded %s cached documents from %s", len(self._content_cache), self.cache_path)
+        except Exception as e:
+            logger.warning("Failed to load document cache from %s: %s", self.cache_path, e)
+            self._content_cache = {}
+
+    def save_cache(self):
+        """Persist the document content cache, if configured."""
+        if not self.cache_path:
+            return
+
+        try:
+            cache_file = Path(self.cache_path)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            with self._cache_lock:
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(self._content_cache, f)
+            tmp_file.replace(cache_file)
+        except Exception as e:
+            logger.warning("Failed to save document cache to %s: %s", self.cache_path, e)
+
     def _initialize_services(self):
         """Initialize Google Drive and Docs API services."""
         try:
-            logger.info(f"Initializing Google services with credentials: {self.credentials_path}")
+            logger.info("Initializing Google services with credentials: %s", self.credentials_path)
 
             if not self.credentials_path:
                 logger.error("Credentials path not set")
                 return
 
             if not Path(self.credentials_path).exists():
-                logger.error(f"Credentials file not found at: {self.credentials_path}")
+                logger.error("Credentials file not found at: %s", self.credentials_path)
                 return
 
             logger.info("Loading service account credentials...")
@@ -62,6 +160,7 @@ class GoogleDocsMCPServer:
                 ]
             )
             logger.info("Credentials loaded successfully")
+            self._credentials = credentials
 
             # Build the Google Drive and Docs services
             logger.info("Building Google Drive service...")
@@ -71,41 +170,136 @@ class GoogleDocsMCPServer:
             logger.info("Google Drive and Docs API services initialized successfully")
 
         except Exception as e:
-            logger.error(f"Failed to initialize Google services: {e}")
+            logger.error("Failed to initialize Google services: %s", e)
             import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            logger.error("Full traceback: %s", traceback.format_exc())
             self.drive_service = None
             self.docs_service = None
 
-    def get_documents_in_folder(self) -> List[Dict[str, str]]:
-        """Get all Google Docs in the specified folder."""
-        logger.info(f"Checking folder ID: {self.folder_id}")
-        logger.info(f"Drive service available: {self.drive_service is not None}")
+    def list_documents_cached(self, force_refresh: bool = False) -> List[Dict[str, str]]:
+        """
+        Get the folder listing, reusing a recent one for up to list_ttl seconds.
+
+        The listing is the cheap change check: it carries each document's modifiedTime,
+        which decides whether cached content can be reused. Also rebuilds the name index.
+        If the folder cannot be listed, the previous listing and cached content are kept.
+
+        Args:
+            force_refresh: Ignore the TTL and list the folder again
+        """
+        if (
+            force_refresh
+            or self._listing is None
+            or time.monotonic() - self._listing_time > self.list_ttl
+        ):
+            documents = self.get_documents_in_folder()
+            if documents is None:
+                # Keep serving the previous listing and cache; retry on the next call
+                logger.warning("Folder listing failed, keeping the previous listing")
+                return self._listing or []
+
+            self._listing = documents
+            self._listing_time = time.monotonic()
+            self._name_index = {doc["name"].lower(): doc["id"] for doc in documents}
+
+            # Forget documents that were removed from the folder
+            current_ids = {doc["id"] for doc in documents}
+            with self._cache_lock:
+                for doc_id in list(self._content_cache):
+                    if doc_id not in current_ids:
+                        del self._content_cache[doc_id]
+
+        return self._listing
+
+    def find_document_by_name(self, name: str) -> Optional[Dict[str, str]]:
+        """
+        Look up a document in the folder listing by name (case-insensitive).
+
+        Args:
+            name: Document name
+
+        Returns:
+            Document metadata, or None if there is no such document
+        """
+        documents = self.list_documents_cached()
+        doc_id = self._name_index.get(name.lower())
+        if doc_id is None:
+            # The document may have been added since the last listing
+            documents = self.list_documents_cached(force_refresh=True)
+            doc_id = self._name_index.get(name.lower())
+
+        return next((doc for doc in documents if doc["id"] == doc_id), None)
+
+    def get_cached_document_content(self, doc: Dict[str, str]) -> str:
+        """
+        Get a document's content, downloading it only if it changed since it was cached.
+
+        Args:
+            doc: Document metadata from the folder listing
+
+        Returns:
+            Document text, or an error message
+        """
+        with self._cache_lock:
+            cached = self._content_cache.get(doc["id"])
+        if cached and cached.get("modified") == doc.get("modified"):
+            logger.info("Cache hit for document %s", doc.get('name', doc['id']), extra=SAMPLED)
+            return cached["content"]
+
+        try:
+            content = self.fetch_document_content(doc["id"])
+        except HttpError as e:
+            logger.error("Google Docs API error: %s", e)
+            return f"Error accessing document: {str(e)}"
+        except Exception as e:
+            logger.error("Error retrieving Google Doc content: %s", e)
+            return f"Error: {str(e)}"
+
+        with self._cache_lock:
+            self._content_cache[doc["id"]] = {
+                "modified": doc.get("modified", ""), "content": content, "version": TEXT_FORMAT_VERSION
+            }
+        self.save_cache()
+        return content
+
+    def get_documents_in_folder(self) -> Optional[List[Dict[str, str]]]:
+        """Get all Google Docs in the specified folder, or None if the folder could not be listed."""
+        logger.info("Checking folder ID: %s", self.folder_id)
+        logger.info("Drive service available: %s", self.drive_service is not None)
 
         if not self.drive_service:
             logger.error("Drive service not available")
-            return []
+            return None
 
         if not self.folder_id:
             logger.error("Folder ID not set")
-            return []
+            return None
 
         try:
             query = f"'{self.folder_id}' in parents and mimeType='application/vnd.google-apps.document'"
-            logger.info(f"Executing query: {query}")
-
-            results = self.drive_service.files().list(
-                q=query,
-                fields="files(id,name,description,createdTime,modifiedTime)",
-                orderBy="modifiedTime desc"
-            ).execute()
+            logger.info("Executing query: %s", query)
+
+            documents = []
+            page_token = None
+            while True:
+                results = self.drive_service.files().list(
+                    q=query,
+                    fields="nextPageToken,files(id,name,description,createdTime,modifiedTime)",
+                    orderBy="modifiedTime desc",
+                    pageSize=1000,
+                    pageToken=page_token
+                ).execute()
+
+                documents.extend(results.get('files', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
 
-            documents = results.get('files', [])
-            logger.info(f"Found {len(documents)} documents in folder")
+            logger.info("Found %s documents in folder", len(documents))
 
             if documents:
                 for doc in documents:
-                    logger.info(f"Document: {doc.get('name', 'Unknown')} (ID: {doc.get('id', 'Unknown')})")
+                    logger.info("Document: %s (ID: %s)", doc.get('name', 'Unknown'), doc.get('id', 'Unknown'), extra=SAMPLED)
 
             return [
                 {
@@ -119,10 +313,226 @@ class GoogleDocsMCPServer:
             ]
 
         except Exception as e:
-            logger.error(f"Error getting documents from folder: {e}")
+            logger.error("Error getting documents from folder: %s", e)
             import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
-            return []
+            logger.error("Full traceback: %s", traceback.format_exc())
+            return None
+
+    def _thread_http(self):
+        """Get an authorized HTTP client for the current thread (httplib2 is not thread-safe)."""
+        if self._credentials is None:
+            return None
+
+        if getattr(self._thread_local, "http", None) is None:
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
+
+            self._thread_local.http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+        return self._thread_local.http
+
+    def _execute_batch(self, doc_ids: List[str]) -> Dict[str, Any]:
+        """Fetch a batch of documents in one HTTP round-trip. Failed documents map to their exception."""
+        results: Dict[str, Any] = {}
+
+        def callback(request_id, response, exception):
+            results[request_id] = exception if exception is not None else response
+
+        try:
+            batch = self.docs_service.new_batch_http_request(callback=callback)
+            for doc_id in doc_ids:
+                batch.add(
+                    self.docs_service.documents().get(documentId=doc_id, fields=self.document_fields),
+                    request_id=doc_id
+                )
+            batch.execute(http=self._thread_http())
+        except Exception as e:
+            # The batch failed as a whole; only its own documents without a response fail
+            logger.error("Batch of %s documents failed: %s", len(doc_ids), e)
+            for doc_id in doc_ids:
+                results.setdefault(doc_id, e)
+
+        for doc_id, result in results.items():
+            if not isinstance(result, Exception):
+                try:
+                    results[doc_id] = self._document_text(doc_id, result)
+                except Exception as e:
+                    results[doc_id] = e
+
+        return results
+
+    def fetch_documents_content(self, doc_ids: List[str]) -> Dict[str, Any]:
+        """
+        Download many documents using batch HTTP requests run by a bounded thread pool.
+
+        Args:
+            doc_ids: IDs of the documents to download
+
+        Returns:
+            Dictionary of document ID to its text, or to the exception that failed it
+        """
+        if not self.docs_service:
+            raise RuntimeError("Google Docs API not available")
+
+        batches = [doc_ids[i:i + self.batch_size] for i in range(0, len(doc_ids), self.batch_size)]
+        # Without per-thread credentials the shared HTTP client must not be used concurrently
+        workers = max(1, min(self.fetch_workers if self._credentials else 1, len(batches)))
+        logger.info("Fetching %s documents in %s batches with %s workers", len(doc_ids), len(batches), workers)
+
+        results: Dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for batch_results in executor.map(self._execute_batch, batches):
+                results.update(batch_results)
+
+        for doc_id in doc_ids:
+            # A batch can fail as a whole; surface that for each of its documents
+            results.setdefault(doc_id, RuntimeError("No response received for document"))
+        return results
+
+    def get_cached_documents_content(self, documents: List[Dict[str, str]]) -> List[str]:
+        """
+        Get the content of many documents, downloading only the changed ones concurrently.
+
+        Args:
+            documents: Document metadata from the folder listing
+
+        Returns:
+            Document texts (or error messages) in the same order as documents
+        """
+        contents: Dict[str, str] = {}
+        stale = []
+
+        with self._cache_lock:
+            for doc in documents:
+                cached = self._content_cache.get(doc["id"])
+                if cached and cached.get("modified") == doc.get("modified"):
+                    contents[doc["id"]] = cached["content"]
+                else:
+                    stale.append(doc)
+
+        logger.info("%s documents cached, %s to download", len(documents) - len(stale), len(stale))
+
+        if stale:
+            try:
+                fetched = self.fetch_documents_content([doc["id"] for doc in stale])
+            except Exception as e:
+                logger.error("Error retrieving Google Doc content: %s", e)
+                fetched = {doc["id"]: e for doc in stale}
+
+            with self._cache_lock:
+                for doc in stale:
+                    result = fetched[doc["id"]]
+                    if isinstance(result, HttpError):
+                        logger.error("Google Docs API error for %s: %s", doc.get('name', doc['id']), result)
+                        contents[doc["id"]] = f"Error accessing document: {str(result)}"
+                    elif isinstance(result, Exception):
+                        logger.error("Error retrieving Google Doc %s: %s", doc.get('name', doc['id']), result)
+                        contents[doc["id"]] = f"Error: {str(result)}"
+                    else:
+                        contents[doc["id"]] = result
+                        self._content_cache[doc["id"]] = {
+                            "modified": doc.get("modified", ""), "content": result, "version": TEXT_FORMAT_VERSION
+                        }
+            self.save_cache()
+
+        return [contents[doc["id"]] for doc in documents]
+
+    def refresh_index(self) -> List[Dict[str, str]]:
+        """
+        Bring the passage index in line with the folder, re-chunking only changed documents.
+
+        Returns:
+            The current folder listing
+        """
+        documents = self.list_documents_cached()
+        self.index.retain(doc["id"] for doc in documents)
+
+        stale = self.index.stale_documents(documents)
+        if stale:
+            contents = self.get_cached_documents_content(stale)
+            for doc, content in zip(stale, contents):
+                with self._cache_lock:
+                    cached = self._content_cache.get(doc["id"])
+                if not cached or cached.get("modified") != doc.get("modified", ""):
+                    # The download failed; leave the document out so it is retried on the next search
+                    continue
+                self.index.update(doc, content)
+            logger.info("Indexed %s documents, %s passages in total", len(stale), len(self.index))
+
+        return documents
+
+    def search_documents(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find the passages most relevant to a query across all documents in the folder.
+
+        Args:
+            query: Search query
+            k: Number of passages to return
+
+        Returns:
+            Ranked passages with their document name, modifiedTime and score
+        """
+        self.refresh_index()
+        return self.index.search(query, k)
+
+    def fetch_document_content(self, doc_id: str) -> str:
+        """Download the text of a Google Doc, raising on errors."""
+        if not self.docs_service:
+            raise RuntimeError("Google Docs API not available")
+
+        document = self.docs_service.documents().get(documentId=doc_id, fields=self.document_fields).execute()
+        return self._document_text(doc_id, document)
+
+    def _document_text(self, doc_id: str, document: Dict[str, Any]) -> str:
+        """Extract the text of a masked document, fetching it in full if the mask cut off nested tables."""
+        text, elided = self._walk_text(document)
+        if elided:
+            logger.warning(
+                "Document %s has %s tables nested deeper than %s levels, fetching it in full",
+                doc_id, elided, self.table_depth
+            )
+            document = self.docs_service.documents().get(documentId=doc_id).execute(http=self._thread_http())
+            text, _ = self._walk_text(document)
+        return text
+
+    @staticmethod
+    def extract_text(document: Dict[str, Any]) -> str:
+        """
+        Concatenate the text runs of a Google Docs document resource in reading order.
+
+        Walks paragraphs, table cells and tables of contents with an explicit stack of
+        iterators, so deeply nested tables cannot hit the recursion limit.
+        """
+        return GoogleDocsMCPServer._walk_text(document)[0]
+
+    @staticmethod
+    def _walk_text(document: Dict[str, Any]) -> Tuple[str, int]:
+        """Extract the text of a document and count the tables whose cells the field mask left out."""
+        text_content = []
+        elided = 0
+        stack = [iter(document.get('body', {}).get('content', []))]
+
+        while stack:
+            element = next(stack[-1], None)
+            if element is None:
+                stack.pop()
+            elif 'paragraph' in element:
+                for para_element in element['paragraph'].get('elements', []):
+                    if 'textRun' in para_element:
+                        text_content.append(para_element['textRun'].get('content', ''))
+            elif 'table' in element:
+                if 'tableRows' not in element['table'] and element['table'].get('rows'):
+                    elided += 1
+                    continue
+                cells = (
+                    cell
+                    for row in element['table'].get('tableRows', [])
+                    for cell in row.get('tableCells', [])
+                )
+                stack.append(chain.from_iterable(cell.get('content', []) for cell in cells))
+            elif 'tableOfContents' in element:
+                stack.append(iter(element['tableOfContents'].get('content', [])))
+
+        return ''.join(text_content).strip(), elided
 
     def get_document_content(self, doc_id: str) -> str:
         """Get content from a Google Doc."""
@@ -130,24 +540,13 @@ class GoogleDocsMCPServer:
             return "Google Docs API not available"
 
         try:
-            document = self.docs_service.documents().get(documentId=doc_id).execute()
-
-            content = document.get('body', {}).get('content', [])
-            text_content = []
-
-            for element in content:
-                if 'paragraph' in element:
-                    for para_element in element['paragraph']['elements']:
-                        if 'textRun' in para_element:
-                            text_content.append(para_element['textRun']['content'])
-
-            return ''.join(text_content).strip()
+            return self.fetch_document_content(doc_id)
 
         except HttpError as e:
-            logger.error(f"Google Docs API error: {e}")
+            logger.error("Google Docs API error: %s", e)
             return f"Error accessing document: {str(e)}"
         except Exception as e:
-            logger.error(f"Error retrieving Google Doc content: {e}")
+            logger.error("Error retrieving Google Doc content: %s", e)
             return f"Error: {str(e)}"
 
 
@@ -168,32 +567,64 @@ def create_mcp_server():
         """
         try:
             logger.info("get_insurance_documents tool called")
-            documents = docs_server.get_documents_in_folder()
-            logger.info(f"Found {len(documents) if documents else 0} documents")
+            documents = docs_server.list_documents_cached()
+            logger.info("Found %s documents", len(documents) if documents else 0)
 
             if not documents:
                 logger.info("No documents found, returning message")
                 return "No insurance documents found in the specified folder."
 
-            # Get content for each document
-            docs_with_content = []
-            for i, doc in enumerate(documents):
-                logger.info(f"Processing document {i+1}/{len(documents)}: {doc.get('name', 'Unknown')}")
-                content = docs_server.get_document_content(doc["id"])
-                docs_with_content.append({
-                    **doc,
-                    "content": content
-                })
+            # Get content for each document, downloading changed ones concurrently
+            contents = docs_server.get_cached_documents_content(documents)
+            docs_with_content = [
+                {**doc, "content": content}
+                for doc, content in zip(documents, contents)
+            ]
 
             import json
             result = json.dumps(docs_with_content, indent=2)
-            logger.info(f"Successfully processed {len(docs_with_content)} documents")
+            logger.info("Successfully processed %s documents", len(docs_with_content))
             return result
 
         except Exception as e:
-            logger.error(f"Error getting insurance documents: {e}")
+            logger.error("Error getting insurance documents: %s", e)
             import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            logger.error("Full traceback: %s", traceback.format_exc())
+            return f"Error: {str(e)}"
+
+    @mcp.tool()
+    def search_insurance_documents(query: str, k: int = 5) -> str:
+        """
+        Search the insurance documents and return only the passages relevant to a query.
+
+        Args:
+            query: What to look for, e.g. a question about a policy or claim procedure
+            k: Maximum number of passages to return
+
+        Returns:
+            The top-k matching passages with the documents they come from
+        """
+        try:
+            logger.info("search_insurance_documents tool called: query=%r, k=%s", query, k)
+            passages = docs_server.search_documents(query, k)
+
+            if not passages:
+                if not docs_server.list_documents_cached():
+                    return "No insurance documents found in the specified folder."
+                return f"No passages in the insurance documents match '{query}'."
+
+            result = f"Top {len(passages)} passages for '{query}':\n\n"
+            for i, passage in enumerate(passages, 1):
+                result += f"[{i}] {passage['document']} (modified {passage['modified'] or 'unknown'}, score {passage['score']})\n"
+                result += f"{passage['text']}\n\n"
+
+            logger.info("Returned %s passages", len(passages))
+            return result.rstrip()
+
+        except Exception as e:
+            logger.error("Error searching insurance documents: %s", e)
+            import traceback
+            logger.error("Full traceback: %s", traceback.format_exc())
             return f"Error: {str(e)}"
 
     @mcp.tool()
@@ -205,7 +636,7 @@ def create_mcp_server():
             List of document names and metadata
         """
         try:
-            documents = docs_server.get_documents_in_folder()
+            documents = docs_server.list_documents_cached()
 
             if not documents:
                 return "No documents found in the specified folder."
@@ -217,11 +648,11 @@ def create_mcp_server():
                     result += f"   Description: {doc['description']}\n"
                 result += f"   Modified: {doc.get('modified', 'Unknown')}\n\n"
 
-            logger.info(f"Available Documents: {len(documents)}")
+            logger.info("Available Documents: %s", len(documents))
             return result
 
         except Exception as e:
-            logger.error(f"Error listing documents: {e}")
+            logger.error("Error listing documents: %s", e)
             return f"Error: {str(e)}"
 
     @mcp.tool()
@@ -236,25 +667,19 @@ def create_mcp_server():
             Document content
         """
         try:
-            documents = docs_server.get_documents_in_folder()
-
             # Find document by name (case-insensitive)
-            target_doc = None
-            for doc in documents:
-                if doc["name"].lower() == document_name.lower():
-                    target_doc = doc
-                    break
+            target_doc = docs_server.find_document_by_name(document_name)
 
             if not target_doc:
-                available_names = [doc["name"] for doc in documents]
+                available_names = [doc["name"] for doc in docs_server.list_documents_cached()]
                 return f"Document '{document_name}' not found. Available documents: {', '.join(available_names)}"
 
-            content = docs_server.get_document_content(target_doc["id"])
+            content = docs_server.get_cached_document_content(target_doc)
 
             return f"Document: {target_doc['name']}\n\n{content}"
 
         except Exception as e:
-            logger.error(f"Error getting document by name: {e}")
+            logger.error("Error getting document by name: %s", e)
             return f"Error retrieving document: {str(e)}"
 
     return mcp
@@ -3,6 +3,8 @@ Service modules for the Internal Research Agent.
 """
 
 from .document_loader import DocumentLoader
+from .embeddings import CachedBatchEmbeddings, create_embeddings
+from .tool_cache import ToolResultCache
 from .vector_store import VectorStoreService
 
-__all__ = ["DocumentLoader", "VectorStoreService"]
\ No newline at end of file
+__all__ = ["DocumentLoader", "CachedBatchEmbeddings", "create_embeddings", "ToolResultCache", "VectorStoreService"]
\ No newline at end of file
@@ -2,7 +2,8 @@
 Document loading service for the Internal Research Agent.
 """
 import os
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
 from langchain_community.document_loaders import (
@@ -12,26 +13,62 @@ from langchain_community.document_loaders import (
 )
 from langchain.schema import Document
 
-from utils.logger import logger
+from utils.logger import SAMPLED, logger
 from ira_cli.config import settings
 
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 4
+
+
+def load_file(file_path: str) -> List[Document]:
+    """
+    Load a single supported file with the parser for its extension.
+
+    Defined at module level so it can run in worker processes.
+
+    Args:
+        file_path: Path to the document file
+
+    Returns:
+        List of loaded documents
+    """
+    suffix = Path(file_path).suffix.lower()
+
+    if suffix == ".pdf":
+        loader = PyPDFLoader(str(file_path))
+    elif suffix == ".docx":
+        loader = UnstructuredWordDocumentLoader(str(file_path))
+    elif suffix == ".txt":
+        loader = TextLoader(str(file_path))
+    else:
+        raise ValueError(f"Unsupported file type: {suffix}")
+
+    return loader.load()
+
 
 class DocumentLoader:
     """Service for loading documents from various file formats."""
 
-    SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+    SUPPORTED_EXTENSIONS = SUPPORTED_EXTENSIONS
 
-    def __init__(self, docs_path: Optional[str] = None):
+    def __init__(self, docs_path: Optional[str] = None, max_workers: Optional[int] = None):
         """
         Initialize the document loader.
 
         Args:
             docs_path: Path to documents directory
+            max_workers: Number of worker processes for parsing (0 uses all CPUs, 1 loads serially)
         """
         self.docs_path = Path(docs_path or settings.docs_path)
         if not self.docs_path.exists():
             raise FileNotFoundError(f"Documents path not found: {self.docs_path}")
 
+        if max_workers is None:
+            max_workers = settings.loader_workers
+        self.max_workers = max_workers or os.cpu_count() or 1
+
     def get_supported_files(self) -> List[Path]:
         """
         Get all supported files in the documents directory.
@@ -45,8 +82,66 @@ class DocumentLoader:
             if file_path.is_file() and file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
                 supported_files.append(file_path)
 
-        logger.info(f"Found {len(supported_files)} supported files in {self.docs_path}")
-        return supported_files
+        logger.info("Found %s supported files in %s", len(supported_files), self.docs_path)
+        return sorted(supported_files)
+
+    def iter_loaded_files(
+        self,
+        file_paths: Iterable[Path],
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[Path, List[Document]]]:
+        """
+        Load files in parallel, yielding each file's documents as soon as it is parsed.
+
+        Parsing runs in a process pool because the PDF and DOCX parsers are CPU-bound; a
+        handful of files (fewer than PARALLEL_MIN_FILES) is loaded in-process. A file that
+        fails to load is logged and skipped without affecting the others. Files come back in
+        completion order; callers that need a stable order sort the results.
+
+        Args:
+            file_paths: Files to load
+            max_workers: Override for the number of worker processes
+
+        Yields:
+            Tuples of (file path, loaded documents)
+        """
+        file_paths = [Path(file_path) for file_path in file_paths]
+        workers = min(max_workers or self.max_workers, len(file_paths))
+
+        if workers <= 1 or len(file_paths) < PARALLEL_MIN_FILES:
+            for file_path in file_paths:
+                docs = self._load_logged(file_path)
+                if docs is not None:
+                    yield file_path, docs
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for file_path in file_paths:
+                logger.info("Loading document: %s", file_path, extra=SAMPLED)
+                futures[executor.submit(load_file, str(file_path))] = file_path
+
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    docs = future.result()
+                except Exception as e:
+                    logger.error("Error loading %s: %s", file_path, e)
+                    continue
+
+                logger.info("Successfully loaded %s chunks from %s", len(docs), file_path, extra=SAMPLED)
+                yield file_path, docs
+
+    def _load_logged(self, file_path: Path) -> Optional[List[Document]]:
+        """Load a file in-process, logging and swallowing errors. Returns None on failure."""
+        try:
+            logger.info("Loading document: %s", file_path, extra=SAMPLED)
+            docs = load_file(str(file_path))
+            logger.info("Successfully loaded %s chunks from %s", len(docs), file_path, extra=SAMPLED)
+            return docs
+        except Exception as e:
+            logger.error("Error loading %s: %s", file_path, e)
+            return None
 
     def load_documents(self) -> List[Document]:
         """
@@ -55,32 +150,14 @@ class DocumentLoader:
         Returns:
             List of loaded documents
         """
-        documents = []
-        supported_files = self.get_supported_files()
-
-        for file_path in supported_files:
-            try:
-                logger.info(f"Loading document: {file_path}")
-
-                if file_path.suffix.lower() == ".pdf":
-                    loader = PyPDFLoader(str(file_path))
-                elif file_path.suffix.lower() == ".docx":
-                    loader = UnstructuredWordDocumentLoader(str(file_path))
-                elif file_path.suffix.lower() == ".txt":
-                    loader = TextLoader(str(file_path))
-                else:
-                    logger.warning(f"Unsupported file type: {file_path}")
-                    continue
+        loaded = dict(self.iter_loaded_files(self.get_supported_files()))
 
-                docs = loader.load()
-                documents.extend(docs)
-                logger.info(f"Successfully loaded {len(docs)} chunks from {file_path}")
-
-            except Exception as e:
-                logger.error(f"Error loading {file_path}: {str(e)}")
-                continue
+        # Files finish in any order; keep the result stable from run to run
+        documents = []
+        for file_path in sorted(loaded):
+            documents.extend(loaded[file_path])
 
-        logger.info(f"Total documents loaded: {len(documents)}")
+        logger.info("Total documents loaded: %s", len(documents))
         return documents
 
     def load_single_document(self, file_path: str) -> List[Document]:
@@ -94,27 +171,27 @@ class DocumentLoader:
             List of loaded documents
         """
         file_path = Path(file_path)
+        self.validate_file(file_path)
+
+        try:
+            logger.info("Loading single document: %s", file_path)
+            docs = load_file(str(file_path))
+            logger.info("Successfully loaded %s chunks from %s", len(docs), file_path)
+            return docs
+
+        except Exception as e:
+            logger.error("Error loading %s: %s", file_path, e)
+            raise
+
+    def validate_file(self, file_path: Path) -> None:
+        """
+        Check that a file exists and has a supported extension.
 
+        Args:
+            file_path: Path to the document file
+        """
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
         if file_path.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
             raise ValueError(f"Unsupported file type: {file_path.suffix}")
-
-        try:
-            logger.info(f"Loading single document: {file_path}")
-
-            if file_path.suffix.lower() == ".pdf":
-                loader = PyPDFLoader(str(file_path))
-            elif file_path.suffix.lower() == ".docx":
-                loader = UnstructuredWordDocumentLoader(str(file_path))
-            elif file_path.suffix.lower() == ".txt":
-                loader = TextLoader(str(file_path))
-
-            docs = loader.load()
-            logger.info(f"Successfully loaded {len(docs)} chunks from {file_path}")
-            return docs
-
-        except Exception as e:
-            logger.error(f"Error loading {file_path}: {str(e)}")
-            raise
\ No newline at end of file
@@ -0,0 +1,345 @@
+"""
+Embedding layer for the Internal Research Agent.
+
+Wraps a remote embedding model with request batching, bounded concurrency, backoff on
+quota errors and a persistent content-hash -> vector cache, so rebuilding the vector
+store only pays for text that has never been embedded before.
+"""
+import hashlib
+import inspect
+import json
+import random
+import sqlite3
+import threading
+import time
+import urllib.request
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from utils.logger import logger
+from utils.tracing import trace_span
+from ira_cli.config import settings
+
+# Task type requested for queries from task-aware models such as Gemini
+QUERY_TASK_TYPE = "RETRIEVAL_QUERY"
+
+# Cache key kind for queries; includes the task type so vectors embedded before it was
+# passed explicitly are not reused
+QUERY_KIND = f"query:{QUERY_TASK_TYPE}"
+
+
+def is_quota_error(error: Exception) -> bool:
+    """
+    Check whether an embedding error is a rate-limit or quota error worth retrying.
+
+    Args:
+        error: Exception raised by the embedding backend
+
+    Returns:
+        True if the request should be retried after a backoff
+    """
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in ("resourceexhausted", "429", "quota", "rate limit", "too many requests"))
+
+
+class EmbeddingCache:
+    """Persistent SQLite cache mapping content hashes to embedding vectors."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Content hashes to look up
+
+        Returns:
+            Dictionary of the keys that were found and their vectors
+        """
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                )
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]) -> None:
+        """
+        Store vectors in the cache.
+
+        Args:
+            items: Dictionary of content hash to vector
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("f", vector).tobytes()) for key, vector in items.items()]
+            )
+            self._conn.commit()
+
+
+class CachedBatchEmbeddings(Embeddings):
+    """Batched, concurrent and cached wrapper around another embedding model."""
+
+    def __init__(
+        self,
+        base: Embeddings,
+        model_name: str,
+        cache_path: Optional[str] = None,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        max_retries: int = 6,
+        initial_backoff: float = 1.0
+    ):
+        """
+        Initialize the embedding wrapper.
+
+        Args:
+            base: Embedding model that performs the remote calls
+            model_name: Model name, part of the cache key so models never share vectors
+            cache_path: SQLite cache file path (None disables caching)
+            batch_size: Maximum texts per remote request
+            max_concurrency: Maximum remote requests in flight
+            max_retries: Retries per batch on quota errors
+            initial_backoff: First backoff delay in seconds, doubled on each retry
+        """
+        self.base = base
+        self.model_name = model_name
+        self.cache = EmbeddingCache(cache_path) if cache_path else None
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.api_calls = 0
+        self.cache_hits = 0
+        self._stats_lock = threading.Lock()
+
+    def _key(self, kind: str, text: str) -> str:
+        """Build the cache key for a text embedded as a document or query."""
+        return hashlib.sha256(f"{self.model_name}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def _call_with_backoff(self, func, *args):
+        """Call the remote embedding model, backing off and retrying on quota errors."""
+        delay = self.initial_backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._stats_lock:
+                    self.api_calls += 1
+                return func(*args)
+            except Exception as e:
+                if attempt == self.max_retries or not is_quota_error(e):
+                    raise
+                sleep_for = delay * (1 + random.random())
+                logger.warning("Embedding quota error, retrying in %.1fs: %s", sleep_for, e)
+                time.sleep(sleep_for)
+                delay *= 2
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, consulting the cache first and embedding only unseen texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors in input order
+        """
+        with trace_span("embedding", "embed_documents", texts=len(texts)) as span:
+            keys = [self._key("document", text) for text in texts]
+            vectors = self.cache.get_many(list(set(keys))) if self.cache else {}
+            with self._stats_lock:
+                self.cache_hits += sum(1 for key in keys if key in vectors)
+
+            # Embed each distinct missing text once
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key not in vectors:
+                    missing.setdefault(key, text)
+
+            span["embedded"] = len(missing)
+            if missing:
+                missing_keys = list(missing)
+                batches = [missing_keys[i:i + self.batch_size] for i in range(0, len(missing_keys), self.batch_size)]
+                logger.info(
+                    "Embedding %s texts in %s batches (%s cached)",
+                    len(missing_keys), len(batches), len(texts) - len(missing_keys)
+                )
+
+                with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(batches)))) as executor:
+                    results = executor.map(
+                        lambda batch: self._call_with_backoff(self.base.embed_documents, [missing[key] for key in batch]),
+                        batches
+                    )
+                    for batch, batch_vectors in zip(batches, results):
+                        new_vectors = dict(zip(batch, batch_vectors))
+                        vectors.update(new_vectors)
+                        if self.cache:
+                            self.cache.put_many(new_vectors)
+
+            return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a query, consulting the cache first.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        with trace_span("embedding", "embed_query") as span:
+            key = self._key(QUERY_KIND, text)
+            if self.cache:
+                cached = self.cache.get_many([key])
+                if key in cached:
+                    with self._stats_lock:
+                        self.cache_hits += 1
+                    span["cached"] = True
+                    return cached[key]
+
+            vector = self._call_with_backoff(self._embed_one_query, text)
+            if self.cache:
+                self.cache.put_many({key: vector})
+            return vector
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several queries, consulting the cache first and embedding the rest in batches.
+
+        Args:
+            texts: Query texts
+
+        Returns:
+            List of embedding vectors in input order
+        """
+        with trace_span("embedding", "embed_queries", texts=len(texts)) as span:
+            keys = [self._key(QUERY_KIND, text) for text in texts]
+            vectors = self.cache.get_many(list(set(keys))) if self.cache else {}
+            with self._stats_lock:
+                self.cache_hits += sum(1 for key in keys if key in vectors)
+
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key not in vectors:
+                    missing.setdefault(key, text)
+
+            span["embedded"] = len(missing)
+            missing_keys = list(missing)
+            for i in range(0, len(missing_keys), self.batch_size):
+                batch = missing_keys[i:i + self.batch_size]
+                new_vectors = dict(zip(batch, self._call_with_backoff(
+                    self._embed_query_batch, [missing[key] for key in batch]
+                )))
+                vectors.update(new_vectors)
+                if self.cache:
+                    self.cache.put_many(new_vectors)
+
+            return [vectors[key] for key in keys]
+
+    def _embed_one_query(self, text: str) -> List[float]:
+        """Embed one query, asking task-aware models for the retrieval-query task."""
+        if "task_type" in inspect.signature(self.base.embed_query).parameters:
+            # Gemini's embed_query does not send its default task type, so pass it explicitly
+            return self.base.embed_query(text, task_type=QUERY_TASK_TYPE)
+        return self.base.embed_query(text)
+
+    def _embed_query_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed queries with one request when the base model supports it."""
+        if hasattr(self.base, "embed_queries"):
+            return self.base.embed_queries(texts)
+        if "task_type" in inspect.signature(self.base.embed_documents).parameters:
+            # Same task type as _embed_one_query, so both paths yield the same vectors
+            return self.base.embed_documents(texts, task_type=QUERY_TASK_TYPE)
+        return [self._embed_one_query(text) for text in texts]
+
+
+class HTTPEmbeddings(Embeddings):
+    """
+    Embeddings served by a simple HTTP endpoint.
+
+    The endpoint receives a JSON body {"texts": [...], "task": "document"|"query"} and returns
+    {"embeddings": [[...], ...]}. Mainly used to point the service at a local fake endpoint.
+    """
+
+    def __init__(self, endpoint: str, timeout: float = 60.0):
+        """
+        Initialize the HTTP embeddings client.
+
+        Args:
+            endpoint: URL of the embedding endpoint
+            timeout: Request timeout in seconds
+        """
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def _post(self, texts: List[str], task: str) -> List[List[float]]:
+        """POST texts to the endpoint and return their vectors."""
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps({"texts": texts, "task": task}).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())["embeddings"]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents through the endpoint."""
+        return self._post(texts, "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query through the endpoint."""
+        return self._post([text], "query")[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries through the endpoint in one request."""
+        return self._post(texts, "query")
+
+
+def create_embeddings() -> CachedBatchEmbeddings:
+    """
+    Create the embedding model configured in settings.
+
+    Returns:
+        Cached, batched embedding model
+    """
+    if settings.embedding_endpoint:
+        base = HTTPEmbeddings(settings.embedding_endpoint)
+        # The endpoint serves its own model; never share cached vectors with Gemini
+        model_name = f"http:{settings.embedding_endpoint}"
+    else:
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        base = GoogleGenerativeAIEmbeddings(model=settings.embedding_model)
+        model_name = settings.embedding_model
+
+    return CachedBatchEmbeddings(
+        base,
+        model_name=model_name,
+        cache_path=settings.embedding_cache_path or None,
+        batch_size=settings.embedding_batch_size,
+        max_concurrency=settings.embedding_concurrency
+    )
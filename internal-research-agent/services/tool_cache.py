@@ -0,0 +1,268 @@
+"""
+Tool result cache for the Internal Research Agent.
+
+The ReAct loop often calls the same tool with the same input several times within a
+query and across queries. ToolResultCache memoises tool results in a size-bounded LRU
+with a per-tool TTL, optionally backed by SQLite so results survive restarts.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from utils.logger import logger
+from ira_cli.config import settings
+
+
+class ToolResultCache:
+    """Size-bounded LRU cache of tool results with per-tool TTLs and hit/miss counters."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        persist_path: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            default_ttl: Seconds a result stays valid for tools without their own TTL
+            ttls: Per-tool TTLs in seconds; a TTL of 0 disables caching for that tool
+            persist_path: Optional SQLite file to persist results across runs
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.tool_cache_max_entries
+        self.default_ttl = default_ttl if default_ttl is not None else settings.tool_cache_ttl
+        self.ttls = dict(settings.tool_cache_ttls if ttls is None else ttls)
+        self.persist_path = persist_path if persist_path is not None else settings.tool_cache_path
+
+        # key -> (tool name, expiry timestamp, result)
+        self._entries: "OrderedDict[str, Tuple[str, float, Any]]" = OrderedDict()
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.persist_path:
+            try:
+                Path(self.persist_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(self.persist_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS tool_results "
+                    "(key TEXT PRIMARY KEY, tool TEXT, expires REAL, value TEXT)"
+                )
+                self._conn.execute("DELETE FROM tool_results WHERE expires <= ?", (time.time(),))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("Tool cache persistence disabled, cannot open %s: %s", self.persist_path, e)
+                self._conn = None
+
+    def ttl_for(self, tool_name: str) -> float:
+        """Get the TTL in seconds for a tool."""
+        return self.ttls.get(tool_name, self.default_ttl)
+
+    @staticmethod
+    def make_key(tool_name: str, tool_input: Any, namespace: str = "") -> str:
+        """
+        Build the cache key for a tool call.
+
+        String inputs are compared case-insensitively with whitespace collapsed, so trivial
+        rephrasings by the agent still hit.
+        """
+        if isinstance(tool_input, str):
+            tool_input = " ".join(tool_input.split()).casefold()
+        payload = json.dumps([tool_name, namespace, tool_input], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, tool_name: str, tool_input: Any, namespace: str = "") -> Tuple[bool, Any]:
+        """
+        Look up a cached tool result.
+
+        Args:
+            tool_name: Name of the tool
+            tool_input: Tool input
+            namespace: Extra key component, e.g. the vector store revision
+
+        Returns:
+            (True, result) on a hit, (False, None) on a miss
+        """
+        key = self.make_key(tool_name, tool_input, namespace)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+                entry = None
+
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT expires, value FROM tool_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] > now:
+                    entry = (tool_name, row[0], json.loads(row[1]))
+                    self._store(key, entry)
+
+            if entry is None:
+                self._misses[tool_name] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self._hits[tool_name] += 1
+            return True, entry[2]
+
+    def put(self, tool_name: str, tool_input: Any, result: Any, namespace: str = "") -> None:
+        """
+        Cache a tool result for the tool's TTL.
+
+        Args:
+            tool_name: Name of the tool
+            tool_input: Tool input
+            result: Tool result
+            namespace: Extra key component, e.g. the vector store revision
+        """
+        ttl = self.ttl_for(tool_name)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        key = self.make_key(tool_name, tool_input, namespace)
+        entry = (tool_name, time.time() + ttl, result)
+
+        with self._lock:
+            self._store(key, entry)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO tool_results (key, tool, expires, value) VALUES (?, ?, ?, ?)",
+                        (key, tool_name, entry[1], json.dumps(result))
+                    )
+                    self._conn.commit()
+                except (TypeError, ValueError, sqlite3.Error) as e:
+                    logger.warning("Could not persist %s result: %s", tool_name, e)
+
+    def _store(self, key: str, entry: Tuple[str, float, Any]) -> None:
+        """Insert an entry in memory, evicting the least recently used. Caller holds the lock."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def wrap(
+        self,
+        tool_name: str,
+        func: Callable[[Any], Any],
+        namespace: Optional[Callable[[], str]] = None
+    ) -> Callable[[Any], Any]:
+        """
+        Wrap a tool function so its results are served from the cache.
+
+        Exceptions and results reported as errors ("Error: ...") are not cached.
+
+        Args:
+            tool_name: Name of the tool
+            func: Tool function taking a single input
+            namespace: Optional callable giving an extra key component at call time; when
+                it changes, earlier results are no longer used
+
+        Returns:
+            Caching tool function
+        """
+        def cached(tool_input):
+            ns = namespace() if namespace else ""
+            hit, result = self.get(tool_name, tool_input, ns)
+            if hit:
+                logger.info("Tool cache hit for %s", tool_name)
+                return result
+
+            result = func(tool_input)
+            if not (isinstance(result, str) and result.startswith("Error")):
+                self.put(tool_name, tool_input, result, ns)
+            return result
+
+        cached.__name__ = getattr(func, "__name__", tool_name)
+        cached.__doc__ = getattr(func, "__doc__", None)
+        return cached
+
+    def awrap(
+        self,
+        tool_name: str,
+        coroutine: Callable[[Any], Awaitable[Any]],
+        namespace: Optional[Callable[[], str]] = None
+    ) -> Callable[[Any], Awaitable[Any]]:
+        """
+        Wrap an async tool function so its results are served from the cache.
+
+        Same behaviour as wrap(), for tools whose async path should stay on the event loop.
+
+        Args:
+            tool_name: Name of the tool
+            coroutine: Async tool function taking a single input
+            namespace: Optional callable giving an extra key component at call time
+
+        Returns:
+            Caching async tool function
+        """
+        async def cached(tool_input):
+            ns = namespace() if namespace else ""
+            hit, result = self.get(tool_name, tool_input, ns)
+            if hit:
+                logger.info("Tool cache hit for %s", tool_name)
+                return result
+
+            result = await coroutine(tool_input)
+            if not (isinstance(result, str) and result.startswith("Error")):
+                self.put(tool_name, tool_input, result, ns)
+            return result
+
+        cached.__name__ = getattr(coroutine, "__name__", tool_name)
+        cached.__doc__ = getattr(coroutine, "__doc__", None)
+        return cached
+
+    def invalidate(self, tool_name: Optional[str] = None) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            tool_name: Only drop this tool's results; drop everything if None
+
+        Returns:
+            Number of in-memory entries dropped
+        """
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if tool_name is None or entry[0] == tool_name]
+            for key in keys:
+                del self._entries[key]
+
+            if self._conn is not None:
+                if tool_name is None:
+                    self._conn.execute("DELETE FROM tool_results")
+                else:
+                    self._conn.execute("DELETE FROM tool_results WHERE tool = ?", (tool_name,))
+                self._conn.commit()
+
+        logger.info("Invalidated %s cached results for %s", len(keys), tool_name or 'all tools')
+        return len(keys)
+
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with total hits, misses and entries, and per-tool hits and misses
+        """
+        with self._lock:
+            tools = sorted(set(self._hits) | set(self._misses))
+            return {
+                "hits": sum(self._hits.values()),
+                "misses": sum(self._misses.values()),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persisted": self._conn is not None,
+                "tools": {tool: {"hits": self._hits[tool], "misses": self._misses[tool]} for tool in tools}
+            }
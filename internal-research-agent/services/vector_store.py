@@ -1,35 +1,95 @@
 """
 Vector store service for the Internal Research Agent.
 """
-from typing import List, Optional
+import hashlib
+import json
+import math
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_chroma import Chroma
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
 
+from services.embeddings import create_embeddings
 from utils.logger import logger
+from utils.tracing import trace_span
 from ira_cli.config import settings
 
+# Chroma rejects overly large add/upsert calls, so chunks are written in batches
+ADD_BATCH_SIZE = 500
+
+
+def file_sha256(file_path: Path) -> str:
+    """Compute the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(source: str) -> str:
+    """Normalise a document source path so the same file always maps to the same key."""
+    return str(Path(source).resolve())
+
+
+def assign_chunk_ids(chunks: List[Document]) -> List[str]:
+    """
+    Compute deterministic IDs for chunks from their source path and content hash.
+
+    Identical chunks within the same source are disambiguated by their occurrence number,
+    so re-indexing an unchanged file always yields the same IDs.
+
+    Args:
+        chunks: Document chunks with a "source" metadata entry
+
+    Returns:
+        List of chunk IDs, one per chunk
+    """
+    ids = []
+    occurrences = defaultdict(int)
+
+    for chunk in chunks:
+        source = source_key(chunk.metadata.get("source", ""))
+        content_hash = hashlib.sha256(chunk.page_content.encode("utf-8")).hexdigest()
+        occurrence = occurrences[(source, content_hash)]
+        occurrences[(source, content_hash)] += 1
+        ids.append(hashlib.sha256(f"{source}\0{content_hash}\0{occurrence}".encode("utf-8")).hexdigest())
+
+    return ids
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors (0.0 if either is all zeros)."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return float(dot / norm) if norm else 0.0
+
 
 class VectorStoreService:
     """Service for managing document embeddings and vector storage."""
 
-    def __init__(self, vector_store_path: Optional[str] = None):
+    def __init__(self, vector_store_path: Optional[str] = None, embeddings: Optional[Embeddings] = None):
         """
         Initialize the vector store service.
 
         Args:
             vector_store_path: Path to vector store directory
+            embeddings: Embedding model (defaults to the one configured in settings)
         """
         self.vector_store_path = Path(vector_store_path or settings.vector_store_path)
-        self.embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+        self.embeddings = embeddings if embeddings is not None else create_embeddings()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap
         )
         self._vector_store = None
+        self.manifest_path = self.vector_store_path / "manifest.json"
+        self._manifest = None
+        self._manifest_dirty = False
 
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """
@@ -41,54 +101,207 @@ class VectorStoreService:
         Returns:
             List of document chunks
         """
-        logger.info(f"Splitting {len(documents)} documents into chunks")
+        logger.info("Splitting %s documents into chunks", len(documents))
         chunks = self.text_splitter.split_documents(documents)
-        logger.info(f"Created {len(chunks)} chunks")
+        logger.info("Created %s chunks", len(chunks))
         return chunks
 
-    def create_vector_store(self, documents: List[Document], force_recreate: bool = False) -> Chroma:
+    def exists(self) -> bool:
+        """
+        Check whether a persisted vector store exists on disk.
+
+        Returns:
+            True if the vector store directory exists
+        """
+        return self.vector_store_path.exists()
+
+    def create_vector_store(
+        self,
+        documents: Union[List[Document], Callable[[], List[Document]]],
+        force_recreate: bool = False
+    ) -> Optional[Chroma]:
         """
         Create or load a vector store from documents.
 
         Args:
-            documents: List of documents to embed
+            documents: List of documents to embed, or a callable returning them. A callable
+                is only invoked when a new vector store has to be built.
             force_recreate: Whether to recreate the vector store even if it exists
 
         Returns:
-            Chroma vector store instance
+            Chroma vector store instance, or None if there were no documents to build it from
         """
         if self._vector_store is not None and not force_recreate:
             return self._vector_store
 
         # Check if vector store already exists
-        if self.vector_store_path.exists() and not force_recreate:
-            logger.info(f"Loading existing vector store from {self.vector_store_path}")
+        if self.exists() and not force_recreate:
+            logger.info("Loading existing vector store from %s", self.vector_store_path)
             try:
-                self._vector_store = Chroma(
-                    persist_directory=str(self.vector_store_path),
-                    embedding_function=self.embeddings
-                )
+                self._vector_store = self._open_vector_store()
                 logger.info("Successfully loaded existing vector store")
                 return self._vector_store
             except Exception as e:
-                logger.warning(f"Failed to load existing vector store: {e}")
+                logger.warning("Failed to load existing vector store: %s", e)
 
         # Create new vector store
         logger.info("Creating new vector store")
+        if callable(documents):
+            documents = documents()
+
+        if not documents:
+            logger.warning("No documents available to create vector store")
+            return None
+
         chunks = self.split_documents(documents)
 
         try:
-            self._vector_store = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                persist_directory=str(self.vector_store_path)
-            )
-            logger.info(f"Successfully created vector store with {len(chunks)} chunks")
+            if self.exists():
+                # Drop the old collection so a rebuild does not leave stale chunks behind
+                self._open_vector_store().delete_collection()
+
+            self._vector_store = self._open_vector_store()
+            self._manifest = {"files": {}}
+            self._index_chunks(chunks)
+            self._save_manifest()
+            logger.info("Successfully created vector store with %s chunks", len(chunks))
             return self._vector_store
         except Exception as e:
-            logger.error(f"Error creating vector store: {e}")
+            logger.error("Error creating vector store: %s", e)
             raise
 
+    def _open_vector_store(self) -> Chroma:
+        """Open (or create) the persisted Chroma collection."""
+        return Chroma(
+            persist_directory=str(self.vector_store_path),
+            embedding_function=self.embeddings
+        )
+
+    def _load_manifest(self) -> dict:
+        """Load the manifest of indexed files and their chunk IDs."""
+        if self._manifest is None:
+            if self.manifest_path.exists():
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            elif self._vector_store is not None:
+                self._manifest = self._manifest_from_collection()
+            else:
+                self._manifest = {"files": {}}
+        return self._manifest
+
+    def _manifest_from_collection(self) -> dict:
+        """
+        Build a manifest for a store created before manifests existed.
+
+        Chunks are attributed to files by their "source" metadata. The entries carry no
+        change markers, so the next sync re-indexes each file once, replacing its old
+        chunks instead of adding duplicates.
+        """
+        files = defaultdict(lambda: {"chunk_ids": []})
+        existing = self._vector_store.get(include=["metadatas"])
+        for chunk_id, metadata in zip(existing["ids"], existing["metadatas"]):
+            source = (metadata or {}).get("source")
+            if source:
+                files[source_key(source)]["chunk_ids"].append(chunk_id)
+
+        if files:
+            logger.info("Seeded the manifest with %s files from the existing collection", len(files))
+            self._manifest_dirty = True
+        return {"files": dict(files)}
+
+    def _save_manifest(self) -> None:
+        """Persist the manifest atomically next to the vector store."""
+        self.vector_store_path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._load_manifest(), f)
+        tmp_path.replace(self.manifest_path)
+        self._manifest_dirty = False
+
+    def _add_chunks(self, chunks: List[Document], ids: List[str]) -> None:
+        """Write chunks with their IDs to the vector store in batches."""
+        for i in range(0, len(chunks), ADD_BATCH_SIZE):
+            self._vector_store.add_documents(chunks[i:i + ADD_BATCH_SIZE], ids=ids[i:i + ADD_BATCH_SIZE])
+
+    def _delete_chunks(self, ids: Iterable[str]) -> None:
+        """Delete chunks by ID from the vector store in batches."""
+        ids = list(ids)
+        for i in range(0, len(ids), ADD_BATCH_SIZE):
+            self._vector_store.delete(ids=ids[i:i + ADD_BATCH_SIZE])
+
+    def _index_chunks(self, chunks: List[Document]) -> Dict[str, int]:
+        """
+        Replace the indexed chunks of every source present in chunks.
+
+        Args:
+            chunks: Document chunks with a "source" metadata entry
+
+        Returns:
+            Dictionary with "added" and "deleted" chunk counts
+        """
+        by_source = defaultdict(list)
+        for chunk, chunk_id in zip(chunks, assign_chunk_ids(chunks)):
+            by_source[source_key(chunk.metadata.get("source", ""))].append((chunk, chunk_id))
+
+        counts = {"added": 0, "deleted": 0}
+        for key, entries in by_source.items():
+            result = self._replace_source(key, entries)
+            counts["added"] += result["added"]
+            counts["deleted"] += result["deleted"]
+
+        return counts
+
+    def _replace_source(self, key: str, entries: List[tuple]) -> Dict[str, int]:
+        """
+        Make the indexed chunks of one source match entries.
+
+        Only chunks whose IDs are new are embedded; chunks that disappeared from the source
+        are deleted. The manifest is updated but not saved.
+
+        Args:
+            key: Normalised source path
+            entries: List of (chunk, chunk_id) pairs for the source
+
+        Returns:
+            Dictionary with "added" and "deleted" chunk counts
+        """
+        manifest = self._load_manifest()
+        old_ids = set(manifest["files"].get(key, {}).get("chunk_ids", []))
+        new_ids = [chunk_id for _, chunk_id in entries]
+
+        stale_ids = old_ids - set(new_ids)
+        if stale_ids:
+            self._delete_chunks(stale_ids)
+
+        to_add = [(chunk, chunk_id) for chunk, chunk_id in entries if chunk_id not in old_ids]
+        if to_add:
+            self._add_chunks([chunk for chunk, _ in to_add], [chunk_id for _, chunk_id in to_add])
+
+        entry = {"chunk_ids": new_ids}
+        source_path = Path(key)
+        if source_path.is_file():
+            stat = source_path.stat()
+            entry.update(mtime=stat.st_mtime, size=stat.st_size, sha256=file_sha256(source_path))
+        manifest["files"][key] = entry
+        self._manifest_dirty = True
+
+        return {"added": len(to_add), "deleted": len(stale_ids)}
+
+    def revision(self) -> str:
+        """
+        Get a token that changes whenever the indexed content changes.
+
+        The manifest is rewritten by every build, add and sync that changes the index, in
+        this or any other process, so its modification time identifies the current content.
+
+        Returns:
+            Revision token
+        """
+        try:
+            return str(self.manifest_path.stat().st_mtime_ns)
+        except OSError:
+            return "0"
+
     def get_retriever(self, k: int = 4) -> Chroma:
         """
         Get a retriever from the vector store.
@@ -114,16 +327,106 @@ class VectorStoreService:
         if self._vector_store is None:
             raise ValueError("Vector store not initialized. Call create_vector_store() first.")
 
-        logger.info(f"Adding {len(documents)} new documents to vector store")
+        logger.info("Adding %s new documents to vector store", len(documents))
         chunks = self.split_documents(documents)
 
         try:
-            self._vector_store.add_documents(chunks)
-            logger.info(f"Successfully added {len(chunks)} chunks to vector store")
+            # Deterministic IDs make re-adding a file replace its chunks instead of duplicating them
+            counts = self._index_chunks(chunks)
+            self._save_manifest()
+            logger.info(
+                "Successfully added %s chunks to vector store (%s stale chunks removed)",
+                counts["added"], counts["deleted"]
+            )
         except Exception as e:
-            logger.error(f"Error adding documents to vector store: {e}")
+            logger.error("Error adding documents to vector store: %s", e)
             raise
 
+    def sync(
+        self,
+        file_paths: List[Path],
+        load_file: Callable[[Path], List[Document]],
+        root: Optional[Path] = None
+    ) -> Dict[str, int]:
+        """
+        Incrementally synchronise the vector store with a set of files.
+
+        Files whose size and modification time (or content hash) match the manifest are
+        skipped without being parsed. New and changed files are loaded and only their new
+        chunks are embedded; chunks of changed or removed files are deleted.
+
+        Args:
+            file_paths: Files that should be indexed
+            load_file: Callable that loads a file into documents
+            root: Directory being synced; indexed files under it that are no longer in
+                file_paths are removed
+
+        Returns:
+            Dictionary of file and chunk counts
+        """
+        if self._vector_store is None:
+            self._vector_store = self._open_vector_store()
+
+        manifest = self._load_manifest()
+        counts = dict.fromkeys(
+            ["new_files", "changed_files", "unchanged_files", "removed_files", "failed_files",
+             "chunks_added", "chunks_deleted"],
+            0
+        )
+        seen = set()
+
+        try:
+            for file_path in file_paths:
+                key = source_key(str(file_path))
+                seen.add(key)
+                entry = manifest["files"].get(key)
+
+                try:
+                    # The file may disappear while syncing; that only fails this file
+                    stat = Path(key).stat()
+
+                    if entry and entry.get("mtime") == stat.st_mtime and entry.get("size") == stat.st_size:
+                        counts["unchanged_files"] += 1
+                        continue
+
+                    if entry and entry.get("sha256") == file_sha256(Path(key)):
+                        # Touched but not modified - just refresh the cheap change markers
+                        entry.update(mtime=stat.st_mtime, size=stat.st_size)
+                        self._manifest_dirty = True
+                        counts["unchanged_files"] += 1
+                        continue
+
+                    chunks = self.split_documents(load_file(file_path))
+                except Exception as e:
+                    logger.error("Failed to load %s during sync: %s", file_path, e)
+                    counts["failed_files"] += 1
+                    continue
+
+                for chunk in chunks:
+                    chunk.metadata["source"] = key
+                result = self._replace_source(key, list(zip(chunks, assign_chunk_ids(chunks))))
+
+                counts["changed_files" if entry else "new_files"] += 1
+                counts["chunks_added"] += result["added"]
+                counts["chunks_deleted"] += result["deleted"]
+
+            if root is not None:
+                root_key = source_key(str(root))
+                for key in list(manifest["files"]):
+                    if key not in seen and Path(root_key) in Path(key).parents:
+                        removed_ids = manifest["files"].pop(key).get("chunk_ids", [])
+                        self._delete_chunks(removed_ids)
+                        self._manifest_dirty = True
+                        counts["removed_files"] += 1
+                        counts["chunks_deleted"] += len(removed_ids)
+        finally:
+            # A no-op sync leaves the manifest, and so revision(), untouched
+            if self._manifest_dirty:
+                self._save_manifest()
+
+        logger.info("Sync complete: %s", counts)
+        return counts
+
     def similarity_search(self, query: str, k: int = 4) -> List[Document]:
         """
         Perform similarity search on the vector store.
@@ -140,12 +443,94 @@ class VectorStoreService:
 
         try:
             results = self._vector_store.similarity_search(query, k=k)
-            logger.info(f"Found {len(results)} similar documents for query: {query}")
+            logger.info("Found %s similar documents for query: %s", len(results), query)
             return results
         except Exception as e:
-            logger.error(f"Error performing similarity search: {e}")
+            logger.error("Error performing similarity search: %s", e)
             raise
 
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        Find the chunks nearest to an embedding, with their cosine similarity.
+
+        Similarities are computed from the stored vectors, so they do not depend on the
+        distance function the collection was created with.
+
+        Args:
+            embedding: Query embedding
+            k: Number of results to return
+
+        Returns:
+            List of (document, cosine similarity) pairs, most similar first
+        """
+        return self.similarity_search_by_vectors([embedding], k=k)[0]
+
+    def similarity_search_by_vectors(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Find the chunks nearest to each of several embeddings with a single collection query.
+
+        Args:
+            embeddings: Query embeddings
+            k: Number of results to return per embedding
+
+        Returns:
+            For each embedding, a list of (document, cosine similarity) pairs, most similar first
+        """
+        if self._vector_store is None:
+            raise ValueError("Vector store not initialized. Call create_vector_store() first.")
+        if not embeddings:
+            return []
+
+        with trace_span("retriever", "similarity_search_by_vectors", k=k, queries=len(embeddings)):
+            result = self._vector_store._collection.query(
+                query_embeddings=embeddings,
+                n_results=k,
+                include=["documents", "metadatas", "embeddings"]
+            )
+
+        results = []
+        for i, embedding in enumerate(embeddings):
+            if not result["ids"] or i >= len(result["ids"]) or not result["ids"][i]:
+                results.append([])
+                continue
+            pairs = [
+                (Document(page_content=text or "", metadata=metadata or {}), cosine_similarity(embedding, vector))
+                for text, metadata, vector in zip(
+                    result["documents"][i], result["metadatas"][i], result["embeddings"][i]
+                )
+            ]
+            results.append(sorted(pairs, key=lambda pair: pair[1], reverse=True))
+        return results
+
+    def similarity_search_batch(self, queries: List[str], k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """
+        Search for several queries at once: one batched embedding call and one collection query.
+
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+
+        Returns:
+            For each query, a list of (document, cosine similarity) pairs, most similar first
+        """
+        if self._vector_store is None:
+            raise ValueError("Vector store not initialized. Call create_vector_store() first.")
+        if not queries:
+            return []
+
+        if hasattr(self.embeddings, "embed_queries"):
+            vectors = self.embeddings.embed_queries(queries)
+        else:
+            vectors = [self.embeddings.embed_query(query) for query in queries]
+
+        results = self.similarity_search_by_vectors(vectors, k=k)
+        logger.info("Searched %s queries, %s results", len(queries), sum(len(result) for result in results))
+        return results
+
     def get_collection_info(self) -> dict:
         """
         Get information about the vector store collection.
@@ -162,8 +547,8 @@ class VectorStoreService:
             return {
                 "total_documents": count,
                 "vector_store_path": str(self.vector_store_path),
-                "embedding_model": "models/embedding-001"
+                "embedding_model": settings.embedding_model
             }
         except Exception as e:
-            logger.error(f"Error getting collection info: {e}")
+            logger.error("Error getting collection info: %s", e)
             raise
\ No newline at end of file
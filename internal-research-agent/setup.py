@@ -12,6 +12,7 @@ setup(
         "langchain-google-genai>=0.0.6",
         "langchain-chroma>=0.2.4",
         "langchain-tavily>=0.1.0",
+        "langgraph>=0.1.0",
         "chromadb>=0.4.22",
         "tavily-python>=0.3.1",
         "python-dotenv>=1.0.0",
@@ -0,0 +1,11 @@
+"""Shared test setup: make the project packages importable and settings loadable offline."""
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Settings require API keys; nothing in the tests talks to the real services
+for key in ("GEMINI_API_KEY", "GOOGLE_API_KEY", "TAVILY_API_KEY"):
+    os.environ.setdefault(key, "test")
@@ -0,0 +1,77 @@
+"""Tests for bulk question answering and its resumable checkpoint."""
+import asyncio
+import json
+
+import pytest
+
+from ira_cli.batch import load_checkpoint, load_questions, run_batch
+
+
+def write_lines(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_load_questions_accepts_objects_and_strings(tmp_path):
+    path = tmp_path / "questions.jsonl"
+    write_lines(path, ['{"id": "a", "question": " Leave policy? "}', "", '"Remote work?"'])
+
+    assert load_questions(str(path)) == [
+        {"id": "a", "question": "Leave policy?"},
+        {"id": "3", "question": "Remote work?"},
+    ]
+
+
+@pytest.mark.parametrize("line, message", [
+    ("{not json", "invalid JSON"),
+    ('{"id": "a"}', "expected a question"),
+])
+def test_load_questions_rejects_bad_lines(tmp_path, line, message):
+    path = tmp_path / "questions.jsonl"
+    write_lines(path, [line])
+
+    with pytest.raises(ValueError, match=message):
+        load_questions(str(path))
+
+
+def test_load_questions_rejects_duplicate_ids(tmp_path):
+    path = tmp_path / "questions.jsonl"
+    write_lines(path, ['{"id": "a", "question": "x"}', '{"id": "a", "question": "y"}'])
+
+    with pytest.raises(ValueError, match="duplicate id"):
+        load_questions(str(path))
+
+
+def test_load_checkpoint_skips_truncated_line_and_errors(tmp_path):
+    path = tmp_path / "answers.jsonl"
+    path.write_text('{"id": "a"}\n{"id": "b", "error": "Boom"}\n{"id": "tru', encoding="utf-8")
+
+    assert load_checkpoint(str(path)) == {"a", "b"}
+    assert load_checkpoint(str(path), retry_errors=True) == {"a"}
+    assert load_checkpoint(str(tmp_path / "missing.jsonl")) == set()
+
+
+def test_run_batch_resumes_after_truncated_record(tmp_path):
+    out = tmp_path / "answers.jsonl"
+    out.write_text('{"id": "a", "answer": "old"}\n{"id": "trunc', encoding="utf-8")
+    questions = [{"id": "a", "question": "qa"}, {"id": "new", "question": "qn"}, {"id": "bad", "question": "qb"}]
+
+    def query(question):
+        if question == "qb":
+            raise RuntimeError("model unavailable")
+        return {"output": f"answer to {question}", "route": "rag"}
+
+    done = load_checkpoint(str(out))
+    pending = [item for item in questions if item["id"] not in done]
+    records = asyncio.run(run_batch(query, pending, str(out), concurrency=2))
+
+    assert sorted(record["id"] for record in records) == ["bad", "new"]
+    written = read_records(out)
+    assert [record["id"] for record in written][0] == "a"
+    new = next(record for record in written if record["id"] == "new")
+    assert new["answer"] == "answer to qn" and new["tools"] == ["InternalDocumentsRAG"]
+    assert next(record for record in written if record["id"] == "bad")["error"].startswith("RuntimeError")
+    assert load_checkpoint(str(out), retry_errors=True) == {"a", "new"}
@@ -0,0 +1,17 @@
+"""`ira --help` must start quickly and without the heavy agent dependencies."""
+import statistics
+
+from benchmarks.cli_startup import HEAVY_MODULES, heavy_imports, time_command
+
+BUDGET_MS = 300.0
+
+
+def test_help_is_within_budget_without_api_keys():
+    # time_command runs with the API keys removed and fails if the command exits non-zero
+    median_ms = statistics.median(time_command(["--help"], runs=5)) * 1000
+
+    assert median_ms <= BUDGET_MS, f"ira --help took {median_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+
+def test_cli_import_skips_heavy_modules():
+    assert heavy_imports() == [], f"importing ira_cli.cli loads some of {HEAVY_MODULES}"
@@ -0,0 +1,50 @@
+"""Tests for the resident agent daemon."""
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+from ira_cli.config import default_socket_path
+from ira_cli.daemon import AgentDaemon, DaemonClient
+
+from tests.conftest import project_root
+
+
+def test_default_socket_path_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert default_socket_path() == str(tmp_path / "ira.sock")
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert default_socket_path() == str(tmp_path / ".cache" / "ira" / "ira.sock")
+
+
+def test_socket_is_private_to_the_user(tmp_path):
+    socket_path = tmp_path / "run" / "ira.sock"
+    daemon = AgentDaemon(agent=None, socket_path=str(socket_path))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+
+    client = DaemonClient(str(socket_path), timeout=5.0)
+    deadline = time.monotonic() + 5
+    while not client.is_running():
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.02)
+
+    try:
+        assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+        assert stat.S_IMODE(socket_path.parent.stat().st_mode) == 0o700
+    finally:
+        client.request("shutdown")
+        thread.join(timeout=5)
+    assert not socket_path.exists()
+
+
+def test_import_does_not_load_settings():
+    code = (
+        "import ira_cli.daemon\n"
+        "from ira_cli.config import get_settings\n"
+        "assert get_settings.cache_info().currsize == 0\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=project_root, check=True)
@@ -0,0 +1,49 @@
+"""Tests for parallel document loading."""
+from pathlib import Path
+
+import services.document_loader as document_loader
+from services.document_loader import DocumentLoader
+
+
+def write_docs(root, count):
+    root.mkdir(exist_ok=True)
+    for i in range(count):
+        # Larger files first, so parallel workers finish out of order
+        (root / f"doc{i:02d}.txt").write_text(f"Document {i}. " * (2000 * (count - i)), encoding="utf-8")
+    return root
+
+
+def loaded_names(loader, paths, **kwargs):
+    return [path.name for path, _ in loader.iter_loaded_files(paths, **kwargs)]
+
+
+def test_parallel_load_yields_every_file(tmp_path):
+    loader = DocumentLoader(str(write_docs(tmp_path / "docs", 8)), max_workers=4)
+    paths = loader.get_supported_files()
+
+    assert sorted(loaded_names(loader, paths)) == [f"doc{i:02d}.txt" for i in range(8)]
+
+
+def test_load_documents_is_in_file_order(tmp_path):
+    loader = DocumentLoader(str(write_docs(tmp_path / "docs", 8)), max_workers=4)
+
+    sources = [Path(doc.metadata["source"]).name for doc in loader.load_documents()]
+    assert sources == [f"doc{i:02d}.txt" for i in range(8)]
+
+
+def test_few_files_load_in_process(tmp_path, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a process pool was started")
+
+    monkeypatch.setattr(document_loader, "ProcessPoolExecutor", no_pool)
+    loader = DocumentLoader(str(write_docs(tmp_path / "docs", 3)), max_workers=0)
+
+    assert loaded_names(loader, loader.get_supported_files()) == ["doc00.txt", "doc01.txt", "doc02.txt"]
+
+
+def test_failed_file_is_skipped(tmp_path):
+    docs = write_docs(tmp_path / "docs", 5)
+    loader = DocumentLoader(str(docs), max_workers=2)
+    paths = loader.get_supported_files()
+
+    assert sorted(loaded_names(loader, paths[:2] + [docs / "missing.txt"] + paths[2:])) == [path.name for path in paths]
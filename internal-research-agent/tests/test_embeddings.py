@@ -0,0 +1,69 @@
+"""Tests for the cached, batched embedding wrapper."""
+import threading
+
+from langchain_core.embeddings import Embeddings
+
+from ira_cli.config import settings
+from services.embeddings import CachedBatchEmbeddings, create_embeddings
+
+
+def test_endpoint_and_gemini_do_not_share_cache_keys(monkeypatch):
+    monkeypatch.setattr(settings, "embedding_cache_path", "")
+    monkeypatch.setattr(settings, "embedding_endpoint", "http://127.0.0.1:1")
+    endpoint = create_embeddings()
+    monkeypatch.setattr(settings, "embedding_endpoint", None)
+    gemini = create_embeddings()
+
+    assert endpoint.model_name == "http:http://127.0.0.1:1"
+    assert endpoint._key("query", "leave policy") != gemini._key("query", "leave policy")
+
+
+class TaskTypeEmbeddings(Embeddings):
+    """Task-aware fake that records the task type of every call."""
+
+    def __init__(self):
+        self.task_types = []
+
+    def embed_documents(self, texts, task_type=None):
+        self.task_types.append(("documents", task_type))
+        return [[float(len(text)), 1.0 if task_type == "RETRIEVAL_QUERY" else 0.0] for text in texts]
+
+    def embed_query(self, text, task_type=None):
+        self.task_types.append(("query", task_type))
+        return [float(len(text)), 1.0 if task_type == "RETRIEVAL_QUERY" else 0.0]
+
+
+def test_single_and_batched_queries_use_the_same_task_type(tmp_path):
+    base = TaskTypeEmbeddings()
+    embeddings = CachedBatchEmbeddings(base, model_name="fake", cache_path=str(tmp_path / "cache.sqlite"))
+
+    single = embeddings.embed_query("leave policy")
+    batched = CachedBatchEmbeddings(base, model_name="fake").embed_queries(["leave policy", "remote work"])
+
+    assert base.task_types == [("query", "RETRIEVAL_QUERY"), ("documents", "RETRIEVAL_QUERY")]
+    assert batched[0] == single
+    # The batch reuses cached single-query vectors and embeds only the rest
+    assert embeddings.embed_queries(["leave policy", "remote work"]) == batched
+    assert base.task_types[-1] == ("documents", "RETRIEVAL_QUERY")
+    assert embeddings.cache_hits == 1
+
+
+def test_cache_hits_are_counted_exactly_across_threads(tmp_path):
+    embeddings = CachedBatchEmbeddings(TaskTypeEmbeddings(), model_name="fake", cache_path=str(tmp_path / "cache.sqlite"))
+    texts = [f"text {i}" for i in range(20)]
+    embeddings.embed_documents(texts)
+    embeddings.embed_query("leave policy")
+    embeddings.cache_hits = 0
+
+    def work():
+        for _ in range(25):
+            embeddings.embed_documents(texts)
+            embeddings.embed_query("leave policy")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert embeddings.cache_hits == 8 * 25 * (len(texts) + 1)
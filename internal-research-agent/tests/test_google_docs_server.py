@@ -0,0 +1,110 @@
+"""Tests for GoogleDocsMCPServer against the in-memory Google services fake."""
+import pytest
+
+from benchmarks.fake_google_services import FakeBatchRequest, FakeGoogleService, make_folder
+from mcp_server.google_docs_server import GoogleDocsMCPServer
+
+
+class FailingBatchRequest(FakeBatchRequest):
+    """Batch that fails as a whole when it contains a poisoned document."""
+
+    def execute(self, http=None) -> None:
+        if any(request_id in self.service.poisoned for request_id, _, _ in self.requests):
+            raise ConnectionError("batch connection reset")
+        super().execute(http)
+
+
+class FlakyGoogleService(FakeGoogleService):
+    """Fake service whose batches fail when they include a poisoned document."""
+
+    def __init__(self, documents, poisoned):
+        super().__init__(documents, latency=0)
+        self.poisoned = set(poisoned)
+
+    def new_batch_http_request(self, callback=None):
+        return FailingBatchRequest(self, callback)
+
+
+@pytest.fixture
+def make_server(tmp_path, monkeypatch):
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS", raising=False)
+    monkeypatch.setenv("GOOGLE_DOCS_BATCH_SIZE", "50")
+
+    def make(service):
+        server = GoogleDocsMCPServer(
+            credentials_path="", folder_id="fake-folder", cache_path=str(tmp_path / "cache.json"), list_ttl=0
+        )
+        server.drive_service = service
+        server.docs_service = service
+        return server
+
+    return make
+
+
+def test_failed_batch_only_fails_its_own_documents(make_server):
+    folder = make_folder(120, paragraphs=2)
+    ids = sorted(folder)
+    server = make_server(FlakyGoogleService(folder, poisoned=[ids[60]]))
+
+    results = server.fetch_documents_content(ids)
+
+    failed = [doc_id for doc_id in ids if isinstance(results[doc_id], Exception)]
+    assert failed == ids[50:100]
+    assert all("Paragraph 0" in results[doc_id] for doc_id in ids[:50] + ids[100:])
+
+
+def test_cached_content_reports_errors_per_document(make_server):
+    folder = make_folder(120, paragraphs=2)
+    ids = sorted(folder)
+    server = make_server(FlakyGoogleService(folder, poisoned=[ids[0]]))
+
+    documents = server.get_documents_in_folder()
+    contents = dict(zip([doc["id"] for doc in documents], server.get_cached_documents_content(documents)))
+
+    assert sum(content.startswith("Error") for content in contents.values()) == 50
+    assert len(server._content_cache) == 70
+
+
+def test_listing_failure_keeps_listing_and_cache(make_server):
+    service = FakeGoogleService(make_folder(10, paragraphs=2), latency=0)
+    server = make_server(service)
+    documents = server.list_documents_cached()
+    server.get_cached_documents_content(documents)
+    listing_time = server._listing_time
+
+    def fail(**kwargs):
+        raise ConnectionError("drive unavailable")
+
+    service.list = fail
+    assert server.list_documents_cached(force_refresh=True) == documents
+    assert len(server._content_cache) == 10
+    assert server._listing_time == listing_time
+
+    server.save_cache()
+    reloaded = make_server(FakeGoogleService({}, latency=0))
+    assert len(reloaded._content_cache) == 10
+
+
+def nested_table(text, depth):
+    """A table whose single cell holds text, wrapped in depth - 1 further tables."""
+    content = [{"paragraph": {"elements": [{"textRun": {"content": text}}]}}]
+    for _ in range(depth):
+        content = [{"table": {"rows": 1, "columns": 1, "tableRows": [{"tableCells": [{"content": content}]}]}}]
+    return content[0]
+
+
+def test_deeply_nested_tables_are_fetched_in_full(make_server):
+    folder = make_folder(2, paragraphs=1)
+    ids = sorted(folder)
+    folder[ids[0]]["document"]["body"]["content"].append(nested_table("shallow cell\n", 2))
+    folder[ids[1]]["document"]["body"]["content"].append(nested_table("deep cell\n", 4))
+    service = FakeGoogleService(folder, latency=0)
+    server = make_server(service)
+
+    results = server.fetch_documents_content(ids)
+
+    assert "shallow cell" in results[ids[0]]
+    assert "deep cell" in results[ids[1]]
+    # One batch plus a full fetch of the document with the deep table
+    assert service.round_trips == 2
+    assert "deep cell" in server.fetch_document_content(ids[1])
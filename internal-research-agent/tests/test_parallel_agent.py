@@ -0,0 +1,26 @@
+"""Tests for the plan-and-execute agent, using the benchmark fakes."""
+import asyncio
+
+from agents.parallel_agent import ParallelToolAgent
+from ira_cli.bench import FakeChatModel, make_fake_tools
+
+
+def make_agent():
+    tools = make_fake_tools()
+    return ParallelToolAgent(FakeChatModel(tool_names=[tool.name for tool in tools]), tools)
+
+
+def test_invoke_runs_every_planned_tool():
+    result = make_agent().invoke("What is the leave policy?")
+
+    assert sorted(call["tool"] for call in result["tool_calls"]) == ["WebSearch", "google_docs_mcp"]
+    assert result["output"] == "Benchmark answer to What is the leave policy?"
+
+
+def test_invoke_works_inside_a_running_event_loop():
+    agent = make_agent()
+
+    async def caller():
+        return agent.invoke("What is the leave policy?")
+
+    assert asyncio.run(caller())["output"] == "Benchmark answer to What is the leave policy?"
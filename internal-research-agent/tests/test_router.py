@@ -0,0 +1,49 @@
+"""Tests for the embedding-based query router, using fake embeddings."""
+from langchain.schema import Document
+
+from agents.router import AGENT_ROUTE, RAG_ROUTE, QueryRouter
+from ira_cli.bench import FakeEmbeddings, make_vector_store
+
+EXEMPLARS = {
+    "InternalDocumentsRAG": ["annual leave days policy"],
+    "WebSearch": ["latest football match score"],
+}
+
+
+def make_router(tmp_path, **kwargs):
+    service = make_vector_store(tmp_path / "store", FakeEmbeddings())
+    service.create_vector_store([Document(page_content="annual leave days policy", metadata={"source": "leave.txt"})])
+    return QueryRouter(service, exemplars=EXEMPLARS, corpus_threshold=0.7, margin=0.05, **kwargs)
+
+
+def test_routes_internal_questions_to_rag(tmp_path):
+    router = make_router(tmp_path)
+
+    assert router.route("annual leave days policy").route == RAG_ROUTE
+    assert router.route("latest football match score").route == AGENT_ROUTE
+
+
+def test_exemplars_are_embedded_in_one_request(tmp_path):
+    router = make_router(tmp_path)
+    before = router.embeddings.api_calls
+
+    router._get_exemplar_vectors()
+
+    assert router.embeddings.api_calls - before == 1
+    assert set(router._get_exemplar_vectors()) == set(EXEMPLARS)
+
+
+def test_decision_log_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    router = make_router(tmp_path)
+    router.route("annual leave days policy")
+
+    assert router.log_path is None
+    assert not (tmp_path / ".cache").exists()
+
+
+def test_decision_log_when_configured(tmp_path):
+    log_path = tmp_path / "routing.jsonl"
+    make_router(tmp_path, log_path=str(log_path)).route("annual leave days policy")
+
+    assert '"question": "annual leave days policy"' in log_path.read_text(encoding="utf-8")
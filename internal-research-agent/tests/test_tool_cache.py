@@ -0,0 +1,51 @@
+"""Tests for the tool result cache."""
+import asyncio
+
+from langchain.tools import Tool
+
+from services.tool_cache import ToolResultCache
+
+
+def make_cache(**kwargs):
+    return ToolResultCache(max_entries=8, default_ttl=60, ttls={}, persist_path="", **kwargs)
+
+
+def test_wrap_serves_repeated_inputs_from_cache():
+    calls = []
+    cache = make_cache()
+    search = cache.wrap("WebSearch", lambda query: calls.append(query) or f"result for {query}")
+
+    assert search("Leave  Policy") == search("leave policy") == "result for Leave  Policy"
+    assert calls == ["Leave  Policy"]
+    assert cache.stats()["tools"]["WebSearch"] == {"hits": 1, "misses": 1}
+
+
+def test_errors_are_not_cached():
+    cache = make_cache()
+    failing = cache.wrap("WebSearch", lambda query: "Error: quota exceeded")
+
+    failing("leave policy")
+    failing("leave policy")
+    assert cache.stats()["hits"] == 0
+
+
+def test_async_tool_path_stays_async_and_shares_the_cache():
+    cache = make_cache()
+    calls = []
+
+    def run(query):
+        calls.append(("sync", query))
+        return f"docs for {query}"
+
+    async def arun(query):
+        calls.append(("async", query))
+        return f"docs for {query}"
+
+    tool = Tool(
+        name="google_docs_mcp", description="Insurance documents",
+        func=cache.wrap("google_docs_mcp", run), coroutine=cache.awrap("google_docs_mcp", arun)
+    )
+
+    assert asyncio.run(tool.ainvoke("claims")) == "docs for claims"
+    assert tool.invoke("claims") == "docs for claims"
+    assert calls == [("async", "claims")]
@@ -0,0 +1,48 @@
+"""Tests for query traces and their JSONL/Prometheus export."""
+import json
+
+from utils.tracing import TraceExporter, start_trace, trace_span
+
+
+def record_trace(question="What is the leave policy?"):
+    with start_trace(question) as trace:
+        with trace_span("retriever", "similarity_search", k=4):
+            pass
+        trace.add_span("tool", "WebSearch", 12.5, input=question)
+    return trace
+
+
+def read_traces(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_export_drops_question_text_by_default(tmp_path):
+    exporter = TraceExporter(str(tmp_path / "traces.jsonl"))
+    exporter.export(record_trace())
+
+    [record] = read_traces(tmp_path / "traces.jsonl")
+    assert record["question"] is None
+    assert "leave policy" not in json.dumps(record)
+    assert record["totals"]["tool_calls"] == 1
+
+
+def test_export_keeps_text_when_enabled(tmp_path):
+    exporter = TraceExporter(str(tmp_path / "traces.jsonl"), include_text=True)
+    exporter.export(record_trace())
+
+    [record] = read_traces(tmp_path / "traces.jsonl")
+    assert record["question"] == "What is the leave policy?"
+
+
+def test_metrics_accumulate_across_exporters(tmp_path):
+    metrics = tmp_path / "metrics.prom"
+    first = TraceExporter(prometheus_path=str(metrics))
+    first.export(record_trace())
+    first.export(record_trace())
+    # Another process (here: exporter) writing the state is picked up, not overwritten
+    TraceExporter(prometheus_path=str(metrics)).export(record_trace())
+    first.export(record_trace())
+
+    state = json.loads(metrics.with_suffix(".state.json").read_text(encoding="utf-8"))
+    assert state["duration_count"] == 4
+    assert state["tool_calls"] == {"WebSearch": 4}
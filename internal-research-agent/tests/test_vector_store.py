@@ -0,0 +1,76 @@
+"""Tests for incremental vector store sync and multi-query search, using fake embeddings."""
+from langchain.schema import Document
+
+from ira_cli.bench import FakeEmbeddings, make_vector_store
+
+
+def write_files(root, count):
+    root.mkdir(exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = root / f"policy{i}.txt"
+        path.write_text(f"Policy {i} covers annual leave, remote work and expense limit {i}.", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def load_file(path):
+    return [Document(page_content=path.read_text(encoding="utf-8"), metadata={"source": str(path)})]
+
+
+def collection_size(service):
+    return len(service._vector_store.get()["ids"])
+
+
+def test_noop_sync_leaves_revision_unchanged(tmp_path):
+    paths = write_files(tmp_path / "docs", 3)
+    service = make_vector_store(tmp_path / "store", FakeEmbeddings())
+
+    first = service.sync(paths, load_file, root=tmp_path / "docs")
+    revision = service.revision()
+    second = service.sync(paths, load_file, root=tmp_path / "docs")
+
+    assert first["new_files"] == 3
+    assert second["unchanged_files"] == 3 and second["chunks_added"] == 0
+    assert service.revision() == revision
+
+
+def test_missing_file_only_fails_that_file(tmp_path):
+    paths = write_files(tmp_path / "docs", 3)
+    service = make_vector_store(tmp_path / "store", FakeEmbeddings())
+
+    counts = service.sync(paths + [tmp_path / "docs" / "deleted.txt"], load_file)
+
+    assert counts["new_files"] == 3 and counts["failed_files"] == 1
+
+
+def test_sync_of_store_without_manifest_does_not_duplicate_chunks(tmp_path):
+    paths = write_files(tmp_path / "docs", 3)
+    legacy = make_vector_store(tmp_path / "store", FakeEmbeddings())
+    # Stores built before manifests existed used random chunk IDs and no manifest
+    legacy._open_vector_store().add_documents([doc for path in paths for doc in load_file(path)])
+
+    service = make_vector_store(tmp_path / "store", FakeEmbeddings())
+    service.create_vector_store([])
+    service.sync(paths, load_file)
+
+    assert collection_size(service) == 3
+    assert service.manifest_path.exists()
+
+
+
+def test_batch_search_matches_single_searches(tmp_path):
+    embeddings = FakeEmbeddings()
+    service = make_vector_store(tmp_path / "store", embeddings)
+    service.sync(write_files(tmp_path / "docs", 5), load_file)
+    queries = ["annual leave", "expense limit 3", "annual leave"]
+
+    requests = embeddings.requests
+    results = service.similarity_search_batch(queries, k=2)
+
+    assert embeddings.requests == requests + 1
+    assert [len(pairs) for pairs in results] == [2, 2, 2]
+    for query, pairs in zip(queries, results):
+        single = service.similarity_search_by_vector(embeddings.embed_query(query), k=2)
+        assert [(doc.page_content, round(score, 6)) for doc, score in pairs] == \
+            [(doc.page_content, round(score, 6)) for doc, score in single]
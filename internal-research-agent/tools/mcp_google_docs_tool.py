@@ -2,16 +2,12 @@
 MCP Google Docs Tool for integration with existing LangChain agent
 Following the approach from: https://cobusgreyling.medium.com/using-langchain-with-model-context-protocol-mcp-e89b87ee3c4c
 """
-import asyncio
-import os
 from pathlib import Path
 from typing import Optional
 
 from langchain.tools import BaseTool
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-from langchain_mcp_adapters.tools import load_mcp_tools
 
+from tools.mcp_session import MCPSessionManager
 from utils.logger import logger
 
 
@@ -19,51 +15,41 @@ class MCPGoogleDocsTool(BaseTool):
     """Tool for connecting to Google Docs MCP Server."""
 
     name: str = "google_docs_mcp"
-    description: str = "Access Google Docs data from a specified folder. Use this tool to get insurance-related documents, policy information, claims procedures, and other company documents stored in Google Docs."
+    description: str = "Search Google Docs from a specified folder. Use this tool to find insurance-related documents, policy information, claims procedures, and other company documents stored in Google Docs. Input should be a specific question or search terms; the most relevant passages are returned."
     mcp_server_path: Optional[str] = None
-    _mcp_tools: Optional[list] = None
+    k: int = 5
+    _session_manager: Optional[MCPSessionManager] = None
 
-    def __init__(self, mcp_server_path: Optional[str] = None, **kwargs):
+    def __init__(self, mcp_server_path: Optional[str] = None, k: int = 5, **kwargs):
         """
         Initialize the MCP Google Docs tool.
 
         Args:
             mcp_server_path: Path to the MCP server script
+            k: Number of passages to retrieve per query
         """
         if mcp_server_path is None:
             mcp_server_path = self._get_default_server_path()
-        super().__init__(mcp_server_path=mcp_server_path, **kwargs)
+        super().__init__(mcp_server_path=mcp_server_path, k=k, **kwargs)
+
+    def _get_session_manager(self) -> MCPSessionManager:
+        """Get the shared long-lived MCP session, creating it on first use."""
+        if self._session_manager is None:
+            self._session_manager = MCPSessionManager(self.mcp_server_path)
+        return self._session_manager
+
+    @staticmethod
+    def _format_result(result) -> str:
+        """Join the text content of an MCP tool result."""
+        if not result.content:
+            return ""
+        return "\n".join(getattr(item, "text", str(item)) for item in result.content)
 
     def _get_default_server_path(self) -> str:
         """Get the default path to the MCP server script."""
         project_root = Path(__file__).parent.parent
         return str(project_root / "mcp_server" / "google_docs_server.py")
 
-    async def _load_mcp_tools(self):
-        """Load tools from the MCP server."""
-        try:
-            print(f"Loading MCP tools from {self.mcp_server_path}")
-            # Create server parameters for stdio connection
-            server_params = StdioServerParameters(
-                command="python",
-                args=[self.mcp_server_path],
-            )
-
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    # Initialize the connection
-                    await session.initialize()
-
-                    # Get tools from the MCP server
-                    mcp_tools = await load_mcp_tools(session)
-                    logger.info(f"Loaded {len(mcp_tools)} tools from MCP server")
-
-                    return mcp_tools
-
-        except Exception as e:
-            logger.error(f"Error loading MCP tools: {e}")
-            return []
-
     def _run(self, query: str) -> str:
         """
         Run the MCP Google Docs tool.
@@ -75,20 +61,22 @@ class MCPGoogleDocsTool(BaseTool):
             Tool output
         """
         try:
-            # Run the async function in a new event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            logger.info("Processing insurance query: %s", query)
 
-            try:
-                return loop.run_until_complete(self._run_async(query))
-            finally:
-                loop.close()
+            # Reuse the persistent session rather than spawning a server per call,
+            # and retrieve only the relevant passages rather than whole documents
+            result = self._get_session_manager().call_tool(
+                "search_insurance_documents", {"query": query, "k": self.k}
+            )
+            content = self._format_result(result)
+            logger.info("Tool execution completed, result length: %s", len(content))
+            return content
 
         except Exception as e:
-            logger.error(f"MCP Google Docs Tool error: {e}")
+            logger.error("MCP Google Docs Tool error: %s", e)
             return f"Error: {str(e)}"
 
-    async def _run_async(self, query: str) -> str:
+    async def _arun(self, query: str) -> str:
         """
         Run the MCP Google Docs tool asynchronously.
 
@@ -99,42 +87,28 @@ class MCPGoogleDocsTool(BaseTool):
             Tool output
         """
         try:
-            logger.info(f"Processing insurance query: {query}")
-
-            # Create a fresh connection and execute the tool directly
-            server_params = StdioServerParameters(
-                command="python",
-                args=[self.mcp_server_path],
+            logger.info("Processing insurance query: %s", query)
+            result = await self._get_session_manager().acall_tool(
+                "search_insurance_documents", {"query": query, "k": self.k}
             )
-
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    # Initialize the connection
-                    await session.initialize()
-
-                    # Call the tool directly
-                    logger.info("Calling get_insurance_documents tool directly...")
-                    result = await session.call_tool("get_insurance_documents", {})
-                    logger.info("Tool execution completed successfully")
-                    logger.info(f"Result content length: {len(result.content) if result.content else 0}")
-                    logger.info(f"Result preview: {result.content[:200] if result.content else 'None'}...")
-                    return result.content
+            return self._format_result(result)
 
         except Exception as e:
-            logger.error(f"Error in async MCP tool execution: {e}")
+            logger.error("Error in async MCP tool execution: %s", e)
             import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            logger.error("Full traceback: %s", traceback.format_exc())
             return f"Error: {str(e)}"
 
 
-def create_mcp_google_docs_tool(mcp_server_path: Optional[str] = None) -> MCPGoogleDocsTool:
+def create_mcp_google_docs_tool(mcp_server_path: Optional[str] = None, k: int = 5) -> MCPGoogleDocsTool:
     """
     Create an MCP Google Docs tool instance.
 
     Args:
         mcp_server_path: Path to the MCP server script
+        k: Number of passages to retrieve per query
 
     Returns:
         Configured MCP Google Docs tool
     """
-    return MCPGoogleDocsTool(mcp_server_path=mcp_server_path)
\ No newline at end of file
+    return MCPGoogleDocsTool(mcp_server_path=mcp_server_path, k=k)
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Persistent MCP client session for the Internal Research Agent tools.
+
+Keeps one MCP server subprocess and client session alive on a background event loop
+thread, so tool calls reuse the connection instead of paying interpreter start-up,
+imports, the MCP handshake and Google API authentication on every call.
+"""
+import asyncio
+import atexit
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from utils.logger import logger
+
+
+class MCPSessionManager:
+    """Long-lived MCP client session with health checks and automatic restart."""
+
+    def __init__(
+        self,
+        server_path: str,
+        command: str = "python",
+        startup_timeout: float = 60.0,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 5.0
+    ):
+        """
+        Initialize the session manager. The server is started lazily on first use.
+
+        Args:
+            server_path: Path to the MCP server script
+            command: Interpreter used to launch the server
+            startup_timeout: Seconds to wait for the server handshake
+            health_check_interval: Seconds of idleness after which the session is pinged before use
+            ping_timeout: Seconds to wait for a ping response
+        """
+        self.server_params = StdioServerParameters(command=command, args=[server_path])
+        self.startup_timeout = startup_timeout
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+
+        self._session: Optional[ClientSession] = None
+        self._session_task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._last_used = 0.0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-session", daemon=True)
+        self._thread.start()
+        self._lock = self._submit(self._create_lock()).result()
+        atexit.register(self.close)
+
+    def _submit(self, coro):
+        """Schedule a coroutine on the background loop and return a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _create_lock(self) -> asyncio.Lock:
+        """Create the session lock on the background loop."""
+        return asyncio.Lock()
+
+    async def _run_session(self, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        """Own the stdio transport and client session for their whole lifetime in one task."""
+        try:
+            async with stdio_client(self.server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    ready.set_result(session)
+                    await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning("MCP session ended unexpectedly: %s", e)
+
+    async def _connect(self) -> ClientSession:
+        """Start the MCP server and wait for the handshake to complete."""
+        logger.info("Starting MCP session for %s", self.server_params.args[0])
+        ready = self._loop.create_future()
+        self._stop_event = asyncio.Event()
+        self._session_task = self._loop.create_task(self._run_session(ready, self._stop_event))
+        self._session = await asyncio.wait_for(ready, timeout=self.startup_timeout)
+        self._last_used = time.monotonic()
+        logger.info("MCP session established")
+        return self._session
+
+    async def _disconnect(self) -> None:
+        """Shut down the current session and server subprocess, if any."""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._session_task is not None:
+            try:
+                await asyncio.wait_for(self._session_task, timeout=10.0)
+            except Exception as e:
+                logger.warning("Error closing MCP session: %s", e)
+                self._session_task.cancel()
+        self._session = None
+        self._session_task = None
+        self._stop_event = None
+
+    async def _healthy(self) -> bool:
+        """Check that the session is alive, pinging it if it has been idle."""
+        if self._session is None or self._session_task is None or self._session_task.done():
+            return False
+
+        if time.monotonic() - self._last_used < self.health_check_interval:
+            return True
+
+        try:
+            await asyncio.wait_for(self._session.send_ping(), timeout=self.ping_timeout)
+            return True
+        except Exception as e:
+            logger.warning("MCP session health check failed: %s", e)
+            return False
+
+    async def _ensure_session(self) -> ClientSession:
+        """Return a healthy session, restarting the server if needed."""
+        if not await self._healthy():
+            await self._disconnect()
+            await self._connect()
+        return self._session
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call an MCP tool, restarting the session and retrying once on failure."""
+        async with self._lock:
+            for attempt in range(2):
+                session = await self._ensure_session()
+                try:
+                    result = await session.call_tool(name, arguments)
+                    self._last_used = time.monotonic()
+                    return result
+                except Exception as e:
+                    if attempt == 1:
+                        raise
+                    logger.warning("MCP tool call failed, restarting session: %s", e)
+                    await self._disconnect()
+
+    def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Call a tool on the MCP server from synchronous code.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+            timeout: Seconds to wait for the result (None waits indefinitely)
+
+        Returns:
+            MCP CallToolResult
+        """
+        return self._submit(self._call_tool(name, arguments or {})).result(timeout=timeout)
+
+    async def acall_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a tool on the MCP server from any event loop.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+
+        Returns:
+            MCP CallToolResult
+        """
+        return await asyncio.wrap_future(self._submit(self._call_tool(name, arguments or {})))
+
+    def close(self) -> None:
+        """Stop the MCP server and the background event loop."""
+        if not self._loop.is_running():
+            return
+        try:
+            self._submit(self._disconnect()).result(timeout=15.0)
+        except Exception as e:
+            logger.warning("Error shutting down MCP session: %s", e)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5.0)
@@ -2,6 +2,6 @@
 Utility modules for the Internal Research Agent.
 """
 
-from .logger import logger, setup_logger
+from .logger import SAMPLED, JSONFormatter, SamplingFilter, logger, setup_logger, shutdown_logging
 
-__all__ = ["logger", "setup_logger"]
\ No newline at end of file
+__all__ = ["SAMPLED", "JSONFormatter", "SamplingFilter", "logger", "setup_logger", "shutdown_logging"]
\ No newline at end of file
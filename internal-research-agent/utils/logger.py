@@ -1,17 +1,116 @@
 """
 Logging configuration for the Internal Research Agent.
+
+Log calls only enqueue the record; a background QueueListener thread does the slow part
+(Rich rendering, file writes). Messages use lazy %-style arguments, so filtered-out
+records are never formatted, and repetitive per-document messages can be sampled.
 """
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
-from typing import Optional
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
 from rich.logging import RichHandler
 from rich.console import Console
 
+# Pass as extra= on per-document messages so SamplingFilter may thin them out
+SAMPLED = {"sample": True}
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listeners: Dict[str, QueueListener] = {}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as single-line JSON objects, including any extra= fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "sample":
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Thin out records logged with extra=SAMPLED.
+
+    For each message template the first `burst` records pass, then one in every `every`.
+    Records without the flag, and anything at WARNING or above, always pass.
+    """
+
+    def __init__(self, every: int = 100, burst: int = 10):
+        """
+        Initialize the filter.
+
+        Args:
+            every: Keep one in this many records after the burst (1 keeps all)
+            burst: Records of each template always kept
+        """
+        super().__init__()
+        self.every = max(1, every)
+        self.burst = burst
+        self._counts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sample", False) or record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        if count <= self.burst:
+            return True
+        return (count - self.burst) % self.every == 0
+
+
+class _BackgroundQueueHandler(QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now (they may change later), but do not run the formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def shutdown_logging() -> None:
+    """Flush and stop every background log writer; runs automatically at exit."""
+    for listener in list(_listeners.values()):
+        listener.stop()
+    _listeners.clear()
+
 
 def setup_logger(
     name: str = "internal_research_agent",
     level: str = "INFO",
-    log_file: Optional[str] = None
+    log_file: Optional[str] = None,
+    log_format: str = "text",
+    sample_every: int = 100,
+    sample_burst: int = 10
 ) -> logging.Logger:
     """
     Set up a logger with rich formatting and optional file output.
@@ -20,6 +119,9 @@ def setup_logger(
         name: Logger name
         level: Logging level
         log_file: Optional file path for logging
+        log_format: "text" (Rich console) or "json" (JSON lines on stderr and in the file)
+        sample_every: Keep one in this many repeated extra=SAMPLED messages (1 keeps all)
+        sample_burst: Repeated extra=SAMPLED messages always kept per template
 
     Returns:
         Configured logger instance
@@ -27,34 +129,46 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
 
-    # Clear existing handlers
+    # Clear existing handlers and stop their writer thread
     logger.handlers.clear()
+    if name in _listeners:
+        _listeners.pop(name).stop()
 
-    # Console handler with rich formatting
-    console_handler = RichHandler(
-        console=Console(),
-        show_time=True,
-        show_path=False,
-        markup=True
-    )
-    console_handler.setLevel(getattr(logging, level.upper()))
-
-    # Create formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    if log_format == "json":
+        formatter = JSONFormatter()
+        console_handler = logging.StreamHandler(sys.stderr)
+    else:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        # Console handler with rich formatting
+        console_handler = RichHandler(
+            console=Console(),
+            show_time=True,
+            show_path=False,
+            markup=True
+        )
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler if specified
     if log_file:
         file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, level.upper()))
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Callers only enqueue; the listener thread renders and writes
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _BackgroundQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(every=sample_every, burst=sample_burst))
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
 
     return logger
 
 
+atexit.register(shutdown_logging)
+
 # Default logger instance - quiet by default
-logger = setup_logger(level="WARNING")
\ No newline at end of file
+logger = setup_logger(level="WARNING")
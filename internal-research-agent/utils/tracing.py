@@ -0,0 +1,491 @@
+"""
+Structured per-query tracing for the Internal Research Agent.
+
+A QueryTrace is a LangChain callback handler that records a span for every agent step
+(chain), LLM call (with input/output token counts), tool call and retrieval of one
+query. While a trace is active it is installed for all LangChain runs in the current
+context through a configure hook, so nothing has to thread callbacks through the agent;
+code outside LangChain (such as the embedding layer) adds spans with trace_span().
+
+Finished traces are appended to a JSONL file and folded into cumulative metrics that are
+written in the Prometheus text exposition format (e.g. for node_exporter's textfile
+collector). aggregate_traces() summarises a trace file for `ira stats`.
+"""
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from utils.logger import logger
+
+# Upper bounds (seconds) of the query duration histogram buckets
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+SPAN_TYPES = ("chain", "llm", "tool", "retriever", "embedding")
+
+_current_trace: ContextVar[Optional["QueryTrace"]] = ContextVar("ira_current_trace", default=None)
+register_configure_hook(_current_trace, inheritable=True)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for models that report no usage."""
+    return max(1, len(text) // 4) if text else 0
+
+
+class QueryTrace(BaseCallbackHandler):
+    """Callback handler collecting the spans of one query."""
+
+    def __init__(self, question: str):
+        """
+        Initialize the trace.
+
+        Args:
+            question: The question being answered
+        """
+        self.trace_id = uuid.uuid4().hex
+        self.question = question
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.route = "agent"
+        self.error: Optional[str] = None
+        self.spans: List[Dict[str, Any]] = []
+        self._start = time.perf_counter()
+        self._open: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.duration_ms = 0.0
+
+    # Span bookkeeping
+
+    def _begin(self, run_id: UUID, span_type: str, name: str, **attributes: Any) -> None:
+        with self._lock:
+            self._open[run_id] = {
+                "type": span_type,
+                "name": name,
+                "start_ms": round((time.perf_counter() - self._start) * 1000, 2),
+                "_t0": time.perf_counter(),
+                **attributes
+            }
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **attributes: Any) -> None:
+        with self._lock:
+            span = self._open.pop(run_id, None)
+            if span is None:
+                return
+            span["duration_ms"] = round((time.perf_counter() - span.pop("_t0")) * 1000, 2)
+            span.update(attributes)
+            if error is not None:
+                span["error"] = f"{type(error).__name__}: {error}"
+            self.spans.append(span)
+
+    def add_span(self, span_type: str, name: str, duration_ms: float, **attributes: Any) -> None:
+        """Record a span measured outside LangChain."""
+        with self._lock:
+            self.spans.append({
+                "type": span_type,
+                "name": name,
+                "start_ms": round((time.perf_counter() - self._start) * 1000 - duration_ms, 2),
+                "duration_ms": round(duration_ms, 2),
+                **attributes
+            })
+
+    # Chains (agent steps)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        self._begin(run_id, "chain", name, parent=parent_run_id is not None)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error)
+
+    # LLM calls
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "llm"
+        self._begin(run_id, "llm", name, _prompt_chars="".join(prompts))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chat_model"
+        text = "".join(str(message.content) for batch in messages for message in batch)
+        self._begin(run_id, "llm", name, _prompt_chars=text)
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs) -> None:
+        input_tokens = output_tokens = 0
+        reported = False
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+                    reported = True
+
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        if not reported and token_usage:
+            input_tokens = token_usage.get("prompt_tokens", 0)
+            output_tokens = token_usage.get("completion_tokens", 0)
+            reported = True
+
+        with self._lock:
+            prompt = self._open.get(run_id, {}).pop("_prompt_chars", "")
+        if not reported:
+            input_tokens = estimate_tokens(prompt)
+            output_tokens = sum(
+                estimate_tokens(generation.text) for generations in response.generations for generation in generations
+            )
+
+        self._end(run_id, input_tokens=input_tokens, output_tokens=output_tokens, tokens_estimated=not reported)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self._open.get(run_id, {}).pop("_prompt_chars", None)
+        self._end(run_id, error)
+
+    # Tools
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._begin(run_id, "tool", name, input=str(input_str)[:200])
+
+    def on_tool_end(self, output, *, run_id, **kwargs) -> None:
+        self._end(run_id, output_chars=len(str(output)))
+
+    def on_tool_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error)
+
+    # Retrieval
+
+    def on_retriever_start(self, serialized, query, *, run_id, **kwargs) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "retriever"
+        self._begin(run_id, "retriever", name)
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs) -> None:
+        self._end(run_id, documents=len(documents))
+
+    def on_retriever_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error)
+
+    # Results
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Stop the clock; call once the query has completed or failed."""
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 2)
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise the trace with per-type totals."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start_ms"])
+
+        totals = {f"{span_type}_ms": 0.0 for span_type in SPAN_TYPES if span_type != "chain"}
+        totals.update(llm_calls=0, tool_calls=0, input_tokens=0, output_tokens=0)
+        for span in spans:
+            if span["type"] == "chain":
+                continue
+            totals[f"{span['type']}_ms"] = round(totals[f"{span['type']}_ms"] + span["duration_ms"], 2)
+            if span["type"] == "llm":
+                totals["llm_calls"] += 1
+                totals["input_tokens"] += span.get("input_tokens", 0)
+                totals["output_tokens"] += span.get("output_tokens", 0)
+            elif span["type"] == "tool":
+                totals["tool_calls"] += 1
+
+        return {
+            "trace_id": self.trace_id,
+            "started_at": self.started_at,
+            "question": self.question,
+            "route": self.route,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+            "totals": totals,
+            "spans": spans
+        }
+
+
+@contextmanager
+def start_trace(question: str) -> Iterator[QueryTrace]:
+    """
+    Trace a query: every LangChain run and trace_span() in this context is recorded.
+
+    Args:
+        question: The question being answered
+
+    Yields:
+        The active trace
+    """
+    trace = QueryTrace(question)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.finish(e)
+        raise
+    else:
+        trace.finish()
+    finally:
+        try:
+            _current_trace.reset(token)
+        except ValueError:
+            # An async generator closed from another context; that context was never traced
+            pass
+
+
+@contextmanager
+def trace_span(span_type: str, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block as a span of the active trace (a no-op when no trace is active).
+
+    Yields:
+        Dictionary of attributes the block may add to
+    """
+    trace = _current_trace.get()
+    start = time.perf_counter()
+    try:
+        yield attributes
+    except Exception as e:
+        attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if trace is not None:
+            trace.add_span(span_type, name, (time.perf_counter() - start) * 1000, **attributes)
+
+
+class TraceExporter:
+    """Appends traces to a JSONL file and maintains cumulative Prometheus metrics."""
+
+    def __init__(
+        self,
+        jsonl_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        include_text: bool = False
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            jsonl_path: Trace JSONL file (empty to disable)
+            prometheus_path: Prometheus text-format file (empty to disable); its cumulative
+                counters are kept in a ".state.json" file next to it
+            include_text: Keep the question and tool inputs in the JSONL traces
+        """
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.prometheus_path = Path(prometheus_path) if prometheus_path else None
+        self.state_path = self.prometheus_path.with_suffix(".state.json") if self.prometheus_path else None
+        self.include_text = include_text
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+        self._state_stamp: Optional[tuple] = None
+
+    def export(self, trace: QueryTrace) -> None:
+        """Write a finished trace to the configured outputs."""
+        record = trace.to_dict()
+        if not self.include_text:
+            record = redact_trace(record)
+        with self._lock:
+            try:
+                if self.jsonl_path:
+                    self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(record, default=str) + "\n")
+                if self.prometheus_path:
+                    state = self._load_state()
+                    update_metrics(state, record)
+                    self._write_atomic(self.state_path, json.dumps(state))
+                    self._state_stamp = self._stamp()
+                    self._write_atomic(self.prometheus_path, format_prometheus(state))
+            except OSError as e:
+                logger.warning("Could not export trace %s: %s", trace.trace_id, e)
+
+    def _load_state(self) -> Dict[str, Any]:
+        # Reuse the counters in memory unless another process has written them since
+        stamp = self._stamp()
+        if self._state is not None and stamp == self._state_stamp:
+            return self._state
+
+        self._state = new_metrics_state()
+        if stamp is not None:
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Resetting metrics state %s: %s", self.state_path, e)
+        return self._state
+
+    def _stamp(self) -> Optional[tuple]:
+        """Modification time and size of the state file, or None if it does not exist."""
+        try:
+            stat = self.state_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _write_atomic(path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        tmp_path.replace(path)
+
+
+def redact_trace(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the question and tool inputs from a trace record, keeping timings and counts."""
+    return {
+        **record,
+        "question": None,
+        "spans": [{key: value for key, value in span.items() if key != "input"} for span in record["spans"]]
+    }
+
+
+def new_metrics_state() -> Dict[str, Any]:
+    """Empty cumulative metrics."""
+    return {
+        "queries": {},
+        "duration_buckets": [0] * len(DURATION_BUCKETS),
+        "duration_sum": 0.0,
+        "duration_count": 0,
+        "span_seconds": {},
+        "span_count": {},
+        "llm_tokens": {"input": 0, "output": 0},
+        "tool_calls": {}
+    }
+
+
+def update_metrics(state: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """Fold one trace record into cumulative metrics."""
+    outcome = "error" if record.get("error") else "ok"
+    key = f"{record.get('route', 'agent')}|{outcome}"
+    state["queries"][key] = state["queries"].get(key, 0) + 1
+
+    seconds = record["duration_ms"] / 1000
+    state["duration_sum"] += seconds
+    state["duration_count"] += 1
+    for i, bound in enumerate(DURATION_BUCKETS):
+        if seconds <= bound:
+            state["duration_buckets"][i] += 1
+
+    for span in record["spans"]:
+        span_type = span["type"]
+        state["span_seconds"][span_type] = state["span_seconds"].get(span_type, 0.0) + span["duration_ms"] / 1000
+        state["span_count"][span_type] = state["span_count"].get(span_type, 0) + 1
+        if span_type == "tool":
+            state["tool_calls"][span["name"]] = state["tool_calls"].get(span["name"], 0) + 1
+
+    state["llm_tokens"]["input"] += record["totals"]["input_tokens"]
+    state["llm_tokens"]["output"] += record["totals"]["output_tokens"]
+
+
+def format_prometheus(state: Dict[str, Any]) -> str:
+    """Render cumulative metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP ira_queries_total Queries answered, by route and outcome.",
+        "# TYPE ira_queries_total counter",
+    ]
+    for key, count in sorted(state["queries"].items()):
+        route, outcome = key.split("|")
+        lines.append(f'ira_queries_total{{route="{route}",outcome="{outcome}"}} {count}')
+
+    lines += [
+        "# HELP ira_query_duration_seconds End-to-end query latency.",
+        "# TYPE ira_query_duration_seconds histogram",
+    ]
+    for bound, count in zip(DURATION_BUCKETS, state["duration_buckets"]):
+        lines.append(f'ira_query_duration_seconds_bucket{{le="{bound}"}} {count}')
+    lines.append(f'ira_query_duration_seconds_bucket{{le="+Inf"}} {state["duration_count"]}')
+    lines.append(f"ira_query_duration_seconds_sum {state['duration_sum']:.6f}")
+    lines.append(f"ira_query_duration_seconds_count {state['duration_count']}")
+
+    lines += [
+        "# HELP ira_span_duration_seconds Time spent in agent steps, LLM calls, tools, retrieval and embedding.",
+        "# TYPE ira_span_duration_seconds summary",
+    ]
+    for span_type in sorted(state["span_seconds"]):
+        lines.append(f'ira_span_duration_seconds_sum{{type="{span_type}"}} {state["span_seconds"][span_type]:.6f}')
+        lines.append(f'ira_span_duration_seconds_count{{type="{span_type}"}} {state["span_count"][span_type]}')
+
+    lines += [
+        "# HELP ira_llm_tokens_total LLM tokens spent, by direction.",
+        "# TYPE ira_llm_tokens_total counter",
+        f'ira_llm_tokens_total{{direction="input"}} {state["llm_tokens"]["input"]}',
+        f'ira_llm_tokens_total{{direction="output"}} {state["llm_tokens"]["output"]}',
+        "# HELP ira_tool_calls_total Tool calls, by tool.",
+        "# TYPE ira_tool_calls_total counter",
+    ]
+    for tool_name, count in sorted(state["tool_calls"].items()):
+        lines.append(f'ira_tool_calls_total{{tool="{tool_name}"}} {count}')
+
+    return "\n".join(lines) + "\n"
+
+
+def load_traces(path: str) -> List[Dict[str, Any]]:
+    """Read trace records from a JSONL file, skipping damaged lines."""
+    traces = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                traces.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return traces
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def aggregate_traces(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarise recorded traces.
+
+    Returns:
+        Dictionary with query counts, p50/p95 latency per query and per span type (and per
+        tool), LLM call counts and token spend
+    """
+    latency = {"query": [record["duration_ms"] for record in traces]}
+    for record in traces:
+        for span in record.get("spans", []):
+            if span["type"] == "chain":
+                continue
+            latency.setdefault(span["type"], []).append(span["duration_ms"])
+            if span["type"] == "tool":
+                latency.setdefault(f"tool:{span['name']}", []).append(span["duration_ms"])
+
+    totals = [record.get("totals", {}) for record in traces]
+    input_tokens = sum(total.get("input_tokens", 0) for total in totals)
+    output_tokens = sum(total.get("output_tokens", 0) for total in totals)
+
+    return {
+        "queries": len(traces),
+        "errors": sum(1 for record in traces if record.get("error")),
+        "routes": {
+            route: sum(1 for record in traces if record.get("route") == route)
+            for route in sorted({record.get("route", "agent") for record in traces})
+        },
+        "latency_ms": {
+            name: {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+            for name, values in latency.items()
+        },
+        "llm_calls": sum(total.get("llm_calls", 0) for total in totals),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "tokens_per_query": round((input_tokens + output_tokens) / len(traces), 1) if traces else 0,
+        "estimated_tokens": any(
+            span.get("tokens_estimated") for record in traces for span in record.get("spans", [])
+        )
+    }
@@ -0,0 +1,80 @@
+"""Benchmark peak memory and throughput of chunking a very large plain-text file.
+
+Generates a synthetic log export (2 GB by default) unless --file is given, then chunks it through
+the streaming .txt path. Pass --compare-legacy to also run read_text_file + split_text, which holds
+several full copies of the file in memory.
+
+Usage:
+    python benchmarks/large_text_reader.py --size-mb 2048
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.chroma_ops import iter_document_chunks
+from src.document_processing.reader import read_text_file
+from src.text_processing.chunker import split_text
+
+
+def generate_file(path: str, size_mb: int):
+    """Write a synthetic log file of roughly size_mb megabytes with mixed ASCII/UTF-8 lines."""
+    line = ("2024-05-01T12:00:00Z INFO request handled for user café-42. "
+            "Latency was 35 ms and the response size was 1.2 kB. Next request queued.\n")
+    block = line * 10000
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, 'w', encoding='utf-8') as file:
+        while written < target:
+            file.write(block)
+            written += len(block.encode('utf-8'))
+
+
+def measure(name: str, count_chunks, size_bytes: int):
+    """Run count_chunks under tracemalloc and print chunk count, throughput and peak Python memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = count_chunks()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<10}{chunks:>12}{size_bytes / elapsed / 1e6:>12.1f}{peak / 1e6:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Large plain-text streaming benchmark')
+    parser.add_argument('--file', type=str, help='Existing .txt file to chunk')
+    parser.add_argument('--size-mb', type=int, default=2048, help='Size of the generated file')
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--compare-legacy', action='store_true',
+                      help='Also run the whole-file read_text_file + split_text path')
+    args = parser.parse_args()
+
+    path = args.file
+    if not path:
+        path = os.path.join(tempfile.mkdtemp(), 'synthetic.txt')
+        print(f"Generating {args.size_mb} MB file at {path}...")
+        generate_file(path, args.size_mb)
+
+    size_bytes = os.path.getsize(path)
+    print(f"{'mode':<10}{'chunks':>12}{'MB/s':>12}{'peak MB':>14}")
+
+    measure("streaming", lambda: sum(1 for _ in iter_document_chunks(path, args.chunk_size)), size_bytes)
+    if args.compare_legacy:
+        measure("legacy", lambda: len(split_text(read_text_file(path), args.chunk_size)), size_bytes)
+
+    print(f"Max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB "
+          f"(includes file pages mapped by mmap)")
+
+    if not args.file:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark query embedding throughput and tail latency with and without micro-batching.
+
+Usage:
+    python benchmarks/query_batching.py --clients 32 --queries 20 --max-batch-size 32 --max-wait-ms 5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chromadb.utils import embedding_functions
+from src.database.embedding_batcher import QueryEmbeddingBatcher
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile of values using nearest-rank."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_load(embed, clients: int, queries_per_client: int):
+    """Fire queries from concurrent client threads and return (throughput, latencies in ms)."""
+    latencies = []
+    lock = threading.Lock()
+
+    def client(client_id):
+        for i in range(queries_per_client):
+            start = time.perf_counter()
+            embed(f"What does the policy say about topic {client_id}-{i}?")
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - start
+
+    return len(latencies) / total, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query embedding micro-batching benchmark')
+    parser.add_argument('--model', type=str, default='all-MiniLM-L6-v2')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--queries', type=int, default=20, help='Queries per client')
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    ef = embedding_functions.SentenceTransformerEmbeddingFunction(model_name=args.model)
+    ef(["warm up"])
+
+    # Encoder calls are serialised per model, as they would be behind a shared collection
+    model_lock = threading.Lock()
+
+    def direct(text):
+        with model_lock:
+            return ef([text])[0]
+
+    batcher = QueryEmbeddingBatcher(ef, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+
+    print(f"{'mode':<10}{'qps':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, embed in [("direct", direct), ("batched", batcher.embed)]:
+        qps, latencies = run_load(embed, args.clients, args.queries)
+        print(f"{name:<10}{qps:>10.1f}{percentile(latencies, 50):>10.1f}{percentile(latencies, 99):>10.1f}")
+
+    batcher.close()
+
+
+if __name__ == "__main__":
+    main()
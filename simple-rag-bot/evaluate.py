@@ -0,0 +1,72 @@
+import os
+import argparse
+import json
+
+# Evaluation runs fully offline against the locally cached embedding models
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+import chromadb
+from chromadb.utils import embedding_functions
+from src.evaluation.harness import load_golden_set, run_sweep, format_table
+
+
+def parse_list(value: str, cast=str):
+    """Parse a comma-separated CLI value into a list."""
+    return [cast(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate retrieval quality and latency of the RAG bot')
+    parser.add_argument('golden_set', type=str,
+                      help='JSONL file of {"question", "source", optional "chunk"/"contains"} examples')
+    parser.add_argument('--docs', type=str, default='./docs',
+                      help='Documents folder to index for each configuration (default: ./docs)')
+    parser.add_argument('--collection', type=str,
+                      help='Evaluate an existing collection in --db instead of re-indexing --docs')
+    parser.add_argument('--db', type=str, default='chroma_db',
+                      help='Path of the persistent database holding --collection (default: chroma_db)')
+    parser.add_argument('--models', type=str, default='all-MiniLM-L6-v2',
+                      help='Comma-separated sentence-transformers models to sweep')
+    parser.add_argument('--chunk-sizes', type=str, default='500',
+                      help='Comma-separated chunk sizes to sweep')
+    parser.add_argument('--n-results', type=str, default='1,2,3,5',
+                      help='Comma-separated n_results values to sweep')
+    parser.add_argument('--mmr-max-tokens', type=int, default=None,
+                      help='Also evaluate MMR context selection with this token budget')
+    parser.add_argument('--json', type=str,
+                      help='Write the results as JSON to this file')
+
+    args = parser.parse_args()
+
+    golden_set = load_golden_set(args.golden_set)
+    models = parse_list(args.models)
+
+    collection = None
+    embedding_function = None
+    if args.collection:
+        db_client = chromadb.PersistentClient(path=args.db)
+        embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(model_name=models[0])
+        collection = db_client.get_collection(name=args.collection, embedding_function=embedding_function)
+
+    rows = run_sweep(
+        golden_set,
+        docs_path=args.docs,
+        collection=collection,
+        models=models,
+        chunk_sizes=parse_list(args.chunk_sizes, int),
+        n_results_values=parse_list(args.n_results, int),
+        mmr_max_tokens=args.mmr_max_tokens,
+        embedding_function=embedding_function
+    )
+
+    print(format_table(rows))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(rows, file, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 import chromadb
 from chromadb.utils import embedding_functions
 from google import genai
 import argparse
 from src.database.chroma_ops import process_and_add_documents
+from src.database.embedding_batcher import QueryEmbeddingBatcher
 from src.conversation.manager import create_session
 from src.query_processing.rag import conversational_rag_query
 
 
 def setup_database():
-    """Initialize and setup the database"""
+    """Initialize and setup the database. Returns the collection and its embedding function."""
     db_client = chromadb.PersistentClient(path="chroma_db")
     sentence_transformer_ef = embedding_functions.SentenceTransformerEmbeddingFunction(
         model_name="all-MiniLM-L6-v2"
@@ -18,17 +20,23 @@ def setup_database():
         name="documents_collection",
         embedding_function=sentence_transformer_ef
     )
-    return collection
+    return collection, sentence_transformer_ef
 
 
 def main():
     parser = argparse.ArgumentParser(description='Simple RAG Bot CLI')
     parser.add_argument('--docs', type=str, default='./docs',
                       help='Path to documents folder (default: ./docs)')
-    parser.add_argument('--query', type=str,
-                      help='Query to process')
+    parser.add_argument('--query', type=str, action='append',
+                      help='Query to process (repeat to answer several queries concurrently)')
     parser.add_argument('--interactive', action='store_true',
                       help='Run in interactive mode')
+    parser.add_argument('--max-history-tokens', type=int, default=None,
+                      help='Summarise older conversation turns once history exceeds this many tokens')
+    parser.add_argument('--context-max-tokens', type=int, default=None,
+                      help='Select diverse context chunks (MMR) within this token budget')
+    parser.add_argument('--batch-max-wait-ms', type=float, default=5.0,
+                      help='How long concurrent query embeddings wait to share a batch (default: 5)')
 
     args = parser.parse_args()
 
@@ -39,42 +47,55 @@ def main():
         return
 
     # Initialize components
-    collection = setup_database()
+    collection, embedding_function = setup_database()
     client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-    session_id = create_session()
 
     # Process documents
     print(f"Processing documents from {args.docs}...")
     process_and_add_documents(collection, args.docs)
 
-    if args.interactive:
-        print("\nEntering interactive mode. Type 'exit' to quit.")
-        while True:
-            query = input("\nEnter your question: ")
-            if query.lower() == 'exit':
-                break
-
-            response, sources = conversational_rag_query(
-                collection,
-                query,
-                session_id,
-                client
-            )
-            print("\nResponse:", response)
-            print("\nSources:", sources)
-
-    elif args.query:
-        response, sources = conversational_rag_query(
+    # Concurrent queries are embedded together in one forward pass
+    query_embedder = QueryEmbeddingBatcher(embedding_function, max_wait_ms=args.batch_max_wait_ms)
+
+    def answer(query, session_id):
+        return conversational_rag_query(
             collection,
-            args.query,
+            query,
             session_id,
-            client
+            client,
+            max_history_tokens=args.max_history_tokens,
+            query_embedder=query_embedder,
+            context_max_tokens=args.context_max_tokens
         )
-        print("\nResponse:", response)
-        print("\nSources:", sources)
 
-    else:
-        parser.print_help()
+    try:
+        if args.interactive:
+            session_id = create_session()
+            print("\nEntering interactive mode. Type 'exit' to quit.")
+            while True:
+                query = input("\nEnter your question: ")
+                if query.lower() == 'exit':
+                    break
+
+                response, sources = answer(query, session_id)
+                print("\nResponse:", response)
+                print("\nSources:", sources)
+
+        elif args.query:
+            # Separate queries are independent conversations
+            with ThreadPoolExecutor(max_workers=len(args.query)) as executor:
+                results = list(executor.map(answer, args.query, [create_session() for _ in args.query]))
+
+            for query, (response, sources) in zip(args.query, results):
+                if len(args.query) > 1:
+                    print("\nQuery:", query)
+                print("\nResponse:", response)
+                print("\nSources:", sources)
+
+        else:
+            parser.print_help()
+    finally:
+        query_embedder.close()
 
 if __name__ == "__main__":
     main()
@@ -13,6 +13,7 @@ setup(
     entry_points={
         'console_scripts': [
             'ragbot=main:main',
+            'ragbot-eval=evaluate:main',
         ],
     },
 )
\ No newline at end of file
@@ -1,48 +1,176 @@
+from concurrent.futures import Future
 from datetime import datetime
+import atexit
+import queue
+import threading
 import uuid
+from src.text_processing.tokens import estimate_tokens
 
 # In-memory conversation store
 conversations = {}
 
+# Rolling summaries of older turns that have been folded out of `conversations`
+summaries = {}
+
+# Guards conversations/summaries against the background summariser
+_lock = threading.Lock()
+
+# Single daemon worker so summaries are produced one at a time, off the request path, and
+# never hold up process exit (a ThreadPoolExecutor worker is joined before atexit runs)
+_summary_queue = queue.Queue()
+_summary_lock = threading.Lock()
+_summary_thread = None
+_summary_closed = False
+_pending_compactions = set()
+
+
+def _summary_worker():
+    """Run queued summaries until close() posts the stop marker."""
+    while True:
+        item = _summary_queue.get()
+        if item is None:
+            return
+        future, args = item
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(_fold_messages(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+
+def _submit_summary(*args):
+    """Queue a summary on the background worker, starting it on first use. Returns a Future."""
+    global _summary_thread
+    with _summary_lock:
+        if _summary_closed:
+            raise RuntimeError("history summariser is closed")
+        if _summary_thread is None:
+            _summary_thread = threading.Thread(target=_summary_worker, name="history-summary", daemon=True)
+            _summary_thread.start()
+        future = Future()
+        _summary_queue.put((future, args))
+    return future
+
+
+def close():
+    """Stop the background summariser without waiting; queued summaries are cancelled."""
+    global _summary_closed
+    with _summary_lock:
+        _summary_closed = True
+        while True:
+            try:
+                item = _summary_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        _summary_queue.put(None)
+
+
+atexit.register(close)
+
 
 def create_session():
     """Create a new conversation session and return its unique ID."""
     session_id = str(uuid.uuid4())
-    conversations[session_id] = []
+    with _lock:
+        conversations[session_id] = []
+        summaries[session_id] = ""
     return session_id
 
 
 def add_message(session_id: str, role: str, content: str):
     """Add a message to the conversation history with timestamp."""
-    if session_id not in conversations:
-        conversations[session_id] = []
+    with _lock:
+        if session_id not in conversations:
+            conversations[session_id] = []
 
-    conversations[session_id].append({
-        "role": role,
-        "content": content,
-        "timestamp": datetime.now().isoformat()
-    })
+        conversations[session_id].append({
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now().isoformat()
+        })
 
 
 def get_conversation_history(session_id: str, max_messages: int = None):
     """Get conversation history for a session, optionally limited to max_messages."""
-    if session_id not in conversations:
-        return []
+    with _lock:
+        if session_id not in conversations:
+            return []
+
+        history = list(conversations[session_id])
 
-    history = conversations[session_id]
     if max_messages:
         history = history[-max_messages:]
 
     return history
 
 
-def format_history_for_prompt(session_id: str, max_messages: int = 5):
-    """Format conversation history for inclusion in prompts, converting roles to Human/Assistant."""
-    history = get_conversation_history(session_id, max_messages)
+def get_history_summary(session_id: str):
+    """Get the rolling summary of compacted turns for a session, or an empty string."""
+    with _lock:
+        return summaries.get(session_id, "")
+
+
+def format_messages(history):
+    """Format a list of messages as Human/Assistant turns."""
     formatted_history = ""
 
     for msg in history:
         role = "Human" if msg["role"] == "user" else "Assistant"
         formatted_history += f"{role}: {msg['content']}\n\n"
 
-    return formatted_history.strip()
\ No newline at end of file
+    return formatted_history.strip()
+
+
+def format_history_for_prompt(session_id: str, max_messages: int = 5):
+    """Format conversation history for inclusion in prompts, converting roles to Human/Assistant.
+    The rolling summary of compacted turns, if any, is prepended to the recent messages."""
+    formatted_history = format_messages(get_conversation_history(session_id, max_messages))
+    summary = get_history_summary(session_id)
+
+    if summary:
+        formatted_history = f"Summary of earlier conversation: {summary}\n\n{formatted_history}"
+
+    return formatted_history.strip()
+
+
+def compact_history(session_id: str, summarize, max_tokens: int = 1000, keep_messages: int = 4):
+    """Schedule folding of older turns into the session's rolling summary once the raw history
+    exceeds max_tokens. summarize(previous_summary, transcript) runs on a background thread;
+    the keep_messages most recent messages always stay verbatim. Returns the Future or None."""
+    with _lock:
+        history = conversations.get(session_id, [])
+        raw_tokens = sum(estimate_tokens(msg["content"]) for msg in history)
+        if raw_tokens <= max_tokens or len(history) <= keep_messages:
+            return None
+        if session_id in _pending_compactions:
+            return None
+
+        # Only appends happen on the request path, so this prefix stays stable until we fold it
+        to_fold = list(history[:len(history) - keep_messages])
+        previous_summary = summaries.get(session_id, "")
+        _pending_compactions.add(session_id)
+
+    try:
+        return _submit_summary(session_id, to_fold, previous_summary, summarize)
+    except RuntimeError:
+        # The summariser has been closed; keep the raw history
+        with _lock:
+            _pending_compactions.discard(session_id)
+        return None
+
+
+def _fold_messages(session_id: str, to_fold, previous_summary: str, summarize):
+    """Summarise to_fold into the rolling summary and drop the folded messages from the session."""
+    try:
+        summary = summarize(previous_summary, format_messages(to_fold))
+        with _lock:
+            summaries[session_id] = summary.strip()
+            del conversations[session_id][:len(to_fold)]
+    except Exception as e:
+        print(f"Error summarising conversation history: {str(e)}")
+    finally:
+        with _lock:
+            _pending_compactions.discard(session_id)
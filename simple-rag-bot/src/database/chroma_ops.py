@@ -1,6 +1,11 @@
 import os
-from src.document_processing.reader import read_document
-from src.text_processing.chunker import split_text
+from src.database.mmr import maximal_marginal_relevance, merge_contiguous_chunks
+from src.document_processing.reader import read_document, iter_text_file
+from src.text_processing.chunker import split_text, split_text_stream
+from src.text_processing.tokens import estimate_tokens
+
+# Longest run of text without a sentence break kept in memory while streaming plain-text files
+MAX_STREAMED_SENTENCE_SIZE = 64 * 1024
 
 
 def add_to_collection(collection, ids, texts, metadatas):
@@ -18,27 +23,52 @@ def add_to_collection(collection, ids, texts, metadatas):
         )
 
 
-def process_document(file_path: str):
-    """Process a single document and prepare it for ChromaDB. Returns document chunks with metadata."""
-    try:
-        # Read the document
-        content = read_document(file_path)
+def iter_document_chunks(file_path: str, chunk_size: int = 500):
+    """Yield the text chunks of a document. Plain-text files are streamed so that memory use
+    stays constant regardless of file size; other formats are read whole."""
+    if os.path.splitext(file_path)[1].lower() == '.txt':
+        return split_text_stream(iter_text_file(file_path), chunk_size, MAX_STREAMED_SENTENCE_SIZE)
+    return iter(split_text(read_document(file_path), chunk_size))
 
-        # Split into chunks
-        chunks = split_text(content)
 
-        # Prepare metadata
-        file_name = os.path.basename(file_path)
-        metadatas = [{"source": file_name, "chunk": i} for i in range(len(chunks))]
-        ids = [f"{file_name}_chunk_{i}" for i in range(len(chunks))]
+def stream_document_to_collection(collection, file_path: str, chunk_size: int = 500, batch_size: int = 100):
+    """Chunk a document and add it to the collection batch by batch. If reading the file fails part
+    way, the chunks this call added are deleted again so a file is ingested all-or-nothing.
+    Returns the number of chunks added."""
+    file_name = os.path.basename(file_path)
+    ids, texts, metadatas = [], [], []
+    new_ids = []
+    total = 0
 
-        return ids, chunks, metadatas
+    def flush():
+        # Chunks stored by an earlier run are kept on failure, so only remember the new ones
+        existing = set(collection.get(ids=ids, include=[])["ids"]) if ids else set()
+        add_to_collection(collection, ids, texts, metadatas)
+        new_ids.extend(chunk_id for chunk_id in ids if chunk_id not in existing)
+
+    try:
+        for i, chunk in enumerate(iter_document_chunks(file_path, chunk_size)):
+            ids.append(f"{file_name}_chunk_{i}")
+            texts.append(chunk)
+            metadatas.append({"source": file_name, "chunk": i})
+
+            if len(texts) >= batch_size:
+                flush()
+                total += len(texts)
+                ids, texts, metadatas = [], [], []
+
+        flush()
+        total += len(texts)
     except Exception as e:
         print(f"Error processing {file_path}: {str(e)}")
-        return [], [], []
+        if new_ids:
+            collection.delete(ids=new_ids)
+        return 0
 
+    return total
 
-def process_and_add_documents(collection, folder_path: str):
+
+def process_and_add_documents(collection, folder_path: str, chunk_size: int = 500):
     """Process all documents in a folder and add them to the ChromaDB collection."""
     files = [os.path.join(folder_path, file)
              for file in os.listdir(folder_path)
@@ -46,13 +76,19 @@ def process_and_add_documents(collection, folder_path: str):
 
     for file_path in files:
         print(f"Processing {os.path.basename(file_path)}...")
-        ids, texts, metadatas = process_document(file_path)
-        add_to_collection(collection, ids, texts, metadatas)
-        print(f"Added {len(texts)} chunks to collection")
+        added = stream_document_to_collection(collection, file_path, chunk_size)
+        print(f"Added {added} chunks to collection")
 
 
-def semantic_search(collection, query: str, n_results: int = 2):
-    """Perform semantic search on the collection and return the top n_results matches."""
+def semantic_search(collection, query: str, n_results: int = 2, query_embedder=None):
+    """Perform semantic search on the collection and return the top n_results matches.
+    If query_embedder (e.g. a QueryEmbeddingBatcher) is given, the query is embedded through it."""
+    if query_embedder is not None:
+        return collection.query(
+            query_embeddings=[query_embedder.embed(query)],
+            n_results=n_results
+        )
+
     results = collection.query(
         query_texts=[query],
         n_results=n_results
@@ -60,6 +96,52 @@ def semantic_search(collection, query: str, n_results: int = 2):
     return results
 
 
+def diverse_search(collection, query: str, n_results: int = 3, fetch_k: int = None,
+                   lambda_mult: float = 0.5, max_tokens: int = None, query_embedder=None,
+                   embedding_function=None):
+    """Over-fetch fetch_k candidates with their embeddings, pick a diverse subset of up to n_results
+    with maximal marginal relevance under a max_tokens budget, and merge contiguous chunks from
+    the same source. Returns results in the same shape as semantic_search, with "documents",
+    "metadatas" and "distances" (a merged group keeps the distance of its closest chunk).
+    MMR needs the query vector itself, so either query_embedder or the collection's
+    embedding_function must be given."""
+    fetch_k = fetch_k or n_results * 4
+
+    if query_embedder is not None:
+        query_embedding = query_embedder.embed(query)
+    elif embedding_function is not None:
+        query_embedding = embedding_function([query])[0]
+    else:
+        raise ValueError("diverse_search needs a query_embedder or an embedding_function")
+
+    results = collection.query(
+        query_embeddings=[query_embedding],
+        n_results=fetch_k,
+        include=["documents", "metadatas", "distances", "embeddings"]
+    )
+
+    documents = results['documents'][0]
+    metadatas = results['metadatas'][0]
+    token_counts = [estimate_tokens(doc) for doc in documents]
+
+    selected = maximal_marginal_relevance(
+        query_embedding,
+        results['embeddings'][0],
+        k=n_results,
+        lambda_mult=lambda_mult,
+        token_counts=token_counts,
+        max_tokens=max_tokens
+    )
+
+    merged_documents, merged_metadatas, merged_distances = merge_contiguous_chunks(
+        [documents[i] for i in selected],
+        [metadatas[i] for i in selected],
+        [results['distances'][0][i] for i in selected]
+    )
+
+    return {"documents": [merged_documents], "metadatas": [merged_metadatas], "distances": [merged_distances]}
+
+
 def get_context_with_sources(results):
     """Extract context and source information from search results. Returns combined text and source list."""
     # Combine document chunks into a single context
@@ -0,0 +1,99 @@
+import threading
+import queue
+import time
+from concurrent.futures import Future
+
+
+class QueryEmbeddingBatcher:
+    """Micro-batching queue in front of a query embedding function.
+
+    Concurrent callers submit single query strings; a background worker collects them for up to
+    max_wait_ms or max_batch_size items, encodes the whole batch in one forward pass and resolves
+    each caller's future with its own embedding.
+    """
+
+    def __init__(self, embedding_function, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        """Wrap embedding_function, a callable that maps a list of texts to a list of vectors."""
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.embedding_function = embedding_function
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="query-embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a query for embedding and return a Future resolving to its vector."""
+        future = Future()
+        # Checked under the lock so nothing can be queued behind the shutdown marker
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("QueryEmbeddingBatcher is closed")
+            self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: float = None):
+        """Embed a single query, blocking until its batch has been encoded."""
+        return self.submit(text).result(timeout=timeout)
+
+    def __call__(self, texts):
+        """Embed a list of queries through the batcher (Chroma embedding function interface)."""
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Stop the worker after draining queued requests."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def _collect_batch(self, first):
+        """Gather up to max_batch_size requests, waiting at most max_wait after the first one."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Re-queue the shutdown marker so the main loop sees it after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        """Worker loop: encode batches until closed."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = self._collect_batch(first)
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = list(self.embedding_function(texts))
+                if len(embeddings) != len(batch):
+                    raise RuntimeError(
+                        f"Embedding function returned {len(embeddings)} vectors for {len(batch)} texts"
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
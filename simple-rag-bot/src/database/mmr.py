@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def _normalize(vectors):
+    """Scale rows to unit length so dot products are cosine similarities."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def maximal_marginal_relevance(query_embedding, embeddings, k: int, lambda_mult: float = 0.5,
+                               token_counts=None, max_tokens: int = None):
+    """Pick up to k candidate indices balancing relevance to the query against redundancy with
+    already selected candidates. If token_counts and max_tokens are given, candidates that would
+    exceed the remaining token budget are skipped. Returns indices in selection order."""
+    if len(embeddings) == 0 or k <= 0:
+        return []
+
+    candidates = _normalize(embeddings)
+    query = _normalize(query_embedding).reshape(-1)
+
+    relevance = candidates @ query
+    similarity = candidates @ candidates.T
+
+    selected = []
+    available = np.ones(len(candidates), dtype=bool)
+    max_redundancy = np.zeros(len(candidates), dtype=np.float32)
+    remaining_tokens = max_tokens
+
+    if token_counts is not None and max_tokens is not None:
+        available &= np.asarray(token_counts) <= max_tokens
+
+    while len(selected) < k and available.any():
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+
+        selected.append(best)
+        available[best] = False
+        max_redundancy = np.maximum(max_redundancy, similarity[best])
+
+        if remaining_tokens is not None:
+            remaining_tokens -= token_counts[best]
+            available &= np.asarray(token_counts) <= remaining_tokens
+
+    return selected
+
+
+def merge_contiguous_chunks(documents, metadatas, distances):
+    """Merge selected chunks that are adjacent in the same source file. Merged groups keep the
+    position of their first selected chunk; their metadata chunk becomes a "first-last" range
+    and their distance is that of their closest chunk."""
+    groups = []
+    by_source = {}
+
+    for rank, (doc, meta, distance) in enumerate(zip(documents, metadatas, distances)):
+        by_source.setdefault(meta["source"], []).append((meta["chunk"], rank, doc, meta, distance))
+
+    for source, chunks in by_source.items():
+        chunks.sort(key=lambda item: item[0])
+        current = [chunks[0]]
+        for item in chunks[1:]:
+            if item[0] == current[-1][0] + 1:
+                current.append(item)
+            else:
+                groups.append(current)
+                current = [item]
+        groups.append(current)
+
+    groups.sort(key=lambda group: min(item[1] for item in group))
+
+    merged_documents, merged_metadatas, merged_distances = [], [], []
+    for group in groups:
+        first, last = group[0][0], group[-1][0]
+        meta = dict(group[0][3])
+        meta["chunk"] = first if first == last else f"{first}-{last}"
+        merged_documents.append(" ".join(item[2] for item in group))
+        merged_metadatas.append(meta)
+        merged_distances.append(min(item[4] for item in group))
+
+    return merged_documents, merged_metadatas, merged_distances
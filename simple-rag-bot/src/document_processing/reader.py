@@ -1,3 +1,5 @@
+import codecs
+import mmap
 import docx
 import PyPDF2
 import os
@@ -9,6 +11,26 @@ def read_text_file(file_path: str):
         return file.read()
 
 
+def iter_text_file(file_path: str, block_size: int = 1024 * 1024):
+    """Stream a UTF-8 text file as decoded blocks of about block_size bytes via mmap.
+    Multi-byte characters split across block boundaries are handled by an incremental decoder."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, len(mapped), block_size):
+                text = decoder.decode(mapped[offset:offset + block_size])
+                if text:
+                    yield text
+
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
 def read_pdf_file(file_path: str):
     """Extract and return text content from a PDF file."""
     text = ""
@@ -0,0 +1,158 @@
+import json
+import time
+import chromadb
+from chromadb.utils import embedding_functions
+from src.database.chroma_ops import process_and_add_documents, semantic_search, diverse_search
+
+
+def load_golden_set(path: str):
+    """Load a golden set from a JSONL file. Each line holds a "question", the expected "source"
+    file name and optionally the expected "chunk" index and/or a "contains" text snippet."""
+    golden_set = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                golden_set.append(json.loads(line))
+    return golden_set
+
+
+def is_relevant(example, document: str, metadata):
+    """Check whether a retrieved chunk matches the expected source/chunk of a golden example."""
+    if metadata["source"] != example["source"]:
+        return False
+    if "chunk" in example and str(metadata["chunk"]) != str(example["chunk"]):
+        # Merged MMR results carry a "first-last" chunk range
+        chunk_range = str(metadata["chunk"]).split("-")
+        if not int(chunk_range[0]) <= int(example["chunk"]) <= int(chunk_range[-1]):
+            return False
+    if "contains" in example and example["contains"].lower() not in document.lower():
+        return False
+    return True
+
+
+def percentile(values, pct: float):
+    """Return the pct-th percentile of values using nearest-rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def build_collection(docs_path: str, model_name: str, chunk_size: int):
+    """Index docs_path into a fresh in-memory collection with the given model and chunk size.
+    Returns the collection and its embedding function."""
+    db_client = chromadb.EphemeralClient()
+    embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(model_name=model_name)
+    name = f"eval_{abs(hash((model_name, chunk_size)))}"
+    try:
+        db_client.delete_collection(name)
+    except Exception:
+        pass
+    collection = db_client.create_collection(name=name, embedding_function=embedding_function)
+    process_and_add_documents(collection, docs_path, chunk_size)
+    return collection, embedding_function
+
+
+def index_size(collection):
+    """Return the chunk count and approximate vector storage (float32) in bytes of a collection."""
+    count = collection.count()
+    if count == 0:
+        return count, 0
+    sample = collection.get(limit=1, include=["embeddings"])
+    dimensions = len(sample["embeddings"][0])
+    return count, count * dimensions * 4
+
+
+def evaluate_collection(collection, golden_set, n_results: int, mmr_max_tokens: int = None,
+                        embedding_function=None):
+    """Run every golden question against the collection and return recall@k, MRR and latency stats.
+    MMR (mmr_max_tokens) embeds the questions with the collection's embedding_function."""
+    hits = 0
+    reciprocal_ranks = []
+    latencies = []
+
+    for example in golden_set:
+        start = time.perf_counter()
+        if mmr_max_tokens:
+            results = diverse_search(collection, example["question"], n_results, max_tokens=mmr_max_tokens,
+                                     embedding_function=embedding_function)
+        else:
+            results = semantic_search(collection, example["question"], n_results)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        rank = None
+        for i, (document, metadata) in enumerate(zip(results['documents'][0], results['metadatas'][0])):
+            if is_relevant(example, document, metadata):
+                rank = i + 1
+                break
+
+        if rank is not None:
+            hits += 1
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+    total = len(golden_set) or 1
+    return {
+        "recall@k": hits / total,
+        "mrr": sum(reciprocal_ranks) / total,
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p95_ms": percentile(latencies, 95),
+        "latency_p99_ms": percentile(latencies, 99),
+    }
+
+
+def run_sweep(golden_set, docs_path: str = None, collection=None, models=("all-MiniLM-L6-v2",),
+              chunk_sizes=(500,), n_results_values=(2,), mmr_max_tokens: int = None,
+              embedding_function=None):
+    """Evaluate every (model, chunk_size, n_results) configuration and return one row per config.
+    If collection is given it is evaluated as-is and the model/chunk size sweep is skipped;
+    embedding_function is then the one the collection was built with (needed for MMR)."""
+    rows = []
+
+    if collection is not None:
+        indexes = [("existing", "existing", (collection, embedding_function))]
+    else:
+        indexes = [
+            (model, chunk_size, build_collection(docs_path, model, chunk_size))
+            for model in models
+            for chunk_size in chunk_sizes
+        ]
+
+    for model, chunk_size, (index, index_embedding_function) in indexes:
+        chunks, size_bytes = index_size(index)
+        for n_results in n_results_values:
+            strategies = [("top-k", None)]
+            if mmr_max_tokens:
+                strategies.append(("mmr", mmr_max_tokens))
+
+            for strategy, max_tokens in strategies:
+                metrics = evaluate_collection(index, golden_set, n_results, max_tokens,
+                                              index_embedding_function)
+                rows.append({
+                    "model": model,
+                    "chunk_size": chunk_size,
+                    "n_results": n_results,
+                    "strategy": strategy,
+                    "index_chunks": chunks,
+                    "index_bytes": size_bytes,
+                    **metrics,
+                })
+
+    return rows
+
+
+def format_table(rows):
+    """Format sweep results as a plain-text table."""
+    columns = ["model", "chunk_size", "n_results", "strategy", "recall@k", "mrr",
+               "latency_p50_ms", "latency_p95_ms", "latency_p99_ms", "index_chunks", "index_bytes"]
+
+    def cell(value):
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+    widths = {col: max([len(col)] + [len(cell(row[col])) for row in rows]) for col in columns}
+    lines = ["  ".join(col.ljust(widths[col]) for col in columns)]
+    lines.append("  ".join("-" * widths[col] for col in columns))
+    for row in rows:
+        lines.append("  ".join(cell(row[col]).ljust(widths[col]) for col in columns))
+    return "\n".join(lines)
@@ -1,5 +1,5 @@
 from google import genai
-from src.conversation.manager import format_history_for_prompt, add_message
+from src.conversation.manager import format_history_for_prompt, add_message, compact_history
 
 
 def contextualize_query(query: str, conversation_history: str, client: genai):
@@ -26,6 +26,26 @@ def contextualize_query(query: str, conversation_history: str, client: genai):
         return query  # Fallback to original query
 
 
+def summarize_history(previous_summary: str, transcript: str, client: genai):
+    """Fold older conversation turns into a rolling summary using Gemini."""
+    summarize_prompt = """Progressively summarize the conversation below, adding onto the
+    previous summary and returning a new summary. Keep names, facts, numbers and any
+    open questions the user may refer back to. Be concise."""
+
+    full_prompt = (
+        f"{summarize_prompt}\n\n"
+        f"Previous summary:\n{previous_summary or 'None'}\n\n"
+        f"New lines of conversation:\n{transcript}\n\n"
+        f"New summary:"
+    )
+
+    completion = client.models.generate_content(
+        model="gemini-2.0-flash",
+        contents=full_prompt
+    )
+    return completion.text
+
+
 def get_prompt(context, conversation_history, query):
     """Generate prompt for the language model with context and conversation history."""
     prompt = f"""Based on the following context and conversation history, please provide a relevant and contextual response.
@@ -60,9 +80,16 @@ def conversational_rag_query(
     query: str,
     session_id: str,
     client: genai,
-    n_chunks: int = 3
+    n_chunks: int = 3,
+    max_history_tokens: int = None,
+    query_embedder=None,
+    context_max_tokens: int = None,
+    embedding_function=None
 ):
-    """Perform RAG query with conversation history and return response with sources."""
+    """Perform RAG query with conversation history and return response with sources.
+    If max_history_tokens is set, older turns are folded into a rolling summary in the background.
+    If context_max_tokens is set, context chunks are picked by MMR under that token budget; the query
+    is then embedded with query_embedder or, failing that, the collection's embedding_function."""
     conversation_history = format_history_for_prompt(session_id)
 
     # Handle follow up questions
@@ -70,10 +97,17 @@ def conversational_rag_query(
     print("Contextualized Query:", query)
 
     # Get relevant chunks
-    from src.database.chroma_ops import semantic_search, get_context_with_sources
-    context, sources = get_context_with_sources(
-        semantic_search(collection, query, n_chunks)
-    )
+    from src.database.chroma_ops import semantic_search, diverse_search, get_context_with_sources
+    if context_max_tokens:
+        results = diverse_search(
+            collection, query, n_chunks,
+            max_tokens=context_max_tokens,
+            query_embedder=query_embedder,
+            embedding_function=embedding_function
+        )
+    else:
+        results = semantic_search(collection, query, n_chunks, query_embedder=query_embedder)
+    context, sources = get_context_with_sources(results)
 
     response = generate_response(query, context, conversation_history, client)
 
@@ -81,4 +115,12 @@ def conversational_rag_query(
     add_message(session_id, "user", query)
     add_message(session_id, "assistant", response)
 
+    # Keep prompt size bounded by summarising older turns off the request path
+    if max_history_tokens:
+        compact_history(
+            session_id,
+            lambda previous, transcript: summarize_history(previous, transcript, client),
+            max_tokens=max_history_tokens
+        )
+
     return response, sources
\ No newline at end of file
@@ -1,14 +1,21 @@
 def split_text(text: str, chunk_size: int = 500):
     """Split text into chunks while preserving sentence boundaries. Each chunk will be at most chunk_size characters."""
-    sentences = text.replace('\n', ' ').split('. ')
-    chunks = []
+    return list(split_text_stream([text], chunk_size))
+
+
+def split_text_stream(blocks, chunk_size: int = 500, max_sentence_size: int = None):
+    """Split an iterable of text blocks into chunks like split_text, yielding each chunk as soon as it
+    is complete. Only the unfinished sentence is carried between blocks; if max_sentence_size is set,
+    sentences longer than that are cut so memory stays bounded on text without sentence breaks."""
     current_chunk = []
     current_size = 0
+    remainder = ""
 
-    for sentence in sentences:
+    def add_sentence(sentence):
+        nonlocal current_chunk, current_size
         sentence = sentence.strip()
         if not sentence:
-            continue
+            return
 
         # Ensure proper sentence ending
         if not sentence.endswith('.'):
@@ -18,15 +25,27 @@ def split_text(text: str, chunk_size: int = 500):
 
         # Check if adding this sentence would exceed chunk size
         if current_size + sentence_size > chunk_size and current_chunk:
-            chunks.append(' '.join(current_chunk))
+            yield ' '.join(current_chunk)
             current_chunk = [sentence]
             current_size = sentence_size
         else:
             current_chunk.append(sentence)
             current_size += sentence_size
 
+    for block in blocks:
+        # Sentences are only complete up to the last separator; keep the tail for the next block
+        sentences = (remainder + block.replace('\n', ' ')).split('. ')
+        remainder = sentences.pop()
+
+        for sentence in sentences:
+            yield from add_sentence(sentence)
+
+        while max_sentence_size and len(remainder) > max_sentence_size:
+            yield from add_sentence(remainder[:max_sentence_size])
+            remainder = remainder[max_sentence_size:]
+
+    yield from add_sentence(remainder)
+
     # Add the last chunk if it exists
     if current_chunk:
-        chunks.append(' '.join(current_chunk))
-
-    return chunks
\ No newline at end of file
+        yield ' '.join(current_chunk)
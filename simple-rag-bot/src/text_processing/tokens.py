@@ -0,0 +1,3 @@
+def estimate_tokens(text: str):
+    """Roughly estimate the number of tokens in text (about 4 characters per token)."""
+    return (len(text) + 3) // 4
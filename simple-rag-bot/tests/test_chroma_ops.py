@@ -0,0 +1,103 @@
+"""Tests for MMR context selection over a Chroma collection."""
+import uuid
+
+import chromadb
+import pytest
+
+import src.database.chroma_ops as chroma_ops
+from src.database.chroma_ops import diverse_search, stream_document_to_collection
+from src.database.mmr import merge_contiguous_chunks
+
+VECTORS = {
+    "alpha one": [1.0, 0.0, 0.0],
+    "alpha two": [0.99, 0.01, 0.0],
+    "beta": [0.7, 0.7, 0.0],
+    "gamma": [0.0, 0.0, 1.0],
+}
+
+
+def embed(texts):
+    return [VECTORS.get(text, [1.0, 0.0, 0.0]) for text in texts]
+
+
+class FakeEmbeddingFunction(chromadb.EmbeddingFunction):
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        return [[float(len(text)), 1.0, 0.0] for text in input]
+
+    @staticmethod
+    def name():
+        return "fake"
+
+    def get_config(self):
+        return {}
+
+
+@pytest.fixture
+def collection():
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(name=f"test_{uuid.uuid4().hex}", embedding_function=None)
+    texts = list(VECTORS)
+    collection.add(
+        ids=[f"doc_{i}" for i in range(len(texts))],
+        documents=texts,
+        embeddings=embed(texts),
+        metadatas=[{"source": f"{text}.txt", "chunk": 0} for text in texts]
+    )
+    return collection
+
+
+def test_uses_the_given_embedding_function(collection):
+    calls = []
+
+    def embedding_function(texts):
+        calls.append(texts)
+        return embed(texts)
+
+    results = diverse_search(collection, "alpha one", n_results=2, lambda_mult=0.3,
+                             embedding_function=embedding_function)
+    assert calls == [["alpha one"]]
+    assert results["documents"][0][0] == "alpha one"
+    # The near-duplicate is skipped in favour of a more diverse chunk
+    assert "alpha two" not in results["documents"][0]
+    assert len(results["distances"][0]) == len(results["documents"][0])
+    assert results["distances"][0][0] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_merged_chunks_keep_their_closest_distance():
+    documents, metadatas, distances = merge_contiguous_chunks(
+        ["b", "a", "z"],
+        [{"source": "f.txt", "chunk": 1}, {"source": "f.txt", "chunk": 0}, {"source": "g.txt", "chunk": 4}],
+        [0.2, 0.5, 0.9]
+    )
+    assert documents == ["a b", "z"]
+    assert [meta["chunk"] for meta in metadatas] == ["0-1", 4]
+    assert distances == [0.2, 0.9]
+
+
+def test_needs_an_embedder(collection):
+    with pytest.raises(ValueError):
+        diverse_search(collection, "alpha one")
+
+
+def failing_chunks(count):
+    def iter_chunks(file_path, chunk_size):
+        for i in range(count):
+            yield f"chunk {i}"
+        raise UnicodeDecodeError("utf-8", b"", 0, 1, "bad byte")
+    return iter_chunks
+
+
+def test_failed_file_is_not_partly_ingested(monkeypatch):
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(name=f"test_{uuid.uuid4().hex}",
+                                          embedding_function=FakeEmbeddingFunction())
+    collection.add(ids=["doc.txt_chunk_0"], documents=["from an earlier run"])
+
+    monkeypatch.setattr(chroma_ops, "iter_document_chunks", failing_chunks(25))
+    assert stream_document_to_collection(collection, "docs/doc.txt", batch_size=10) == 0
+
+    # Only the chunk stored by the earlier run is left
+    assert collection.get()["ids"] == ["doc.txt_chunk_0"]
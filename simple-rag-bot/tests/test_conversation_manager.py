@@ -0,0 +1,61 @@
+"""Tests for conversation history compaction and the background summariser."""
+import os
+import subprocess
+import sys
+import time
+
+from src.conversation import manager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fill(session_id, messages=6, words=60):
+    for i in range(messages):
+        manager.add_message(session_id, "user" if i % 2 == 0 else "assistant", "word " * words)
+
+
+def test_compaction_folds_older_turns_into_the_summary():
+    session_id = manager.create_session()
+    fill(session_id)
+
+    future = manager.compact_history(session_id, lambda previous, transcript: "earlier turns", max_tokens=100)
+    future.result(timeout=5)
+
+    assert manager.get_history_summary(session_id) == "earlier turns"
+    assert len(manager.get_conversation_history(session_id)) == 4
+    assert manager.format_history_for_prompt(session_id).startswith("Summary of earlier conversation: earlier turns")
+
+
+QUEUE_SUMMARIES = (
+    "import time\n"
+    "from src.conversation import manager\n"
+    "for _ in range(3):\n"
+    "    session_id = manager.create_session()\n"
+    "    for i in range(6):\n"
+    "        manager.add_message(session_id, 'user', 'word ' * 60)\n"
+    "    manager.compact_history(session_id, lambda p, t: time.sleep(1) or 's', max_tokens=100)\n"
+    "time.sleep(0.1)\n"
+)
+
+
+def run_timed(script):
+    start = time.monotonic()
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip(), time.monotonic() - start
+
+
+def test_exit_does_not_wait_for_queued_summaries():
+    _, elapsed = run_timed(QUEUE_SUMMARIES)
+
+    # Neither the summary in progress (1 s) nor the two queued ones delay exit
+    assert elapsed < 1.0
+
+
+def test_no_compaction_after_close():
+    output, elapsed = run_timed(
+        QUEUE_SUMMARIES + "manager.close()\nprint(manager.compact_history(session_id, lambda p, t: 's', max_tokens=100))\n"
+    )
+
+    assert output == "None"
+    assert elapsed < 1.0
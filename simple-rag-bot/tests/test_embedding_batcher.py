@@ -0,0 +1,64 @@
+"""Tests for the query embedding micro-batcher."""
+import threading
+
+import pytest
+
+from src.database.embedding_batcher import QueryEmbeddingBatcher
+
+
+def fake_embed(texts):
+    return [[float(len(text))] for text in texts]
+
+
+def test_concurrent_queries_are_batched():
+    batch_sizes = []
+
+    def embed(texts):
+        batch_sizes.append(len(texts))
+        return fake_embed(texts)
+
+    batcher = QueryEmbeddingBatcher(embed, max_batch_size=8, max_wait_ms=50)
+    try:
+        futures = [batcher.submit("q" * i) for i in range(8)]
+        assert [future.result(timeout=5) for future in futures] == [[float(i)] for i in range(8)]
+    finally:
+        batcher.close()
+    assert sum(batch_sizes) == 8 and max(batch_sizes) > 1
+
+
+def test_short_result_fails_every_future_in_the_batch():
+    batcher = QueryEmbeddingBatcher(lambda texts: fake_embed(texts)[:-1], max_batch_size=4, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(text) for text in ("a", "b", "c")]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="returned 2 vectors for 3 texts"):
+                future.result(timeout=5)
+    finally:
+        batcher.close()
+
+
+def test_submit_racing_close_never_leaves_a_future_pending():
+    for _ in range(20):
+        batcher = QueryEmbeddingBatcher(fake_embed, max_batch_size=4, max_wait_ms=1)
+        futures = []
+        start = threading.Event()
+
+        def client():
+            start.wait()
+            for _ in range(50):
+                try:
+                    futures.append(batcher.submit("query"))
+                except RuntimeError:
+                    return
+
+        threads = [threading.Thread(target=client) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        batcher.close()
+        for thread in threads:
+            thread.join()
+
+        assert all(future.result(timeout=5) == [5.0] for future in futures)
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.submit("late")